@@ -0,0 +1,23 @@
+from slack_sdk.errors import SlackApiError
+
+from clients.rest import RestError
+
+
+def is_retryable(error):
+    """Whether retrying the activity later could still succeed.
+
+    The Slack dispatcher and the REST clients already retried rate limits and
+    server errors in-process; one that is still failing is left for Temporal
+    to retry with backoff. Any other API error is permanent.
+    """
+    if isinstance(error, SlackApiError):
+        return error.response["error"] == "ratelimited"
+    if isinstance(error, RestError):
+        return error.status == 429 or error.status >= 500
+    return False
+
+
+def raise_if_retryable(error):
+    """Re-raise ``error`` so Temporal retries the activity, if that could help."""
+    if is_retryable(error):
+        raise error
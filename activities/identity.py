@@ -0,0 +1,44 @@
+from dataclasses import asdict
+
+from slack_sdk.errors import SlackApiError
+from temporalio import activity
+
+from activities.errors import raise_if_retryable
+from clients.identity import IdentityResolver
+from clients.rest import RestError
+from utils.metrics import timed_activity
+
+
+class IdentityActivity:
+    """Temporal activity resolving a person across Slack, Jira and PagerDuty."""
+
+    def __init__(self, resolver: IdentityResolver = None):
+        self.resolver = resolver or IdentityResolver.get_resolver()
+
+    @activity.defn(name="resolve_identity")
+    @timed_activity
+    async def resolve_identity(self, email: str):
+        """Return the Slack, Jira and PagerDuty user ids for an email address."""
+        try:
+            activity.logger.info("Identity activity: resolving %s", email)
+            identity = await self.resolver.resolve(email)
+            return {
+                "success": True,
+                **asdict(identity)
+            }
+        except SlackApiError as e:
+            raise_if_retryable(e)
+            activity.logger.error("Slack API error in resolve_identity: %s", e.response['error'])
+            return {
+                "success": False,
+                "error": e.response['error'],
+                "email": email
+            }
+        except RestError as e:
+            raise_if_retryable(e)
+            activity.logger.error("API error in resolve_identity: %s", e)
+            return {
+                "success": False,
+                "error": str(e.errors),
+                "email": email
+            }
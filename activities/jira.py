@@ -1,13 +1,39 @@
+from temporalio import activity
+
+from activities.errors import raise_if_retryable
+from clients.jira import JIRAClient, JIRAError
+from utils.metrics import timed_activity
+from utils.settings import get_settings
+
+
 class JIRAActivity:
-    def __init__(self, jira_client: JIRA):
-        self.jira_client = jira_client
-
-    def create_issue(self, issue_type: str, summary: str, description: str):
-        issue = self.jira_client.create_issue(
-            project={"key": "TEST"},
-            summary=summary,
-            description=description,
-            issuetype={"name": issue_type}
-        )
-        return issue
-    
\ No newline at end of file
+    """Temporal activities for Jira operations."""
+
+    def __init__(self, jira_client: JIRAClient = None, settings=None):
+        self.jira_client = jira_client or JIRAClient.get_client()
+        self.project_key = (settings or get_settings()).jira_project_key
+
+    @activity.defn(name="create_issue")
+    @timed_activity
+    async def create_issue(self, issue_type: str, summary: str, description: str, project_key: str = ""):
+        """Create a Jira issue; concurrent calls are batched into bulk requests."""
+        try:
+            activity.logger.info("Jira activity: creating %s in %s", issue_type, project_key or self.project_key)
+            issue = await self.jira_client.create_issue(
+                project_key=project_key or self.project_key,
+                summary=summary,
+                description=description,
+                issue_type=issue_type,
+            )
+            return {
+                "success": True,
+                "id": issue.get("id"),
+                "key": issue.get("key")
+            }
+        except JIRAError as e:
+            raise_if_retryable(e)
+            activity.logger.error("Jira API error in create_issue: %s", e)
+            return {
+                "success": False,
+                "error": str(e.errors)
+            }
@@ -0,0 +1,30 @@
+from temporalio import activity
+
+from clients.pagerduty import OnCallIndex
+from utils.metrics import timed_activity
+
+
+class PagerdutyActivity:
+    """Temporal activities for PagerDuty, answered from the on-call index."""
+
+    def __init__(self, index: OnCallIndex = None):
+        self.index = index or OnCallIndex.get_index()
+
+    @activity.defn(name="get_on_call")
+    @timed_activity
+    async def get_on_call(self, component: str, at: float = 0.0):
+        """Who is on call for a component at ``at`` (epoch seconds, default now)."""
+        user = self.index.on_call(component, at or None)
+        if user is None:
+            activity.logger.warning("No on-call user indexed for %s", component)
+            return {
+                "success": False,
+                "error": "no_on_call",
+                "component": component
+            }
+        return {
+            "success": True,
+            "component": component,
+            "user_id": user.get("id"),
+            "user_name": user.get("summary")
+        }
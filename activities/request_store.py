@@ -0,0 +1,21 @@
+import asyncio
+
+from temporalio import activity
+
+from models.request import Request
+from utils.metrics import timed_activity
+from utils.request_store import RequestStore
+
+
+class RequestStoreActivity:
+    """Temporal activity keeping the request store in step with workflow state."""
+
+    def __init__(self, store: RequestStore):
+        self.store = store
+
+    @activity.defn(name="save_request")
+    @timed_activity
+    async def save_request(self, request: Request):
+        """Write the request's current state; the latest save wins."""
+        await asyncio.to_thread(self.store.save, request)
+        return {"success": True, "id": request.id}
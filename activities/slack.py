@@ -1,12 +1,66 @@
 import logging
+import threading
+from collections import OrderedDict
+from typing import List
+
 from temporalio import activity
-from clients.slack import SlackClient
+from temporalio.exceptions import ApplicationError
+from activities.errors import raise_if_retryable
+from clients.slack import AsyncSlackClient, SlackClient
 from slack_sdk.errors import SlackApiError
 from models.request import Request
+from models.slack import SlackUpdate
+from utils.metrics import timed_activity
 
 logger = logging.getLogger(__name__)
 
 
+class _BatchProgress:
+    """Results of the updates earlier attempts of a batch_update already applied.
+
+    batch_update raises on retryable errors, and Temporal retries the activity
+    with the whole batch. A retry (same workflow run and activity id) resumes
+    after the updates that went out, so messages aren't posted twice. Local
+    activity retries run in the worker that made the first attempt.
+
+    A fallback activity has its own id, so it can't resume from here;
+    _stopped hands the results to the workflow instead.
+    """
+
+    def __init__(self, maxsize=10000):
+        self.maxsize = maxsize
+        self._batches = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key():
+        info = activity.info()
+        return info.workflow_run_id, info.activity_id
+
+    def resume(self):
+        """The results applied so far by this activity; append to it as updates go out."""
+        key = self._key()
+        with self._lock:
+            done = self._batches.get(key)
+            if done is None:
+                done = self._batches[key] = []
+                if len(self._batches) > self.maxsize:
+                    self._batches.popitem(last=False)
+            return done
+
+    def finish(self):
+        with self._lock:
+            self._batches.pop(self._key(), None)
+
+
+_batch_progress = _BatchProgress()
+
+
+def _stopped(error, results):
+    """The error batch_update raises, carrying the results of the updates that went out."""
+    return ApplicationError(f"{type(error).__name__}: {error}", list(results), type=type(error).__name__)
+
+
 class SlackActivity:
     """Temporal activities for Slack operations."""
     
@@ -14,37 +68,37 @@ class SlackActivity:
         self.slack_client = SlackClient.get_client()
 
     @activity.defn
+    @timed_activity
     def send_message(self, channel: str, message: str, **kwargs):
         """Send a message to a Slack channel."""
         try:
-            activity.logger.info(f"Slack activity: sending message to {channel}")
+            activity.logger.info("Slack activity: sending message to %s", channel)
             response = self.slack_client.send_message(channel=channel, text=message, **kwargs)
             return {
                 "success": True,
                 "timestamp": response.get("ts"),
-                "channel": response.get("channel"),
-                "message": message
+                "channel": response.get("channel")
             }
         except SlackApiError as e:
-            activity.logger.error(f"Slack API error in send_message: {e.response['error']}")
+            raise_if_retryable(e)
+            activity.logger.error("Slack API error in send_message: %s", e.response['error'])
             return {
                 "success": False,
-                "error": e.response['error'],
-                "message": message
+                "error": e.response['error']
             }
         except Exception as e:
-            activity.logger.error(f"Unexpected error in send_message: {str(e)}")
+            activity.logger.error("Unexpected error in send_message: %s", e)
             return {
                 "success": False,
-                "error": str(e),
-                "message": message
+                "error": str(e)
             }
             
     @activity.defn
+    @timed_activity
     def add_reaction(self, channel: str, message_ts: str, emoji: str):
         """Add an emoji reaction to a message."""
         try:
-            activity.logger.info(f"Slack activity: adding reaction {emoji} to message {message_ts}")
+            activity.logger.info("Slack activity: adding reaction %s to message %s", emoji, message_ts)
             response = self.slack_client.add_reaction(channel=channel, message_ts=message_ts, emoji=emoji)
             return {
                 "success": True,
@@ -53,14 +107,23 @@ class SlackActivity:
                 "emoji": emoji
             }
         except SlackApiError as e:
-            activity.logger.error(f"Slack API error in add_reaction: {e.response['error']}")
+            raise_if_retryable(e)
+            if e.response['error'] == 'already_reacted':
+                # A retried attempt already got through; keep retries idempotent
+                return {
+                    "success": True,
+                    "channel": channel,
+                    "message_ts": message_ts,
+                    "emoji": emoji
+                }
+            activity.logger.error("Slack API error in add_reaction: %s", e.response['error'])
             return {
                 "success": False,
                 "error": e.response['error'],
                 "emoji": emoji
             }
         except Exception as e:
-            activity.logger.error(f"Unexpected error in add_reaction: {str(e)}")
+            activity.logger.error("Unexpected error in add_reaction: %s", e)
             return {
                 "success": False,
                 "error": str(e),
@@ -68,10 +131,11 @@ class SlackActivity:
             }
 
     @activity.defn
+    @timed_activity
     def lookup_user_by_email(self, email: str):
         """Look up a Slack user by email address."""
         try:
-            activity.logger.info(f"Slack activity: looking up user by email {email}")
+            activity.logger.info("Slack activity: looking up user by email %s", email)
             user = self.slack_client.get_user_from_email(email)
             return {
                 "success": True,
@@ -81,16 +145,270 @@ class SlackActivity:
                 "email": email
             }
         except SlackApiError as e:
-            activity.logger.error(f"Slack API error in lookup_user_by_email: {e.response['error']}")
+            raise_if_retryable(e)
+            activity.logger.error("Slack API error in lookup_user_by_email: %s", e.response['error'])
             return {
                 "success": False,
                 "error": e.response['error'],
                 "email": email
             }
         except Exception as e:
-            activity.logger.error(f"Unexpected error in lookup_user_by_email: {str(e)}")
+            activity.logger.error("Unexpected error in lookup_user_by_email: %s", e)
             return {
                 "success": False,
                 "error": str(e),
                 "email": email
-            }
\ No newline at end of file
+            }
+
+    @activity.defn
+    @timed_activity
+    def update_message(self, channel: str, message_ts: str, text: str):
+        """Replace the text of an existing message."""
+        try:
+            activity.logger.info("Slack activity: updating message %s in %s", message_ts, channel)
+            self.slack_client.update_message(channel=channel, message_ts=message_ts, text=text)
+            return {
+                "success": True,
+                "channel": channel,
+                "message_ts": message_ts
+            }
+        except SlackApiError as e:
+            raise_if_retryable(e)
+            activity.logger.error("Slack API error in update_message: %s", e.response['error'])
+            return {
+                "success": False,
+                "error": e.response['error']
+            }
+        except Exception as e:
+            activity.logger.error("Unexpected error in update_message: %s", e)
+            return {
+                "success": False,
+                "error": str(e)
+            }
+
+    @activity.defn
+    @timed_activity
+    def batch_update(self, updates: List[SlackUpdate]):
+        """Apply several Slack UI updates in one activity, one at a time in order.
+
+        Meant to run as a local activity. Permanent errors are reported per
+        update; a rate limit or transport error is raised so Temporal retries
+        the activity, which resumes after the updates already applied. The
+        raised ApplicationError's details are the results so far, so the
+        workflow's fallback can skip those updates.
+        """
+        activity.logger.info("Slack activity: applying %s updates", len(updates))
+        results = _batch_progress.resume()
+        try:
+            for update in updates[len(results):]:
+                results.append(self._apply_update(update))
+        except Exception as e:
+            raise _stopped(e, results) from e
+        _batch_progress.finish()
+        return {
+            "success": all(result["success"] for result in results),
+            "results": results
+        }
+
+    def _apply_update(self, update: SlackUpdate):
+        try:
+            if update.kind == "reaction":
+                self.slack_client.add_reaction(channel=update.channel, message_ts=update.ts, emoji=update.emoji)
+                return {"success": True, "kind": update.kind}
+            if update.kind == "edit":
+                self.slack_client.update_message(channel=update.channel, message_ts=update.ts, text=update.text)
+                return {"success": True, "kind": update.kind}
+            if update.kind == "message":
+                kwargs = {"thread_ts": update.ts} if update.ts else {}
+                response = self.slack_client.send_message(channel=update.channel, text=update.text, **kwargs)
+                return {"success": True, "kind": update.kind, "timestamp": response.get("ts")}
+            if update.kind == "status":
+                # Sent as is; coalescing needs the async client's event loop
+                if update.ts:
+                    self.slack_client.update_message(channel=update.channel, message_ts=update.ts, text=update.text)
+                    return {"success": True, "kind": update.kind, "timestamp": update.ts}
+                response = self.slack_client.send_message(channel=update.channel, text=update.text)
+                return {"success": True, "kind": update.kind, "timestamp": response.get("ts")}
+            return {"success": False, "kind": update.kind, "error": "unknown_update_kind"}
+        except SlackApiError as e:
+            if update.kind == "reaction" and e.response['error'] == 'already_reacted':
+                return {"success": True, "kind": update.kind}
+            raise_if_retryable(e)
+            activity.logger.error("Slack API error in batch_update (%s): %s", update.kind, e.response['error'])
+            return {"success": False, "kind": update.kind, "error": e.response['error']}
+
+
+class AsyncSlackActivity:
+    """Asyncio Temporal activities for Slack operations.
+
+    Registered under the same activity names as SlackActivity, so workflows are
+    unaffected by which implementation the worker runs.
+    """
+
+    def __init__(self):
+        self.slack_client = AsyncSlackClient.get_client()
+
+    @activity.defn(name="send_message")
+    @timed_activity
+    async def send_message(self, channel: str, message: str, **kwargs):
+        """Send a message to a Slack channel."""
+        try:
+            activity.logger.info("Slack activity: sending message to %s", channel)
+            response = await self.slack_client.send_message(channel=channel, text=message, **kwargs)
+            return {
+                "success": True,
+                "timestamp": response.get("ts"),
+                "channel": response.get("channel")
+            }
+        except SlackApiError as e:
+            raise_if_retryable(e)
+            activity.logger.error("Slack API error in send_message: %s", e.response['error'])
+            return {
+                "success": False,
+                "error": e.response['error']
+            }
+        except Exception as e:
+            activity.logger.error("Unexpected error in send_message: %s", e)
+            return {
+                "success": False,
+                "error": str(e)
+            }
+
+    @activity.defn(name="add_reaction")
+    @timed_activity
+    async def add_reaction(self, channel: str, message_ts: str, emoji: str):
+        """Add an emoji reaction to a message."""
+        try:
+            activity.logger.info("Slack activity: adding reaction %s to message %s", emoji, message_ts)
+            await self.slack_client.add_reaction(channel=channel, message_ts=message_ts, emoji=emoji)
+            return {
+                "success": True,
+                "channel": channel,
+                "message_ts": message_ts,
+                "emoji": emoji
+            }
+        except SlackApiError as e:
+            raise_if_retryable(e)
+            if e.response['error'] == 'already_reacted':
+                # A retried attempt already got through; keep retries idempotent
+                return {
+                    "success": True,
+                    "channel": channel,
+                    "message_ts": message_ts,
+                    "emoji": emoji
+                }
+            activity.logger.error("Slack API error in add_reaction: %s", e.response['error'])
+            return {
+                "success": False,
+                "error": e.response['error'],
+                "emoji": emoji
+            }
+        except Exception as e:
+            activity.logger.error("Unexpected error in add_reaction: %s", e)
+            return {
+                "success": False,
+                "error": str(e),
+                "emoji": emoji
+            }
+
+    @activity.defn(name="lookup_user_by_email")
+    @timed_activity
+    async def lookup_user_by_email(self, email: str):
+        """Look up a Slack user by email address."""
+        try:
+            activity.logger.info("Slack activity: looking up user by email %s", email)
+            user = await self.slack_client.get_user_from_email(email)
+            return {
+                "success": True,
+                "user_id": user["id"],
+                "username": user.get("name"),
+                "real_name": user.get("real_name"),
+                "email": email
+            }
+        except SlackApiError as e:
+            raise_if_retryable(e)
+            activity.logger.error("Slack API error in lookup_user_by_email: %s", e.response['error'])
+            return {
+                "success": False,
+                "error": e.response['error'],
+                "email": email
+            }
+        except Exception as e:
+            activity.logger.error("Unexpected error in lookup_user_by_email: %s", e)
+            return {
+                "success": False,
+                "error": str(e),
+                "email": email
+            }
+
+    @activity.defn(name="update_message")
+    @timed_activity
+    async def update_message(self, channel: str, message_ts: str, text: str):
+        """Replace the text of an existing message."""
+        try:
+            activity.logger.info("Slack activity: updating message %s in %s", message_ts, channel)
+            await self.slack_client.update_message(channel=channel, message_ts=message_ts, text=text)
+            return {
+                "success": True,
+                "channel": channel,
+                "message_ts": message_ts
+            }
+        except SlackApiError as e:
+            raise_if_retryable(e)
+            activity.logger.error("Slack API error in update_message: %s", e.response['error'])
+            return {
+                "success": False,
+                "error": e.response['error']
+            }
+        except Exception as e:
+            activity.logger.error("Unexpected error in update_message: %s", e)
+            return {
+                "success": False,
+                "error": str(e)
+            }
+
+    @activity.defn(name="batch_update")
+    @timed_activity
+    async def batch_update(self, updates: List[SlackUpdate]):
+        """Apply several Slack UI updates in one activity, one at a time in order.
+
+        Same contract as SlackActivity.batch_update. Not concurrent: a batch
+        is a reaction and a status edit at most, and applying updates in order
+        is what lets a retry resume after the ones already applied.
+        """
+        activity.logger.info("Slack activity: applying %s updates", len(updates))
+        results = _batch_progress.resume()
+        try:
+            for update in updates[len(results):]:
+                results.append(await self._apply_update(update))
+        except Exception as e:
+            raise _stopped(e, results) from e
+        _batch_progress.finish()
+        return {
+            "success": all(result["success"] for result in results),
+            "results": results
+        }
+
+    async def _apply_update(self, update: SlackUpdate):
+        try:
+            if update.kind == "reaction":
+                await self.slack_client.add_reaction(channel=update.channel, message_ts=update.ts, emoji=update.emoji)
+                return {"success": True, "kind": update.kind}
+            if update.kind == "edit":
+                await self.slack_client.update_message(channel=update.channel, message_ts=update.ts, text=update.text)
+                return {"success": True, "kind": update.kind}
+            if update.kind == "message":
+                kwargs = {"thread_ts": update.ts} if update.ts else {}
+                response = await self.slack_client.send_message(channel=update.channel, text=update.text, **kwargs)
+                return {"success": True, "kind": update.kind, "timestamp": response.get("ts")}
+            if update.kind == "status":
+                status = await self.slack_client.set_status(update.key, update.channel, update.text, update.version,
+                                                            message_ts=update.ts)
+                return {"success": True, "kind": update.kind, "timestamp": status["ts"]}
+            return {"success": False, "kind": update.kind, "error": "unknown_update_kind"}
+        except SlackApiError as e:
+            if update.kind == "reaction" and e.response['error'] == 'already_reacted':
+                return {"success": True, "kind": update.kind}
+            raise_if_retryable(e)
+            activity.logger.error("Slack API error in batch_update (%s): %s", update.kind, e.response['error'])
+            return {"success": False, "kind": update.kind, "error": e.response['error']}
@@ -1,17 +1,20 @@
 import logging
 import os
-from project.app import create_app
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(message)s",
-    handlers=[logging.StreamHandler()]
-)
+from utils.settings import get_settings
+
+# Read .env.shared/.env.secret once, before any module reads the environment at import
+settings = get_settings()
+
+from project.app import create_app  # noqa: E402
+from utils.logs import configure_logging  # noqa: E402
+
+# Log through a background writer thread (LOG_LEVEL, LOG_FORMAT, LOG_SAMPLE)
+configure_logging()
 logger = logging.getLogger(__name__)
 
 
-app = create_app()
+app = create_app(settings=settings)
 
 if __name__ == "__main__":
     # Start Flask app
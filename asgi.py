@@ -0,0 +1,26 @@
+import logging
+import os
+
+from utils.settings import get_settings
+
+# Read .env.shared/.env.secret once, before any module reads the environment at import
+settings = get_settings()
+
+from project.app import create_app  # noqa: E402
+from project.asgi import create_asgi_app  # noqa: E402
+from utils.logs import configure_logging  # noqa: E402
+
+# Log through a background writer thread (LOG_LEVEL, LOG_FORMAT, LOG_SAMPLE)
+configure_logging()
+logger = logging.getLogger(__name__)
+
+
+# ASGI entry point: one event loop and one Temporal client per worker process.
+# Run with `gunicorn -c gunicorn_asgi_config.py asgi:app`.
+app = create_asgi_app(create_app(settings=settings), threads=int(os.getenv("ASGI_THREADS", 8)))
+
+if __name__ == "__main__":
+    import uvicorn
+
+    port = int(os.getenv("PORT", 8888))
+    uvicorn.run(app, host="0.0.0.0", port=port, lifespan="on")
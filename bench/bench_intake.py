@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""Load test for the webhook intake path.
+
+Serves create_app() through the ASGI entry point on a real uvicorn server and
+drives /webhooks/slack at a fixed rate, including duplicate event_ids and Slack
+retry storms. Slack is an in-process fake HTTP server. Temporal is either:
+
+  fake   an injectable client behind TemporalClient with a configurable start
+         latency; acknowledgements are posted straight to the fake Slack.
+  local  a Temporal dev server (downloaded on first use, or --dev-server-path)
+         plus an in-process worker, so delivery goes through RequestStart and
+         AsyncSlackActivity.
+
+    python bench/bench_intake.py --rate 200 --duration 10 --duplicates 0.1 --retry-storm 2
+    python bench/bench_intake.py --temporal local --rate 50 --out results.json
+
+Prints one JSON object (and optionally writes it to --out) so runs can be
+compared across commits.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import aiohttp
+import uvicorn
+
+from bench.fakes import FakeSlackServer, FakeTemporalClient
+import clients.temporal
+from clients.slack import AsyncSlackClient
+from clients.slack_dispatcher import SlackDispatcher
+from clients.temporal_converter import compact_data_converter
+from project.app import create_app
+from project.asgi import create_asgi_app
+from utils.settings import Settings
+from utils.task_queues import ACK_TASK_QUEUE, worker_task_queues
+
+
+def percentiles(values):
+    if not values:
+        return {"p50": None, "p95": None, "p99": None, "max": None}
+    ordered = sorted(values)
+
+    def pick(p):
+        return round(ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))] * 1000, 3)
+
+    return {"p50": pick(50), "p95": pick(95), "p99": pick(99), "max": round(ordered[-1] * 1000, 3)}
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def webhook_payload(event_id):
+    return {
+        "token": "bench",
+        "team_id": "T0BENCH",
+        "type": "event_callback",
+        "event_id": event_id,
+        "event_time": int(time.time()),
+        "event": {
+            "type": "message",
+            "channel": "C0BENCH",
+            "user": "U0BENCH",
+            "text": "The deploy pipeline is failing on integration tests, can someone take a look?",
+            "ts": f"{time.time():.6f}",
+        },
+    }
+
+
+class ServerThread:
+    """Runs an ASGI app on uvicorn in a background thread with its own event loop."""
+
+    def __init__(self, app, port):
+        config = uvicorn.Config(app, host="127.0.0.1", port=port, lifespan="on",
+                                log_level="warning", access_log=False)
+        self.server = uvicorn.Server(config)
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    def start(self):
+        self.thread.start()
+        while not self.server.started:
+            time.sleep(0.01)
+
+    def stop(self):
+        self.server.should_exit = True
+        self.thread.join(10)
+
+
+async def start_temporal(mode, start_latency, settings, dev_server_path=None):
+    """Patch TemporalClient's connect function; returns an async cleanup callable."""
+    if mode == "fake":
+        # Deliveries run on this loop, playing the worker, not on the server's loop
+        worker_loop = asyncio.get_running_loop()
+        slack_client = AsyncSlackClient(settings=settings)
+
+        async def deliver(event):
+            # What RequestStart does once its worker picks the workflow up
+            asyncio.run_coroutine_threadsafe(slack_client.send_message(
+                channel="#tmp-rohan-test", text=f"Hello from workflow! Event: {event.event_id}"
+            ), worker_loop)
+
+        async def connect():
+            return FakeTemporalClient(start_latency=start_latency, deliver=deliver)
+
+        clients.temporal.start_temporal_client = connect
+
+        async def cleanup():
+            await slack_client.close()
+        return cleanup
+
+    from temporalio.client import Client
+    from temporalio.testing import WorkflowEnvironment
+    from temporalio.worker import Worker
+
+    from activities.slack import AsyncSlackActivity
+    from workflows.request_start import RequestStart
+
+    env = await WorkflowEnvironment.start_local(
+        data_converter=compact_data_converter(), dev_server_existing_path=dev_server_path
+    )
+    target = env.client.service_client.config.target_host
+    namespace = env.client.namespace
+
+    async def connect():
+        return await Client.connect(target, namespace=namespace, data_converter=compact_data_converter())
+
+    clients.temporal.start_temporal_client = connect
+
+    AsyncSlackClient._instance = AsyncSlackClient(settings=settings)
+    slack_activity = AsyncSlackActivity()
+    activities = [slack_activity.send_message, slack_activity.add_reaction, slack_activity.lookup_user_by_email,
+                  slack_activity.update_message, slack_activity.batch_update]
+    workers = [
+        Worker(env.client, task_queue=task_queue, workflows=[RequestStart], activities=activities,
+               max_concurrent_activities=500)
+        for task_queue in worker_task_queues("all")
+    ]
+    workers.append(Worker(env.client, task_queue=ACK_TASK_QUEUE, activities=activities, max_concurrent_activities=500))
+    worker_tasks = [asyncio.create_task(worker.run()) for worker in workers]
+
+    async def cleanup():
+        await asyncio.gather(*(worker.shutdown() for worker in workers))
+        await asyncio.gather(*worker_tasks)
+        await slack_activity.slack_client.close()
+        await env.shutdown()
+    return cleanup
+
+
+async def drive_load(url, rate, duration, duplicates, retry_storm):
+    """Open-loop load: requests are sent on schedule regardless of response times."""
+    results = []
+    first_sent = {}
+    sent_ids = []
+    tasks = []
+
+    async def send(session, event_id, retry_num):
+        headers = {"X-Slack-Retry-Num": str(retry_num)} if retry_num else {}
+        started = time.perf_counter()
+        first_sent.setdefault(event_id, started)
+        try:
+            async with session.post(url, json=webhook_payload(event_id), headers=headers) as response:
+                await response.read()
+                status = response.status
+        except aiohttp.ClientError:
+            status = "error"
+        results.append((time.perf_counter() - started, status))
+
+    total = int(rate * duration)
+    connector = aiohttp.TCPConnector(limit=0)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        begin = time.perf_counter()
+        for i in range(total):
+            delay = begin + i / rate - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            if sent_ids and random.random() < duplicates:
+                tasks.append(asyncio.create_task(send(session, random.choice(sent_ids), 1)))
+                continue
+
+            event_id = f"Ev{uuid.uuid4().hex[:12]}"
+            sent_ids.append(event_id)
+            tasks.append(asyncio.create_task(send(session, event_id, 0)))
+            for retry_num in range(1, retry_storm + 1):
+                tasks.append(asyncio.create_task(send(session, event_id, retry_num)))
+
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - begin
+
+    return results, first_sent, sent_ids, elapsed
+
+
+async def run_benchmark(temporal="fake", rate=100.0, duration=5.0, duplicates=0.0, retry_storm=0,
+                        start_latency=0.02, slack_latency=0.0, intake_mode="direct", drain_timeout=10.0,
+                        dev_server_path=None):
+    slack = FakeSlackServer(latency=slack_latency)
+    base_url = await slack.start()
+    os.environ["SLACK_BOT_TOKEN"] = "xoxb-bench"
+    os.environ["SLACK_API_URL"] = base_url
+    os.environ["WEBHOOK_INTAKE_MODE"] = intake_mode
+    os.environ["WEBHOOK_SPOOL_PATH"] = os.path.join(tempfile.mkdtemp(prefix="bench-intake-"), "spool.db")
+    # The benchmark measures our pipeline, not Slack's published rate limits
+    SlackDispatcher._instance = SlackDispatcher(
+        tier_rates={tier: 10 ** 7 for tier in range(1, 5)}, channel_rate=10 ** 6, channel_burst=10 ** 6
+    )
+
+    # Not get_settings(): the process may have cached settings before the fakes existed
+    settings = Settings.from_env()
+    cleanup = await start_temporal(temporal, start_latency, settings, dev_server_path)
+    port = free_port()
+    server = ServerThread(create_asgi_app(create_app(settings=settings),
+                                         threads=int(os.getenv("ASGI_THREADS", 32))), port)
+    server.start()
+
+    try:
+        results, first_sent, sent_ids, elapsed = await drive_load(
+            f"http://127.0.0.1:{port}/webhooks/slack", rate, duration, duplicates, retry_storm
+        )
+
+        deadline = time.perf_counter() + drain_timeout
+        while len(slack.delivered) < len(sent_ids) and time.perf_counter() < deadline:
+            await asyncio.sleep(0.05)
+    finally:
+        server.stop()
+        await cleanup()
+        await slack.stop()
+
+    delivery = [slack.delivered[event_id] - first_sent[event_id] for event_id in sent_ids if event_id in slack.delivered]
+    return {
+        "benchmark": "intake",
+        "config": {
+            "temporal": temporal, "intake_mode": intake_mode, "rate": rate, "duration": duration,
+            "duplicates": duplicates, "retry_storm": retry_storm,
+            "start_latency": start_latency, "slack_latency": slack_latency,
+        },
+        "requests": len(results),
+        "unique_events": len(sent_ids),
+        "requests_per_second": round(len(results) / elapsed, 1),
+        "status_counts": {str(status): count for status, count in Counter(status for _, status in results).items()},
+        "ack_latency_ms": percentiles([latency for latency, _ in results]),
+        "delivered": len(delivery),
+        "delivery_latency_ms": percentiles(delivery),
+        "slack_api_calls": slack.calls,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Webhook intake load test")
+    parser.add_argument("--temporal", choices=["fake", "local"], default="fake")
+    parser.add_argument("--intake-mode", choices=["direct", "spool"], default="direct")
+    parser.add_argument("--rate", type=float, default=100.0, help="new webhooks per second")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds of load")
+    parser.add_argument("--duplicates", type=float, default=0.0, help="fraction of requests re-sending an earlier event_id")
+    parser.add_argument("--retry-storm", type=int, default=0, help="immediate Slack retries per event")
+    parser.add_argument("--start-latency", type=float, default=0.02, help="fake start_workflow latency (seconds)")
+    parser.add_argument("--slack-latency", type=float, default=0.0, help="fake Slack API latency (seconds)")
+    parser.add_argument("--dev-server-path", help="existing `temporal` CLI binary for --temporal local")
+    parser.add_argument("--out", help="also write the JSON result to this file")
+    args = parser.parse_args()
+
+    result = asyncio.run(run_benchmark(
+        temporal=args.temporal, rate=args.rate, duration=args.duration, duplicates=args.duplicates,
+        retry_storm=args.retry_storm, start_latency=args.start_latency, slack_latency=args.slack_latency,
+        intake_mode=args.intake_mode, dev_server_path=args.dev_server_path,
+    ))
+    output = json.dumps(result)
+    print(output)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
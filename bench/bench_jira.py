@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""Jira issue creation throughput, with and without bulk coalescing.
+
+Fires bursts of concurrent create_issue calls (one per workflow during an
+incident spike) at an in-process fake Jira and compares HTTP requests and
+per-issue latency for each coalescing window.
+
+    python bench/bench_jira.py --issues 500 --burst 50 --latency 0.05
+    python bench/bench_jira.py --windows 0 10 50 --rate-limit-every 20
+
+Prints one JSON object (and optionally writes it to --out).
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench.bench_intake import percentiles
+from bench.fakes import FakeJiraServer
+from clients.jira import JIRAClient
+
+
+async def run_window(window_ms, issues, burst, latency, rate_limit_every):
+    server = FakeJiraServer(latency=latency, rate_limit_every=rate_limit_every)
+    base_url = await server.start()
+    client = JIRAClient(base_url=base_url, batch_window=window_ms / 1000, base_backoff=0.05)
+    latencies = []
+
+    async def create(i):
+        started = time.perf_counter()
+        await client.create_issue("BENCH", f"Incident request {i}", "Created by bench_jira")
+        latencies.append(time.perf_counter() - started)
+
+    try:
+        started = time.perf_counter()
+        for first in range(0, issues, burst):
+            await asyncio.gather(*(create(i) for i in range(first, min(issues, first + burst))))
+        elapsed = time.perf_counter() - started
+    finally:
+        await client.close()
+        await server.stop()
+
+    return {
+        "window_ms": window_ms,
+        "issues": len(server.issues),
+        "http_requests": server.requests,
+        "bulk_requests": server.bulk_requests,
+        "rate_limited": server.rate_limited,
+        "issues_per_second": round(issues / elapsed, 1),
+        "latency_ms": percentiles(latencies),
+    }
+
+
+async def run_benchmark(windows, issues=500, burst=50, latency=0.05, rate_limit_every=0):
+    results = [await run_window(window, issues, burst, latency, rate_limit_every) for window in windows]
+    return {
+        "benchmark": "jira",
+        "config": {"issues": issues, "burst": burst, "latency": latency, "rate_limit_every": rate_limit_every},
+        "windows": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Jira bulk creation benchmark")
+    parser.add_argument("--windows", type=float, nargs="+", default=[0, 10, 50], help="coalescing windows (ms)")
+    parser.add_argument("--issues", type=int, default=500)
+    parser.add_argument("--burst", type=int, default=50, help="concurrent create_issue calls per burst")
+    parser.add_argument("--latency", type=float, default=0.05, help="fake Jira latency per request (seconds)")
+    parser.add_argument("--rate-limit-every", type=int, default=0, help="answer every n-th request with 429")
+    parser.add_argument("--out", help="also write the JSON result to this file")
+    args = parser.parse_args()
+
+    result = asyncio.run(run_benchmark(
+        args.windows, issues=args.issues, burst=args.burst, latency=args.latency,
+        rate_limit_every=args.rate_limit_every,
+    ))
+    output = json.dumps(result)
+    print(output)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""Per-request logging overhead on the calling thread, before and after queued logging.
+
+Replays the log lines one webhook request produces (the webhook handler,
+SlackClient and the Slack activity) for a realistic Slack event payload, from
+several threads at once, writing to a real file:
+
+  before   basicConfig-style StreamHandler, eager f-strings with the full payload
+  queued   configure_logging(): JSON written by a listener thread, lazy arguments,
+           redacted payload
+  sampled  as queued, with the per-call info lines from clients.slack and
+           activities.slack sampled at --sample
+
+    python bench/bench_logging.py --requests 20000 --threads 8
+
+Prints one JSON object (and optionally writes it to --out).
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.logs import Payload, configure_logging, stop_logging
+
+PAYLOAD = {
+    "token": "verification-token-0123456789",
+    "team_id": "T012AB3C4",
+    "api_app_id": "A0KRD7HC3",
+    "event": {
+        "type": "message",
+        "channel": "C024BE91L",
+        "user": "U2147483697",
+        "text": "The deploy pipeline has been failing on integration tests since this morning. " * 8,
+        "ts": "1355517523.000005",
+        "blocks": [{"type": "rich_text", "block_id": f"b{i}", "elements": [
+            {"type": "rich_text_section", "elements": [{"type": "text", "text": "deploy pipeline " * 10}]}
+        ]} for i in range(6)],
+    },
+    "type": "event_callback",
+    "event_id": "Ev0PV52K21",
+    "event_time": 1355517523,
+}
+
+routes = logging.getLogger("project.routes")
+client = logging.getLogger("clients.slack")
+activity = logging.getLogger("activities.slack")
+
+
+def request_before(payload, workflow_id):
+    routes.info(f"Received Slack webhook: {payload}")
+    routes.info("Connecting to Temporal client...")
+    routes.info("Successfully connected to Temporal client")
+    routes.info(f"Starting workflow with ID: {workflow_id}")
+    routes.info(f"Successfully started workflow with ID: {workflow_id}")
+    activity.info(f"Slack activity: sending message to {payload['event']['channel']}")
+    client.info(f"Sending message to channel {payload['event']['channel']}")
+    client.info(f"Message sent successfully. Timestamp: {payload['event']['ts']}")
+    activity.info(f"Slack activity: adding reaction eyes to message {payload['event']['ts']}")
+    client.info(f"Adding reaction eyes to message {payload['event']['ts']} in {payload['event']['channel']}")
+    client.info(f"Reaction added successfully")
+
+
+def request_after(payload, workflow_id):
+    routes.info("Received Slack webhook: %s", Payload(payload))
+    routes.info("Connecting to Temporal client...")
+    routes.info("Successfully connected to Temporal client")
+    routes.info("Starting workflow with ID: %s", workflow_id)
+    routes.info("Successfully started workflow with ID: %s", workflow_id)
+    activity.info("Slack activity: sending message to %s", payload['event']['channel'])
+    client.info("Sending message to channel %s", payload['event']['channel'])
+    client.info("Message sent successfully. Timestamp: %s", payload['event']['ts'])
+    activity.info("Slack activity: adding reaction %s to message %s", "eyes", payload['event']['ts'])
+    client.info("Adding reaction %s to message %s in %s", "eyes", payload['event']['ts'], payload['event']['channel'])
+    client.info("Reaction added successfully")
+
+
+def configure_before(stream):
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] %(message)s"))
+    root.addHandler(handler)
+    root.setLevel(logging.INFO)
+
+
+def run_mode(mode, requests, threads, sample):
+    with tempfile.NamedTemporaryFile("w", suffix=".log") as stream:
+        if mode == "before":
+            configure_before(stream)
+            log_request = request_before
+        else:
+            rates = {"clients.slack": sample, "activities.slack": sample} if mode == "sampled" else {}
+            configure_logging(level="INFO", json_output=True, sample_rates=rates, stream=stream,
+                              queue_size=requests * 12)
+            log_request = request_after
+
+        per_thread = requests // threads
+        caller_seconds = []
+        caller_cpu_seconds = []
+
+        def worker():
+            started, cpu_started = time.perf_counter(), time.thread_time()
+            for i in range(per_thread):
+                log_request(PAYLOAD, f"slack-thread-C024BE91L-{i}")
+            caller_seconds.append(time.perf_counter() - started)
+            caller_cpu_seconds.append(time.thread_time() - cpu_started)
+
+        started = time.perf_counter()
+        pool = [threading.Thread(target=worker) for _ in range(threads)]
+        for thread in pool:
+            thread.start()
+        for thread in pool:
+            thread.join()
+        returned = time.perf_counter() - started
+        stop_logging()
+        stream.flush()
+        drained = time.perf_counter() - started
+
+        return {
+            "mode": mode,
+            # Wall time includes waiting for the GIL (and, before, the handler lock); CPU time doesn't
+            "caller_us_per_request": round(sum(caller_seconds) / (per_thread * threads) * 10 ** 6, 2),
+            "caller_cpu_us_per_request": round(sum(caller_cpu_seconds) / (per_thread * threads) * 10 ** 6, 2),
+            "wall_seconds": round(returned, 3),
+            "wall_seconds_incl_drain": round(drained, 3),
+            "bytes_per_request": round(os.path.getsize(stream.name) / (per_thread * threads)),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Logging overhead micro-benchmark")
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--sample", type=float, default=0.1, help="kept fraction of per-call Slack info lines")
+    parser.add_argument("--out", help="also write the JSON result to this file")
+    args = parser.parse_args()
+
+    results = [run_mode(mode, args.requests, args.threads, args.sample) for mode in ("before", "queued", "sampled")]
+    output = json.dumps({
+        "benchmark": "logging",
+        "config": {"requests": args.requests, "threads": args.threads, "sample": args.sample,
+                   "payload_bytes": len(json.dumps(PAYLOAD))},
+        "results": results,
+    })
+    print(output)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
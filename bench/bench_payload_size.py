@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Bytes of workflow history payload per RequestStart run, before and after
+the compact converter and trimmed inputs/results.
+
+    python bench/bench_payload_size.py [--text-bytes N] [--iterations N]
+
+Prints one JSON object so runs can be compared across commits.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from temporalio.converter import DataConverter
+
+from clients.temporal_converter import compact_data_converter
+from models.request import RequestEvent
+
+
+def slack_payload(text_bytes):
+    text = ("Our deploy pipeline is failing on the integration stage again, can someone take a look? " * 64)[:text_bytes]
+    return {
+        "token": "XXYYZZ",
+        "team_id": "T0123456789",
+        "api_app_id": "A0123456789",
+        "event": {
+            "type": "message",
+            "channel": "C0123456789",
+            "user": "U0123456789",
+            "text": text,
+            "ts": "1729238400.000100",
+            "event_ts": "1729238400.000100",
+            "channel_type": "channel",
+            "client_msg_id": "4b4b1f0e-2b8e-4a43-9a55-ae7a8f1e2b3c",
+            "team": "T0123456789",
+            "blocks": [{
+                "type": "rich_text",
+                "block_id": "abc12",
+                "elements": [{"type": "rich_text_section", "elements": [{"type": "text", "text": text}]}],
+            }],
+        },
+        "type": "event_callback",
+        "event_id": "Ev0123456789",
+        "event_time": 1729238400,
+        "authorizations": [{
+            "enterprise_id": None, "team_id": "T0123456789", "user_id": "U0BOT00000",
+            "is_bot": True, "is_enterprise_install": False,
+        }],
+        "is_ext_shared_channel": False,
+        "event_context": "4-eyJldCI6Im1lc3NhZ2UiLCJ0aWQiOiJUMDEyMzQ1Njc4OSIsImFpZCI6IkEwMTIzNDU2Nzg5In0",
+    }
+
+
+def before_values(payload):
+    message = f"Hello from workflow! Event: {payload['event_id']}"
+    activity_result = {"success": True, "timestamp": "1729238401.000200", "channel": "C0TMP00000", "message": message}
+    return [
+        payload,                                     # workflow input
+        "#tmp-rohan-test", message,                  # activity input
+        activity_result,                             # activity result
+        {"status": "completed", "event_id": payload["event_id"], "slack_message_result": activity_result},
+    ]
+
+
+def after_values(payload):
+    event = RequestEvent.from_slack_payload(payload)
+    message = f"Hello from workflow! Event: {event.event_id}"
+    return [
+        event,
+        "#tmp-rohan-test", message,
+        {"success": True, "timestamp": "1729238401.000200", "channel": "C0TMP00000"},
+        {"status": "completed", "event_id": event.event_id, "slack_message_ts": "1729238401.000200", "success": True},
+    ]
+
+
+async def measure(converter, values, iterations):
+    payloads = await converter.encode(values)
+    size = sum(payload.ByteSize() for payload in payloads)
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await converter.decode(await converter.encode(values))
+    per_run_us = (time.perf_counter() - started) / iterations * 1e6
+    return size, per_run_us
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--text-bytes", type=int, default=2000)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    payload = slack_payload(args.text_bytes)
+    before_bytes, before_us = await measure(DataConverter.default, before_values(payload), args.iterations)
+    after_bytes, after_us = await measure(compact_data_converter(), after_values(payload), args.iterations)
+
+    print(json.dumps({
+        "benchmark": "payload_size",
+        "text_bytes": args.text_bytes,
+        "before_bytes_per_workflow": before_bytes,
+        "after_bytes_per_workflow": after_bytes,
+        "reduction": round(1 - after_bytes / before_bytes, 3),
+        "before_roundtrip_us": round(before_us, 1),
+        "after_roundtrip_us": round(after_us, 1),
+    }))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""Request store benchmark.
+
+Fills a fresh request store with --rows requests (spread over statuses,
+components, reporters and assignees), then times the listings a dashboard
+or Slack home tab makes: filtered first pages, a deep page reached through
+the cursor, a single lookup, and the same listing through GET /requests.
+Also reports the in-memory size of a Request record.
+
+    python bench/bench_request_store.py --rows 1000000
+
+Prints one JSON object (and optionally writes it to --out).
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench.bench_intake import percentiles
+from models.request import Request
+from utils.request_store import RequestStore
+
+STATUSES = ("open", "open", "open", "in_progress", "closed", "closed", "closed", "closed")
+COMPONENTS = [f"component-{i}" for i in range(50)]
+PEOPLE = [f"user{i}@example.com" for i in range(5000)]
+
+
+def generate(rows, seed=7):
+    rng = random.Random(seed)
+    for i in range(rows):
+        created = f"{1700000000 + i * 3}.{i % 1000000:06d}"
+        yield Request(
+            id=f"Ev{i:010d}",
+            request_type=rng.choice(("bug", "access", "question")),
+            status=rng.choice(STATUSES),
+            created_at=created,
+            updated_at=created,
+            reporter_email=rng.choice(PEOPLE),
+            assignee_email=rng.choice(PEOPLE) if rng.random() < 0.7 else "",
+            component=rng.choice(COMPONENTS),
+            channel=f"C{rng.randrange(200):04d}",
+            message="Something is broken, please take a look " * 2,
+        )
+
+
+def fill(store, rows, batch_size=10000):
+    batch = []
+    for request in generate(rows):
+        batch.append(request)
+        if len(batch) == batch_size:
+            store.save_many(batch)
+            batch = []
+    if batch:
+        store.save_many(batch)
+
+
+def timed(fn, iterations):
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return percentiles(samples)
+
+
+def record_bytes(count=10000):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    records = list(generate(count))
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del records
+    return round(used / count, 1)
+
+
+def run_benchmark(rows=1000000, iterations=200, page_size=50, path=None):
+    path = path or os.path.join(tempfile.mkdtemp(prefix="bench-requests-"), "requests.db")
+    store = RequestStore(path)
+    started = time.perf_counter()
+    fill(store, rows)
+    fill_seconds = time.perf_counter() - started
+
+    rng = random.Random(11)
+
+    def deep_page():
+        # Twenty pages into one component's open requests
+        cursor = None
+        for _ in range(20):
+            _, cursor = store.query(limit=page_size, cursor=cursor, component="component-7", status="open")
+
+    from project.app import create_app
+    from utils.settings import Settings
+
+    client = create_app(settings=Settings(request_store_path=path)).test_client()
+
+    result = {
+        "benchmark": "request_store",
+        "config": {"rows": rows, "iterations": iterations, "page_size": page_size},
+        "fill_seconds": round(fill_seconds, 1),
+        "file_mb": round(os.path.getsize(path) / 2 ** 20, 1),
+        "request_bytes": record_bytes(),
+        "latency_ms": {
+            "newest": timed(lambda: store.query(limit=page_size), iterations),
+            "by_status": timed(lambda: store.query(limit=page_size, status="open"), iterations),
+            "by_component_and_status": timed(
+                lambda: store.query(limit=page_size, component=rng.choice(COMPONENTS), status="open"), iterations),
+            "by_reporter": timed(lambda: store.query(limit=page_size, reporter_email=rng.choice(PEOPLE)), iterations),
+            "by_assignee": timed(lambda: store.query(limit=page_size, assignee_email=rng.choice(PEOPLE)), iterations),
+            "twenty_pages_by_cursor": timed(deep_page, max(1, iterations // 10)),
+            "get_by_id": timed(lambda: store.get(f"Ev{rng.randrange(rows):010d}"), iterations),
+            "endpoint_by_component": timed(
+                lambda: client.get(f"/requests?component={rng.choice(COMPONENTS)}&limit={page_size}"), iterations),
+        },
+    }
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Request store listing benchmark")
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--path", help="store file (default: a fresh temporary file)")
+    parser.add_argument("--out", help="also write the JSON result to this file")
+    args = parser.parse_args()
+
+    output = json.dumps(run_benchmark(args.rows, args.iterations, args.page_size, args.path))
+    print(output)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
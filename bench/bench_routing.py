@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Routing rule compile time and classification cost as the rule count grows.
+
+Generates synthetic rule sets (keyword phrases, emoji, channel-scoped rules
+and a fixed handful of regexes) and classifies a fixed set of realistic
+messages against each. Per-message time should stay flat as rules grow.
+
+    python bench/bench_routing.py --rules 10 100 1000 5000 --messages 2000
+
+Prints one JSON object (and optionally writes it to --out).
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.routing import CompiledRules
+
+WORDS = ("deploy pipeline build test database replica lag access grant laptop vpn network dns cache queue "
+         "latency error timeout certificate login password incident outage service api gateway kafka").split()
+
+MESSAGES = [
+    "The deploy pipeline is failing on integration tests, can someone take a look?",
+    "Getting permission denied on the analytics bucket since this morning :sweat:",
+    "Replica lag on the orders database is above 30s, see INC-4821 for context",
+    "How do I request a new laptop? Mine is from 2019 and keeps overheating during builds",
+    "api gateway returns 502 for roughly 5% of requests in eu-west-1 after the last release :fire:",
+]
+
+
+def make_rules(count, seed=7):
+    rng = random.Random(seed)
+    rules = []
+    for i in range(count):
+        rule = {"name": f"rule-{i}", "priority": rng.randint(0, 100), "component": f"component-{i % 97}",
+                "request_type": rng.choice(["bug", "question", "access", "incident"]), "channel": f"#team-{i % 50}"}
+        kind = i % 10
+        if kind < 7:
+            rule["keywords"] = [" ".join(rng.sample(WORDS, rng.randint(1, 3))) + f" {i}" if i % 3 else
+                                " ".join(rng.sample(WORDS, 2)) for _ in range(3)]
+        elif kind < 9:
+            rule["emoji"] = [f"emoji_{i}", rng.choice(["fire", "rotating_light", "sweat"])]
+        else:
+            rule["channels"] = [f"C{i:06d}"]
+        rules.append(rule)
+    # Regexes don't get a shared index, so real configs keep them few
+    rules.extend({"name": f"regex-{i}", "regex": [pattern], "request_type": "incident"}
+                 for i, pattern in enumerate([r"\bINC-\d+\b", r"\b5\d\d\b", r"\bsev[12]\b"]))
+    return {"default": {"request_type": "question"}, "rules": rules}
+
+
+def run_benchmark(rule_counts, messages=2000):
+    results = []
+    for count in rule_counts:
+        config = make_rules(count)
+        started = time.perf_counter()
+        rules = CompiledRules(config)
+        compile_seconds = time.perf_counter() - started
+
+        matched = 0
+        started = time.perf_counter()
+        for i in range(messages):
+            route = rules.classify(f"C{i % 5000:06d}", MESSAGES[i % len(MESSAGES)])
+            matched += bool(route.rule)
+        elapsed = time.perf_counter() - started
+
+        results.append({
+            "rules": len(config["rules"]),
+            "compile_ms": round(compile_seconds * 1000, 3),
+            "classify_us_per_message": round(elapsed / messages * 10 ** 6, 2),
+            "matched": matched,
+        })
+    return {
+        "benchmark": "routing",
+        "config": {"messages": messages, "avg_message_chars": sum(map(len, MESSAGES)) // len(MESSAGES)},
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Routing engine micro-benchmark")
+    parser.add_argument("--rules", type=int, nargs="+", default=[10, 100, 1000, 5000])
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--out", help="also write the JSON result to this file")
+    args = parser.parse_args()
+
+    output = json.dumps(run_benchmark(args.rules, messages=args.messages))
+    print(output)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
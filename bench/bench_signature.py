@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Cost of authenticating and rejecting Slack webhooks.
+
+Times SignatureVerifier on a realistic event body (valid, forged, stale and
+header-less requests) against the textbook implementation that builds the
+basestring and a fresh HMAC per request, then the full /webhooks/slack
+rejection path through the Flask test client.
+
+    python bench/bench_signature.py --iterations 50000
+
+Prints one JSON object (and optionally writes it to --out).
+"""
+
+import argparse
+import hashlib
+import hmac
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench.bench_intake import webhook_payload
+from utils.slack_signature import SignatureVerifier
+
+SECRET = "8f742231b10e8888abcd99yyyzzz85a5"
+
+
+def naive_verify(secret, body, timestamp, signature):
+    if abs(time.time() - int(timestamp)) > 300:
+        return False
+    basestring = f"v0:{timestamp}:{body.decode()}".encode()
+    expected = "v0=" + hmac.new(secret.encode(), basestring, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature)
+
+
+def per_call_us(func, iterations):
+    started = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return round((time.perf_counter() - started) / iterations * 10 ** 6, 3)
+
+
+def run_benchmark(iterations=50000):
+    body = json.dumps(webhook_payload("Ev0BENCH")).encode()
+    now = int(time.time())
+    valid = SignatureVerifier.sign(SECRET, body, now)
+    forged = SignatureVerifier.sign("forged", body, now)
+    verifier = SignatureVerifier([SECRET])
+    rotating = SignatureVerifier([SECRET, "previous-secret"])
+
+    verify = {
+        "valid": per_call_us(lambda: verifier.verify(body, str(now), valid), iterations),
+        "forged": per_call_us(lambda: verifier.verify(body, str(now), forged), iterations),
+        "forged_two_secrets": per_call_us(lambda: rotating.verify(body, str(now), forged), iterations),
+        "stale": per_call_us(lambda: verifier.verify(body, str(now - 3600), valid), iterations),
+        "missing_headers": per_call_us(lambda: verifier.verify(body, None, None), iterations),
+        "naive_valid": per_call_us(lambda: naive_verify(SECRET, body, str(now), valid), iterations),
+    }
+
+    from project.app import create_app
+    from utils.settings import Settings
+
+    client = create_app(settings=Settings(slack_signing_secrets=(SECRET,))).test_client()
+    requests = max(1, iterations // 20)
+    headers = {"X-Slack-Request-Timestamp": str(now), "X-Slack-Signature": forged}
+    endpoint = {
+        "forged_rejected": per_call_us(lambda: client.post(
+            "/webhooks/slack", data=body, content_type="application/json", headers=headers), requests),
+        "unsigned_rejected": per_call_us(lambda: client.post(
+            "/webhooks/slack", data=body, content_type="application/json"), requests),
+    }
+
+    return {
+        "benchmark": "signature",
+        "config": {"iterations": iterations, "body_bytes": len(body)},
+        "verify_us": verify,
+        "endpoint_us": endpoint,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Slack signature verification micro-benchmark")
+    parser.add_argument("--iterations", type=int, default=50000)
+    parser.add_argument("--out", help="also write the JSON result to this file")
+    args = parser.parse_args()
+
+    output = json.dumps(run_benchmark(args.iterations))
+    print(output)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""Load test for Socket Mode ingestion.
+
+Runs SocketModeIngest against an in-process fake Socket Mode server and a
+fake Temporal client, pushing Events API envelopes at a fixed rate
+(including duplicates). Reports the ack latency Slack would see and the
+time from envelope to workflow start. Compare the ack latency with
+bench/bench_intake.py, which measures the HTTP webhook path.
+
+    python bench/bench_socket_mode.py --rate 500 --duration 10 --start-latency 0.05
+
+Prints one JSON object (and optionally writes it to --out).
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import clients.temporal
+from bench.bench_intake import percentiles, webhook_payload
+from bench.fakes import FakeSlackSocketServer, FakeTemporalClient
+from clients.slack_socket import SlackSocketClient
+from project.socket_mode import SocketModeIngest
+from utils.dedup import RecentEvents
+
+
+async def run_benchmark(rate=200.0, duration=5.0, duplicates=0.0, start_latency=0.02, queue_size=1000,
+                        concurrency=16):
+    sent_at = {}
+    started_at = {}
+
+    async def deliver(event):
+        started_at.setdefault(event.event_id, time.perf_counter())
+
+    async def connect():
+        return FakeTemporalClient(start_latency=start_latency, deliver=deliver)
+
+    clients.temporal.start_temporal_client = connect
+
+    server = FakeSlackSocketServer()
+    base_url = await server.start()
+    ingest = SocketModeIngest(SlackSocketClient(app_token="xapp-bench", base_url=base_url),
+                              dedup=RecentEvents(), queue_size=queue_size, concurrency=concurrency)
+    await ingest.start()
+
+    rng = random.Random(7)
+    event_ids = []
+    interval = 1.0 / rate
+    began = time.perf_counter()
+    for i in range(int(rate * duration)):
+        await asyncio.sleep(max(0.0, began + i * interval - time.perf_counter()))
+        if event_ids and rng.random() < duplicates:
+            event_id = rng.choice(event_ids)
+        else:
+            event_id = f"Ev{uuid.uuid4().hex[:12]}"
+            event_ids.append(event_id)
+            sent_at[event_id] = time.perf_counter()
+        payload = webhook_payload(event_id)
+        # One thread per event, like distinct Slack messages
+        payload["event"]["ts"] = f"{1700000000 + i}.000100"
+        await server.send_event(payload)
+    elapsed = time.perf_counter() - began
+
+    deadline = time.perf_counter() + 10
+    while len(started_at) < len(event_ids) and time.perf_counter() < deadline:
+        await asyncio.sleep(0.05)
+    await ingest.stop(drain_timeout=5)
+    await server.stop()
+
+    return {
+        "benchmark": "socket_mode",
+        "config": {"rate": rate, "duration": duration, "duplicates": duplicates, "start_latency": start_latency,
+                   "queue_size": queue_size, "concurrency": concurrency},
+        "envelopes": len(server.sent),
+        "acked": len(server.acked),
+        "achieved_rate": round(len(server.sent) / elapsed, 1),
+        "ack_latency_ms": percentiles(server.ack_latencies),
+        "start_latency_ms": percentiles([started_at[e] - sent_at[e] for e in started_at]),
+        "ingest": ingest.stats(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Socket Mode ingestion load test")
+    parser.add_argument("--rate", type=float, default=200.0, help="envelopes per second")
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--duplicates", type=float, default=0.05, help="fraction of redelivered events")
+    parser.add_argument("--start-latency", type=float, default=0.02, help="fake Temporal start latency (s)")
+    parser.add_argument("--queue-size", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--out", help="also write the JSON result to this file")
+    args = parser.parse_args()
+
+    result = asyncio.run(run_benchmark(args.rate, args.duration, args.duplicates, args.start_latency,
+                                       args.queue_size, args.concurrency))
+    output = json.dumps(result)
+    print(output)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
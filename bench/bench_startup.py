@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""Cold-start benchmark for the web tier and the worker.
+
+Each scenario runs in a fresh interpreter (so nothing is already imported)
+and reports the median wall time over --runs:
+
+    import_app      import project.app
+    first_request   import project.app, create_app() and a first GET /health
+    import_worker   import worker (entry point module, without starting it)
+
+    python bench/bench_startup.py --runs 15
+
+Prints one JSON object (and optionally writes it to --out).
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCENARIOS = {
+    "import_app": "import project.app",
+    "first_request": (
+        "from project.app import create_app\n"
+        "assert create_app().test_client().get('/health').status_code == 200"
+    ),
+    "import_worker": "import worker",
+}
+
+TIMED = """
+import time
+began = time.perf_counter()
+{code}
+print(time.perf_counter() - began)
+"""
+
+
+def time_scenario(code, runs):
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", TIMED.format(code=code)],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout
+        samples.append(float(output.strip().splitlines()[-1]))
+    return {
+        "median_ms": round(statistics.median(samples) * 1000, 1),
+        "min_ms": round(min(samples) * 1000, 1),
+    }
+
+
+def run_benchmark(runs=10):
+    return {
+        "benchmark": "startup",
+        "config": {"runs": runs, "python": sys.version.split()[0]},
+        **{name: time_scenario(code, runs) for name, code in SCENARIOS.items()},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Web tier and worker cold-start benchmark")
+    parser.add_argument("--runs", type=int, default=10, help="fresh interpreters per scenario")
+    parser.add_argument("--out", help="also write the JSON result to this file")
+    args = parser.parse_args()
+
+    output = json.dumps(run_benchmark(args.runs))
+    print(output)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
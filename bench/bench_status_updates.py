@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""Slack status update benchmark.
+
+Simulates an incident: --requests request threads in one channel, each
+receiving --events state changes at random over --duration seconds. Each
+thread behaves like RequestStart: it applies whatever changes have arrived,
+then awaits one status update before looking again. Compares posting every
+change as its own chat.postMessage (the old behaviour) with StatusCoalescer
+editing one status message per thread.
+
+Reports Slack calls per request, the channel's peak calls in any one second
+(Slack allows about one message per second per channel) and how long the
+final state took to show after the last change.
+
+    python bench/bench_status_updates.py --requests 50 --events 20 --window 1.0
+
+Prints one JSON object (and optionally writes it to --out).
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench.bench_intake import percentiles
+from clients.slack import StatusCoalescer
+
+
+class CountingSlackClient:
+    def __init__(self, latency):
+        self.latency = latency
+        self.calls = []
+
+    async def _call(self, method):
+        await asyncio.sleep(self.latency)
+        self.calls.append((method, time.perf_counter()))
+        return {"ok": True, "ts": f"{len(self.calls)}.000100"}
+
+    async def send_message(self, channel, text, **kwargs):
+        return await self._call("chat.postMessage")
+
+    async def update_message(self, channel, message_ts, text, **kwargs):
+        return await self._call("chat.update")
+
+
+async def run_thread(key, arrivals, send):
+    """Apply arrived changes, send one update, repeat; returns when the last change is shown."""
+    began = time.perf_counter()
+    applied = 0
+    shown_at = None
+    while applied < len(arrivals):
+        now = time.perf_counter() - began
+        if arrivals[applied] > now:
+            await asyncio.sleep(arrivals[applied] - now)
+            continue
+        while applied < len(arrivals) and arrivals[applied] <= time.perf_counter() - began:
+            applied += 1
+        await send(key, applied)
+        shown_at = time.perf_counter() - began
+    return shown_at - arrivals[-1]
+
+
+async def run_mode(mode, requests, events, duration, window, latency, seed):
+    client = CountingSlackClient(latency)
+    coalescer = StatusCoalescer(client, window=window)
+    rng = random.Random(seed)
+
+    async def send(key, version):
+        if mode == "coalesced":
+            await coalescer.set_status(key, "C-incident", f"{key} state {version}", version)
+        else:
+            await client.send_message(channel="C-incident", text=f"{key} state {version}")
+
+    threads = [sorted(rng.uniform(0, duration) for _ in range(events)) for _ in range(requests)]
+    started = time.perf_counter()
+    lags = await asyncio.gather(*(run_thread(f"thread-{i}", arrivals, send) for i, arrivals in enumerate(threads)))
+
+    per_second = Counter(int(at - started) for _, at in client.calls)
+    return {
+        "calls": len(client.calls),
+        "calls_per_request": round(len(client.calls) / requests, 2),
+        "peak_calls_per_second": max(per_second.values()),
+        "methods": dict(Counter(method for method, _ in client.calls)),
+        "final_state_lag_ms": percentiles(lags),
+    }
+
+
+async def run_benchmark(requests=50, events=20, duration=10.0, window=1.0, latency=0.05, seed=7):
+    return {
+        "benchmark": "status_updates",
+        "config": {"requests": requests, "events": events, "duration": duration, "window": window,
+                   "latency": latency},
+        "per_message": await run_mode("per_message", requests, events, duration, window, latency, seed),
+        "coalesced": await run_mode("coalesced", requests, events, duration, window, latency, seed),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Slack status update coalescing benchmark")
+    parser.add_argument("--requests", type=int, default=50, help="request threads")
+    parser.add_argument("--events", type=int, default=20, help="state changes per request")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds the changes are spread over")
+    parser.add_argument("--window", type=float, default=1.0, help="coalescing window (seconds)")
+    parser.add_argument("--latency", type=float, default=0.05, help="fake Slack API latency (seconds)")
+    parser.add_argument("--out", help="also write the JSON result to this file")
+    args = parser.parse_args()
+
+    result = asyncio.run(run_benchmark(args.requests, args.events, args.duration, args.window, args.latency))
+    output = json.dumps(result)
+    print(output)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
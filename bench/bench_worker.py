@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""Worker throughput and CPU cost per workflow task, by worker profile.
+
+For each profile in utils/worker_tuning.py, starts an in-process worker
+against a Temporal dev server (downloaded on first use, --dev-server-path,
+or an already running one at --address) and signal-with-starts RequestStart
+workflows, which acknowledge through the batch_update local activity to an
+in-process fake Slack and save to a temporary request store. Once every
+acknowledgement has arrived, workflow tasks are counted from the histories.
+
+    python bench/bench_worker.py --workflows 500 --concurrency 50
+    python bench/bench_worker.py --profiles sdk balanced --out results.json
+    temporal server start-dev &  python bench/bench_worker.py --address localhost:7233
+
+Reports workflow tasks per second and process CPU per workflow task. The
+driver (client calls) shares the process, so CPU numbers are for comparing
+profiles, not absolute sizing on their own. Prints one JSON object.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from temporalio.api.enums.v1 import EventType
+from temporalio.client import Client
+from temporalio.testing import WorkflowEnvironment
+from temporalio.worker import Worker
+
+from activities.request_store import RequestStoreActivity
+from activities.slack import AsyncSlackActivity
+from bench.fakes import FakeSlackServer
+from clients.slack import AsyncSlackClient
+from clients.slack_dispatcher import SlackDispatcher
+from clients.temporal_converter import compact_data_converter
+from models.request import RequestEvent
+from utils.request_store import RequestStore
+from utils.settings import Settings
+from utils.worker_tuning import PROFILES
+from workflows.request_start import RequestStart
+
+
+async def count_workflow_tasks(client, workflow_ids, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def count(workflow_id):
+        async with semaphore:
+            history = await client.get_workflow_handle(workflow_id).fetch_history()
+            return sum(1 for e in history.events if e.event_type == EventType.EVENT_TYPE_WORKFLOW_TASK_COMPLETED)
+
+    return sum(await asyncio.gather(*(count(workflow_id) for workflow_id in workflow_ids)))
+
+
+async def run_profile(client, profile, slack, settings, workflows, concurrency, timeout):
+    task_queue = f"bench-worker-{profile.name}-{uuid.uuid4().hex[:8]}"
+    slack_activity = AsyncSlackActivity()
+    slack_activity.slack_client = AsyncSlackClient(settings=settings)
+    store_activity = RequestStoreActivity(RequestStore(settings.request_store_path))
+    worker = Worker(
+        client,
+        task_queue=task_queue,
+        workflows=[RequestStart],
+        activities=[slack_activity.send_message, slack_activity.add_reaction, slack_activity.update_message,
+                    slack_activity.batch_update, store_activity.save_request],
+        **profile.worker_kwargs(),
+    )
+
+    workflow_ids = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def start(i):
+        event = RequestEvent(event_id=f"Ev{uuid.uuid4().hex[:12]}", channel="C0BENCH", user="U0BENCH",
+                             text="Bench request", ts=f"{time.time():.6f}")
+        workflow_id = f"bench-{profile.name}-{i}-{event.event_id}"
+        workflow_ids.append(workflow_id)
+        async with semaphore:
+            await client.start_workflow(
+                RequestStart.run, event, id=workflow_id, task_queue=task_queue,
+                start_signal="new_event", start_signal_args=[event],
+            )
+        return event.event_id
+
+    delivered_before = len(slack.delivered)
+    async with worker:
+        cpu_started = time.process_time()
+        started = time.perf_counter()
+        await asyncio.gather(*(start(i) for i in range(workflows)))
+
+        deadline = started + timeout
+        while len(slack.delivered) - delivered_before < workflows and time.perf_counter() < deadline:
+            await asyncio.sleep(0.02)
+        elapsed = time.perf_counter() - started
+        cpu = time.process_time() - cpu_started
+
+    await slack_activity.slack_client.close()
+    tasks = await count_workflow_tasks(client, workflow_ids, concurrency)
+    await asyncio.gather(*(
+        client.get_workflow_handle(workflow_id).terminate("benchmark finished") for workflow_id in workflow_ids
+    ), return_exceptions=True)
+
+    return {
+        "profile": profile.name,
+        "settings": {key: repr(value) for key, value in profile.worker_kwargs().items()},
+        "workflows": workflows,
+        "acknowledged": len(slack.delivered) - delivered_before,
+        "workflow_tasks": tasks,
+        "seconds": round(elapsed, 3),
+        "workflow_tasks_per_second": round(tasks / elapsed, 1) if elapsed else None,
+        "cpu_ms_per_workflow_task": round(cpu * 1000 / tasks, 3) if tasks else None,
+    }
+
+
+async def run_benchmark(profiles, workflows=200, concurrency=50, timeout=60.0, dev_server_path=None,
+                        address=None, namespace="default"):
+    slack = FakeSlackServer()
+    base_url = await slack.start()
+    tmp_dir = tempfile.mkdtemp(prefix="bench-worker-")
+    os.environ["SLACK_BOT_TOKEN"] = "xoxb-bench"
+    os.environ["SLACK_API_URL"] = base_url
+    os.environ["SLACK_USER_CACHE_PATH"] = os.path.join(tmp_dir, "users.json")
+    os.environ["REQUEST_STORE_PATH"] = os.path.join(tmp_dir, "requests.db")
+    settings = Settings.from_env()
+    # The benchmark measures the worker, not Slack's published rate limits
+    SlackDispatcher._instance = SlackDispatcher(
+        tier_rates={tier: 10 ** 7 for tier in range(1, 5)}, channel_rate=10 ** 6, channel_burst=10 ** 6
+    )
+
+    env = None
+    if address:
+        client = await Client.connect(address, namespace=namespace, data_converter=compact_data_converter())
+    else:
+        env = await WorkflowEnvironment.start_local(
+            data_converter=compact_data_converter(), dev_server_existing_path=dev_server_path
+        )
+        client = env.client
+    try:
+        results = []
+        for name in profiles:
+            results.append(await run_profile(client, PROFILES[name], slack, settings, workflows, concurrency,
+                                             timeout))
+    finally:
+        if env is not None:
+            await env.shutdown()
+        await slack.stop()
+
+    return {
+        "benchmark": "worker",
+        "config": {"workflows": workflows, "concurrency": concurrency, "cpus": os.cpu_count()},
+        "profiles": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Worker profile benchmark")
+    parser.add_argument("--profiles", nargs="+", choices=list(PROFILES), default=list(PROFILES))
+    parser.add_argument("--workflows", type=int, default=200, help="RequestStart workflows per profile")
+    parser.add_argument("--concurrency", type=int, default=50, help="concurrent workflow starts")
+    parser.add_argument("--timeout", type=float, default=60.0, help="seconds to wait for acknowledgements")
+    parser.add_argument("--dev-server-path", help="existing `temporal` CLI binary")
+    parser.add_argument("--address", help="use a running Temporal server (host:port) instead of starting one")
+    parser.add_argument("--namespace", default="default", help="namespace on --address")
+    parser.add_argument("--out", help="also write the JSON result to this file")
+    args = parser.parse_args()
+
+    result = asyncio.run(run_benchmark(
+        args.profiles, workflows=args.workflows, concurrency=args.concurrency,
+        timeout=args.timeout, dev_server_path=args.dev_server_path, address=args.address,
+        namespace=args.namespace,
+    ))
+    output = json.dumps(result)
+    print(output)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
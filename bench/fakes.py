@@ -0,0 +1,319 @@
+"""In-process stand-ins for Temporal, Slack, Jira and PagerDuty used by the tests and benchmarks."""
+
+import asyncio
+import json
+import re
+import time
+from datetime import datetime
+from types import SimpleNamespace
+
+from aiohttp import WSMsgType, web
+from temporalio.exceptions import WorkflowAlreadyStartedError
+
+EVENT_ID_PATTERN = re.compile(r"Event: (\S+)")
+
+
+class FakeSlackServer:
+    """Slack Web API stand-in that timestamps every delivered message.
+
+    Messages carrying ``Event: <event_id>`` (as RequestStart posts) are recorded
+    in ``delivered`` so callers can compute end-to-end delivery latency.
+    """
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.calls = 0
+        self.delivered = {}
+        self._runner = None
+        self.base_url = None
+
+    async def _post_message(self, request):
+        self.calls += 1
+        body = await request.json()
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        match = EVENT_ID_PATTERN.search(body.get("text", ""))
+        if match:
+            self.delivered.setdefault(match.group(1), time.perf_counter())
+        return web.json_response({"ok": True, "channel": body.get("channel"), "ts": f"{time.time():.6f}"})
+
+    async def _ok(self, request):
+        self.calls += 1
+        return web.json_response({"ok": True})
+
+    async def start(self, host="127.0.0.1", port=0):
+        app = web.Application()
+        app.router.add_post("/api/chat.postMessage", self._post_message)
+        app.router.add_post("/api/chat.update", self._ok)
+        app.router.add_post("/api/reactions.add", self._ok)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://{host}:{port}/api/"
+        return self.base_url
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+
+class FakeSlackSocketServer:
+    """Slack Socket Mode stand-in: ``apps.connections.open`` plus the websocket.
+
+    ``send_event`` pushes an Events API envelope to the connected client and
+    returns its envelope_id; acknowledgements are timestamped in ``acked``
+    and their latency (send to ack) recorded in ``ack_latencies``.
+    """
+
+    def __init__(self):
+        self.sent = {}
+        self.acked = {}
+        self.ack_latencies = []
+        self.connections = 0
+        self.connected = asyncio.Event()
+        self._socket = None
+        self._runner = None
+        self._envelopes = 0
+        self.base_url = None
+
+    async def _open(self, request):
+        return web.json_response({"ok": True, "url": self._wss_url})
+
+    async def _websocket(self, request):
+        socket = web.WebSocketResponse(autoping=True)
+        await socket.prepare(request)
+        self.connections += 1
+        self._socket = socket
+        await socket.send_json({"type": "hello", "num_connections": 1,
+                                "debug_info": {"host": "fake"}, "connection_info": {"app_id": "A1"}})
+        self.connected.set()
+        async for message in socket:
+            if message.type != WSMsgType.TEXT:
+                continue
+            envelope_id = json.loads(message.data).get("envelope_id")
+            if envelope_id in self.sent and envelope_id not in self.acked:
+                self.acked[envelope_id] = time.perf_counter()
+                self.ack_latencies.append(self.acked[envelope_id] - self.sent[envelope_id])
+        self.connected.clear()
+        return socket
+
+    async def send_event(self, payload, envelope_type="events_api", retry_attempt=0):
+        await self.connected.wait()
+        self._envelopes += 1
+        envelope_id = f"env-{self._envelopes}"
+        self.sent[envelope_id] = time.perf_counter()
+        await self._socket.send_json({
+            "envelope_id": envelope_id,
+            "type": envelope_type,
+            "payload": payload,
+            "accepts_response_payload": False,
+            "retry_attempt": retry_attempt,
+            "retry_reason": "timeout" if retry_attempt else "",
+        })
+        return envelope_id
+
+    async def start(self, host="127.0.0.1", port=0):
+        app = web.Application()
+        app.router.add_post("/api/apps.connections.open", self._open)
+        app.router.add_get("/link", self._websocket)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self._wss_url = f"ws://{host}:{port}/link"
+        self.base_url = f"http://{host}:{port}/api/"
+        return self.base_url
+
+    async def stop(self):
+        if self._socket is not None:
+            await self._socket.close()
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+
+class FakeJiraServer:
+    """Jira REST (v2) stand-in for issue creation, single and bulk.
+
+    Every ``rate_limit_every``-th request is answered with 429 and a
+    ``Retry-After`` of ``retry_after`` seconds. Issues whose summary contains
+    "INVALID" fail with a field error, reported per element in bulk requests.
+    Fetching issue "GATEWAY-1" returns a proxy's HTML 502 page. Bulk
+    responses leave out their last ``drop_bulk_issues`` created issues.
+    """
+
+    def __init__(self, latency=0.0, rate_limit_every=0, retry_after=0.01, drop_bulk_issues=0):
+        self.latency = latency
+        self.rate_limit_every = rate_limit_every
+        self.retry_after = retry_after
+        self.drop_bulk_issues = drop_bulk_issues
+        self.requests = 0
+        self.bulk_requests = 0
+        self.rate_limited = 0
+        self.issues = {}
+        self._runner = None
+        self.base_url = None
+
+    async def _throttle(self):
+        self.requests += 1
+        number = self.requests
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.rate_limit_every and number % self.rate_limit_every == 0:
+            self.rate_limited += 1
+            return web.json_response({"errorMessages": ["Rate limit exceeded"]}, status=429,
+                                     headers={"Retry-After": str(self.retry_after)})
+        return None
+
+    def _create(self, fields):
+        if "INVALID" in fields.get("summary", ""):
+            return None, {"summary": "Summary is invalid"}
+        issue_id = str(10000 + len(self.issues))
+        key = f"{fields['project']['key']}-{len(self.issues) + 1}"
+        self.issues[key] = {"id": issue_id, "key": key, "fields": fields}
+        return {"id": issue_id, "key": key, "self": f"{self.base_url}rest/api/2/issue/{issue_id}"}, None
+
+    async def _create_issue(self, request):
+        limited = await self._throttle()
+        if limited:
+            return limited
+        issue, errors = self._create((await request.json())["fields"])
+        if errors:
+            return web.json_response({"errorMessages": [], "errors": errors}, status=400)
+        return web.json_response(issue, status=201)
+
+    async def _create_bulk(self, request):
+        limited = await self._throttle()
+        if limited:
+            return limited
+        self.bulk_requests += 1
+        issues, failures = [], []
+        for index, update in enumerate((await request.json())["issueUpdates"]):
+            issue, errors = self._create(update["fields"])
+            if errors:
+                failures.append({"status": 400, "failedElementNumber": index,
+                                 "elementErrors": {"errorMessages": [], "errors": errors}})
+            else:
+                issues.append(issue)
+        if self.drop_bulk_issues:
+            issues = issues[:-self.drop_bulk_issues]
+        return web.json_response({"issues": issues, "errors": failures}, status=201)
+
+    async def _get_issue(self, request):
+        limited = await self._throttle()
+        if limited:
+            return limited
+        if request.match_info["key"] == "GATEWAY-1":
+            return web.Response(text="<html><body>502 Bad Gateway</body></html>", status=502,
+                                content_type="text/html")
+        issue = self.issues.get(request.match_info["key"])
+        if issue is None:
+            return web.json_response({"errorMessages": ["Issue does not exist"]}, status=404)
+        return web.json_response(issue)
+
+    async def start(self, host="127.0.0.1", port=0):
+        app = web.Application()
+        app.router.add_post("/rest/api/2/issue", self._create_issue)
+        app.router.add_post("/rest/api/2/issue/bulk", self._create_bulk)
+        app.router.add_get("/rest/api/2/issue/{key}", self._get_issue)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://{host}:{port}/"
+        return self.base_url
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+
+class FakePagerdutyServer:
+    """PagerDuty REST (v2) stand-in serving rendered schedules and user search.
+
+    ``schedules`` maps schedule ids to rendered entries (``start``/``end`` ISO
+    timestamps and a ``user`` reference); requests return the entries that
+    overlap ``since``..``until``. Set ``fail`` to answer schedules with 500.
+    """
+
+    def __init__(self, schedules=None, users=None):
+        self.schedules = schedules or {}
+        self.users = users or []
+        self.requests = 0
+        self.fail = False
+        self._runner = None
+        self.base_url = None
+
+    @staticmethod
+    def _parse(value):
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+    async def _get_schedule(self, request):
+        self.requests += 1
+        if self.fail:
+            return web.json_response({"error": {"message": "Internal error"}}, status=500)
+        schedule_id = request.match_info["schedule_id"]
+        if schedule_id not in self.schedules:
+            return web.json_response({"error": {"message": "Not Found"}}, status=404)
+        since = self._parse(request.query["since"])
+        until = self._parse(request.query["until"])
+        entries = [entry for entry in self.schedules[schedule_id]
+                   if self._parse(entry["end"]) > since and self._parse(entry["start"]) < until]
+        return web.json_response({"schedule": {
+            "id": schedule_id,
+            "final_schedule": {"name": "Final Schedule", "rendered_schedule_entries": entries},
+        }})
+
+    async def _list_users(self, request):
+        self.requests += 1
+        query = request.query.get("query", "").lower()
+        return web.json_response({"users": [user for user in self.users if query in user["email"].lower()]})
+
+    async def start(self, host="127.0.0.1", port=0):
+        app = web.Application()
+        app.router.add_get("/schedules/{schedule_id}", self._get_schedule)
+        app.router.add_get("/users", self._list_users)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://{host}:{port}"
+        return self.base_url
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+
+class FakeTemporalClient:
+    """Injectable stand-in for temporalio.client.Client behind TemporalClient.
+
+    ``start_workflow`` waits ``start_latency`` (the gRPC round trip), rejects
+    duplicate workflow ids like the real server (or signals the running one for
+    signal-with-start), and, when ``deliver`` is set, posts the acknowledgement
+    RequestStart would send.
+    """
+
+    def __init__(self, start_latency=0.01, deliver=None):
+        self.start_latency = start_latency
+        self.deliver = deliver
+        self.started = set()
+        self.starts = 0
+        self.signals = 0
+
+    async def start_workflow(self, workflow, arg, id, task_queue, **kwargs):
+        self.starts += 1
+        await asyncio.sleep(self.start_latency)
+        if id in self.started:
+            if kwargs.get("start_signal"):
+                self.signals += 1
+                return SimpleNamespace(id=id, result_run_id=None)
+            raise WorkflowAlreadyStartedError(id, "RequestStart")
+        self.started.add(id)
+        if self.deliver is not None:
+            asyncio.get_running_loop().create_task(self.deliver(arg))
+        return SimpleNamespace(id=id, result_run_id=None)
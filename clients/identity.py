@@ -0,0 +1,152 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from slack_sdk.errors import SlackApiError
+
+from models.identity import Identity
+from utils.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class IdentityResolver:
+    """Resolves an email to its Slack, Jira and PagerDuty user ids in one call.
+
+    On a cache miss the three systems are queried concurrently and the joined
+    Identity is cached for ``ttl`` seconds; people found nowhere (or only
+    partially resolved because a system failed) are cached for
+    ``negative_ttl``. Concurrent lookups of the same email share one fan-out.
+    A system whose client is None is skipped.
+    """
+
+    _instance = None
+
+    def __init__(self, slack=None, jira=None, pagerduty=None, ttl=3600.0, negative_ttl=300.0, maxsize=50000):
+        self.slack = slack
+        self.jira = jira
+        self.pagerduty = pagerduty
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.lookups = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._in_flight = {}
+
+    @classmethod
+    def get_resolver(cls, settings=None):
+        """Get the process-wide resolver over whichever systems are configured."""
+        if cls._instance is None:
+            from clients.jira import JIRAClient
+            from clients.pagerduty import PagerdutyClient
+            from clients.slack import AsyncSlackClient
+
+            settings = settings or get_settings()
+            cls._instance = cls(
+                slack=AsyncSlackClient.get_client(),
+                jira=JIRAClient.get_client() if settings.jira_url else None,
+                pagerduty=PagerdutyClient.get_client() if settings.pagerduty_api_token else None,
+                ttl=settings.identity_cache_ttl,
+                negative_ttl=settings.identity_cache_negative_ttl,
+            )
+        return cls._instance
+
+    def get(self, email):
+        """Return the cached Identity, or None on a miss."""
+        key = email.lower()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.time():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, identity, ttl):
+        with self._lock:
+            self._entries[identity.email] = (time.time() + ttl, identity)
+            self._entries.move_to_end(identity.email)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    async def resolve(self, email):
+        """Return the Identity for ``email``, from cache or from all systems at once."""
+        key = email.lower()
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+
+        lookup = self._in_flight.get(key)
+        if lookup is None:
+            lookup = asyncio.ensure_future(self._lookup(key))
+            self._in_flight[key] = lookup
+            lookup.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        # Shielded so one cancelled caller doesn't cancel the lookup for the others
+        return await asyncio.shield(lookup)
+
+    async def _lookup(self, email):
+        self.lookups += 1
+        results = await asyncio.gather(
+            self._slack_user_id(email),
+            self._jira_account_id(email),
+            self._pagerduty_user_id(email),
+            return_exceptions=True,
+        )
+        errors = [result for result in results if isinstance(result, Exception)]
+        identity = Identity(email, *(None if isinstance(result, Exception) else result for result in results))
+
+        if errors:
+            for error in errors:
+                logger.warning("Identity lookup for %s failed in one system: %s", email, error)
+            if not identity.found:
+                # Nothing to go on; let the caller retry rather than caching the failure
+                raise errors[0]
+        self.put(identity, self.ttl if identity.found and not errors else self.negative_ttl)
+        return identity
+
+    async def _slack_user_id(self, email):
+        if self.slack is None:
+            return None
+        try:
+            user = await self.slack.get_user_from_email(email)
+        except SlackApiError as e:
+            if e.response["error"] == "users_not_found":
+                return None
+            raise
+        return user["id"]
+
+    async def _jira_account_id(self, email):
+        if self.jira is None:
+            return None
+        user = await self.jira.get_user_from_email(email)
+        return user.get("accountId") if user else None
+
+    async def _pagerduty_user_id(self, email):
+        if self.pagerduty is None:
+            return None
+        user = await self.pagerduty.get_user_from_email(email)
+        return user.get("id") if user else None
+
+    async def close(self):
+        """Close the Jira and PagerDuty clients (the Slack client is shared and closed by its owner)."""
+        for client in (self.jira, self.pagerduty):
+            if client is not None:
+                await client.close()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "lookups": self.lookups,
+                "in_flight": len(self._in_flight),
+            }
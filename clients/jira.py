@@ -1,21 +1,181 @@
-class JIRAClient:
-    def __init__(self):
-        pass
+import asyncio
+import logging
 
-    def create_issue(self, project_key, summary, description):
-        pass
+from clients.rest import RestClient, RestError
+from utils.settings import get_settings
 
-    def update_issue(self, issue_id, fields):
-        pass
+logger = logging.getLogger(__name__)
 
-    def get_issue(self, issue_id):
-        pass
 
-    def add_comment(self, issue_id, comment):
-        pass
+class JIRAError(RestError):
+    """A Jira REST call failed with ``status``; ``errors`` is the decoded error body."""
 
-    def transition_issue(self, issue_id, transition_id):
-        pass
+    def __init__(self, status, errors=None, service="Jira"):
+        super().__init__(status, errors, service=service)
 
-    def get_user_from_email(self, email):
-        pass
\ No newline at end of file
+
+class JIRAClient(RestClient):
+    """Asyncio Jira REST (v2) client sharing one keep-alive connection pool per process.
+
+    Concurrent ``create_issue`` calls made within ``batch_window`` seconds of
+    each other are coalesced into one ``/rest/api/2/issue/bulk`` request (up
+    to ``max_batch`` issues, Jira's bulk limit being 50). Pooling and 429
+    handling come from RestClient.
+    """
+
+    _instance = None
+    service = "Jira"
+    error_class = JIRAError
+
+    def __init__(self, base_url=None, email=None, api_token=None, max_in_flight=None,
+                 batch_window=None, max_batch=50, max_retries=5, base_backoff=0.5, max_backoff=30.0, settings=None):
+        """Initialize the Jira client from settings or parameters."""
+        settings = settings or get_settings()
+        base_url = base_url or settings.jira_url
+        if not base_url:
+            raise ValueError("Jira URL not found. Set JIRA_URL in environment or .env files.")
+
+        if max_in_flight is None:
+            max_in_flight = settings.jira_max_in_flight
+        if batch_window is None:
+            batch_window = settings.jira_bulk_window_ms / 1000
+
+        super().__init__(base_url, max_in_flight=max_in_flight, max_retries=max_retries,
+                         base_backoff=base_backoff, max_backoff=max_backoff)
+        self.email = email or settings.jira_email
+        self.api_token = api_token or settings.jira_api_token
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.batches = 0
+        self.issues_created = 0
+        self._pending = []
+        self._flush_handle = None
+        self._flushes = set()
+        logger.info("Jira client initialized for %s (max %s in-flight requests)", self.base_url, max_in_flight)
+
+    @classmethod
+    def get_client(cls):
+        """Get a singleton instance of the Jira client."""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def session_options(self):
+        import aiohttp
+
+        auth = aiohttp.BasicAuth(self.email, self.api_token) if self.email and self.api_token else None
+        return {"auth": auth, "headers": {"Accept": "application/json"}}
+
+    async def close(self):
+        if self._flush_handle is not None:
+            self._flush_now()
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+        await super().close()
+
+    async def create_issue(self, project_key, summary, description, issue_type="Task", **fields):
+        """Create an issue; returns ``{"id", "key", "self"}``.
+
+        Calls arriving within the batch window share one bulk request.
+        """
+        issue_fields = {
+            "project": {"key": project_key},
+            "summary": summary,
+            "description": description,
+            "issuetype": {"name": issue_type},
+            **fields,
+        }
+        if not self.batch_window:
+            return await self._create_one(issue_fields)
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((issue_fields, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush_now()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(self.batch_window, self._flush_now)
+        return await future
+
+    def _flush_now(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        # Callers cancelled while waiting for the window don't get an issue
+        batch = [(issue_fields, future) for issue_fields, future in self._pending if not future.done()]
+        self._pending = []
+        if batch:
+            flush = asyncio.get_running_loop().create_task(self._create_batch(batch))
+            self._flushes.add(flush)
+            flush.add_done_callback(self._flushes.discard)
+
+    async def _create_one(self, issue_fields):
+        issue = await self._request("POST", "/rest/api/2/issue", json={"fields": issue_fields})
+        self.issues_created += 1
+        return issue
+
+    async def _create_batch(self, batch):
+        try:
+            if len(batch) == 1:
+                issue_fields, future = batch[0]
+                issue = await self._create_one(issue_fields)
+                if not future.done():
+                    future.set_result(issue)
+                return
+
+            self.batches += 1
+            logger.info("Creating %s Jira issues in one bulk request", len(batch))
+            response = await self._request("POST", "/rest/api/2/issue/bulk", json={
+                "issueUpdates": [{"fields": issue_fields} for issue_fields, _ in batch]
+            })
+            # Created issues are listed in order, skipping the failed elements
+            failed = {error.get("failedElementNumber"): error for error in response.get("errors", [])}
+            issues = iter(response.get("issues", []))
+            for index, (_, future) in enumerate(batch):
+                if index in failed:
+                    error = failed[index]
+                    result = JIRAError(error.get("status", 400), error.get("elementErrors"))
+                else:
+                    result = next(issues, None)
+                    if result is None:
+                        # Bad gateway: a bulk response missing issues it didn't report as failed
+                        result = JIRAError(502, {"errorMessages": [
+                            f"bulk response has no issue for element {index}"]})
+                    else:
+                        self.issues_created += 1
+                if future.done():
+                    continue
+                if isinstance(result, JIRAError):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+
+    async def update_issue(self, issue_id, fields):
+        await self._request("PUT", f"/rest/api/2/issue/{issue_id}", json={"fields": fields})
+
+    async def get_issue(self, issue_id):
+        return await self._request("GET", f"/rest/api/2/issue/{issue_id}")
+
+    async def add_comment(self, issue_id, comment):
+        return await self._request("POST", f"/rest/api/2/issue/{issue_id}/comment", json={"body": comment})
+
+    async def transition_issue(self, issue_id, transition_id):
+        await self._request("POST", f"/rest/api/2/issue/{issue_id}/transitions",
+                            json={"transition": {"id": str(transition_id)}})
+
+    async def get_user_from_email(self, email):
+        """Find the Jira user for an email address, or None."""
+        users = await self._request("GET", "/rest/api/2/user/search", params={"query": email})
+        return users[0] if users else None
+
+    def stats(self):
+        return {
+            "requests": self.requests,
+            "bulk_requests": self.batches,
+            "issues_created": self.issues_created,
+            "rate_limited": self.rate_limited,
+            "pending": len(self._pending),
+        }
@@ -1,9 +1,221 @@
-class PagerdutyClient:
-    def __init__(self):
-        pass
+import asyncio
+import bisect
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timezone
 
-    def get_schedule(self, schedule_id):
-        pass
+from clients.rest import RestClient, RestError
+from utils.settings import get_settings
 
-    def get_user_from_email(self, email):
-        pass
\ No newline at end of file
+logger = logging.getLogger(__name__)
+
+
+class PagerdutyError(RestError):
+    """A PagerDuty REST call failed with ``status``; ``errors`` is the decoded error body."""
+
+    def __init__(self, status, errors=None, service="PagerDuty"):
+        super().__init__(status, errors, service=service)
+
+
+class PagerdutyClient(RestClient):
+    """Asyncio PagerDuty REST (v2) client sharing one keep-alive connection pool per process."""
+
+    _instance = None
+    service = "PagerDuty"
+    error_class = PagerdutyError
+
+    def __init__(self, api_token=None, base_url=None, max_in_flight=None, settings=None, **kwargs):
+        """Initialize the PagerDuty client from settings or parameters."""
+        settings = settings or get_settings()
+        if api_token is None:
+            api_token = settings.pagerduty_api_token
+
+        if not api_token:
+            raise ValueError("PagerDuty API token not found. Set PAGERDUTY_API_TOKEN in environment or .env files.")
+
+        if max_in_flight is None:
+            max_in_flight = settings.pagerduty_max_in_flight
+
+        super().__init__(base_url or settings.pagerduty_api_url,
+                         max_in_flight=max_in_flight, **kwargs)
+        self.api_token = api_token
+        logger.info("PagerDuty client initialized for %s", self.base_url)
+
+    @classmethod
+    def get_client(cls):
+        """Get a singleton instance of the PagerDuty client."""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def session_options(self):
+        return {"headers": {
+            "Accept": "application/vnd.pagerduty+json;version=2",
+            "Authorization": f"Token token={self.api_token}",
+        }}
+
+    async def get_schedule(self, schedule_id, **params):
+        response = await self._request("GET", f"/schedules/{schedule_id}", params=params)
+        return response["schedule"]
+
+    async def get_rendered_entries(self, schedule_id, since, until):
+        """Final (override-applied) schedule entries covering ``since``..``until``."""
+        schedule = await self.get_schedule(schedule_id, since=since, until=until, time_zone="UTC")
+        return schedule.get("final_schedule", {}).get("rendered_schedule_entries", [])
+
+    async def get_user_from_email(self, email):
+        """Find the PagerDuty user for an email address, or None."""
+        response = await self._request("GET", "/users", params={"query": email})
+        for user in response.get("users", []):
+            if user.get("email", "").lower() == email.lower():
+                return user
+        return None
+
+
+def _timestamp(value):
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+
+
+def _isoformat(timestamp):
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat()
+
+
+def parse_schedules(value):
+    """Parse ``component=SCHEDULE_ID,...`` (as in PAGERDUTY_SCHEDULES)."""
+    schedules = {}
+    for entry in (value or "").split(","):
+        component, _, schedule_id = entry.partition("=")
+        if component.strip() and schedule_id.strip():
+            schedules[component.strip()] = schedule_id.strip()
+    return schedules
+
+
+class OnCallIndex:
+    """Who is on call, per component, from periodically rendered PagerDuty schedules.
+
+    ``refresh`` fetches each component's schedule entries for the next
+    ``window`` seconds and stores them as sorted, parallel start/end/user
+    arrays, so ``on_call`` is a bisect rather than an API call. The index is
+    snapshotted to ``path`` so a restarted worker answers before its first
+    refresh. A schedule that fails to refresh keeps its previous entries.
+    """
+
+    _instance = None
+
+    def __init__(self, client, schedules, window=7 * 24 * 3600.0, path=None):
+        self.client = client
+        self.schedules = schedules
+        self.window = window
+        self.path = path
+        self.refreshed_at = 0.0
+        self.failures = 0
+        self._intervals = {}
+        self._lock = threading.Lock()
+        if path:
+            self.load()
+
+    @classmethod
+    def get_index(cls, settings=None):
+        """Get the process-wide on-call index for PAGERDUTY_SCHEDULES."""
+        if cls._instance is None:
+            settings = settings or get_settings()
+            cls._instance = cls(
+                PagerdutyClient.get_client(),
+                parse_schedules(settings.pagerduty_schedules),
+                window=settings.pagerduty_oncall_window_hours * 3600,
+                path=settings.pagerduty_oncall_snapshot_path,
+            )
+        return cls._instance
+
+    @staticmethod
+    def _build(entries):
+        entries = sorted(
+            ((_timestamp(e["start"]), _timestamp(e["end"]), e["user"]) for e in entries),
+            key=lambda entry: entry[0],
+        )
+        return (
+            [start for start, _, _ in entries],
+            [end for _, end, _ in entries],
+            [user for _, _, user in entries],
+        )
+
+    def on_call(self, component, at=None):
+        """The user on call for ``component`` at ``at`` (epoch seconds, default now), or None."""
+        at = time.time() if at is None else at
+        with self._lock:
+            intervals = self._intervals.get(component)
+        if intervals is None:
+            return None
+        starts, ends, users = intervals
+        index = bisect.bisect_right(starts, at) - 1
+        if index < 0 or at >= ends[index]:
+            return None
+        return users[index]
+
+    async def refresh(self):
+        """Re-render every schedule for the window ahead. Returns how many refreshed."""
+        now = time.time()
+        since, until = _isoformat(now), _isoformat(now + self.window)
+        components = list(self.schedules)
+        results = await asyncio.gather(*(
+            self.client.get_rendered_entries(self.schedules[component], since, until) for component in components
+        ), return_exceptions=True)
+
+        refreshed = 0
+        with self._lock:
+            for component, result in zip(components, results):
+                if isinstance(result, Exception):
+                    self.failures += 1
+                    logger.error("Failed to refresh on-call schedule for %s: %s", component, result)
+                    continue
+                self._intervals[component] = self._build(result)
+                refreshed += 1
+            self.refreshed_at = now
+        if refreshed:
+            await asyncio.to_thread(self.save)
+        return refreshed
+
+    def save(self):
+        """Write the index to ``path`` atomically."""
+        if not self.path:
+            return
+        with self._lock:
+            snapshot = {
+                "refreshed_at": self.refreshed_at,
+                "components": {component: list(zip(*intervals)) for component, intervals in self._intervals.items()},
+            }
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(snapshot, f)
+        os.replace(tmp_path, self.path)
+
+    def load(self):
+        try:
+            with open(self.path) as f:
+                snapshot = json.load(f)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.warning("Ignoring unreadable on-call snapshot %s: %s", self.path, e)
+            return
+        with self._lock:
+            for component, entries in snapshot["components"].items():
+                self._intervals[component] = (
+                    [start for start, _, _ in entries],
+                    [end for _, end, _ in entries],
+                    [user for _, _, user in entries],
+                )
+            self.refreshed_at = snapshot["refreshed_at"]
+        logger.info("Loaded on-call index for %s components from %s", len(self._intervals), self.path)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "components": len(self._intervals),
+                "entries": sum(len(starts) for starts, _, _ in self._intervals.values()),
+                "refreshed_at": self.refreshed_at,
+                "failures": self.failures,
+            }
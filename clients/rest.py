@@ -0,0 +1,92 @@
+import asyncio
+import json
+import logging
+import random
+
+logger = logging.getLogger(__name__)
+
+
+class RestError(Exception):
+    """A REST call failed with ``status``; ``errors`` is the decoded error body, or its text if it isn't JSON."""
+
+    def __init__(self, status, errors=None, service="REST"):
+        super().__init__(f"{service} request failed with HTTP {status}: {errors}")
+        self.status = status
+        self.errors = errors
+
+
+class RestClient:
+    """Asyncio JSON REST client sharing one keep-alive connection pool.
+
+    In-flight requests are capped by ``max_in_flight``. 429 responses are
+    retried after ``Retry-After`` (jittered, so callers throttled together
+    don't all retry together), or with jittered exponential backoff.
+    Must be used from a single event loop (the worker's).
+    """
+
+    service = "REST"
+    error_class = RestError
+
+    def __init__(self, base_url, max_in_flight=20, max_retries=5, base_backoff=0.5, max_backoff=30.0):
+        self.base_url = base_url.rstrip("/")
+        self.max_in_flight = max_in_flight
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.requests = 0
+        self.rate_limited = 0
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+        self._session = None
+
+    def session_options(self):
+        """Extra aiohttp.ClientSession arguments, e.g. auth and headers."""
+        return {}
+
+    @property
+    def session(self):
+        # The aiohttp session binds to the running loop, so it is created on first use
+        if self._session is None:
+            import aiohttp
+
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_in_flight, keepalive_timeout=60),
+                **self.session_options(),
+            )
+        return self._session
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+        self._session = None
+
+    def _backoff(self, response, attempt):
+        retry_after = response.headers.get("Retry-After")
+        if retry_after:
+            try:
+                return float(retry_after) + random.uniform(0, self.base_backoff)
+            except ValueError:
+                pass
+        delay = min(self.max_backoff, self.base_backoff * 2 ** attempt)
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    async def _request(self, method, path, **kwargs):
+        """Make a REST call, retrying 429s; returns the decoded JSON body (None if empty)."""
+        for attempt in range(self.max_retries + 1):
+            async with self._semaphore:
+                self.requests += 1
+                async with self.session.request(method, f"{self.base_url}{path}", **kwargs) as response:
+                    text = await response.text()
+                    if response.status == 429 and attempt < self.max_retries:
+                        delay = self._backoff(response, attempt)
+                    else:
+                        try:
+                            body = json.loads(text) if text else None
+                        except ValueError:
+                            # e.g. a proxy's HTML error page; keep the service error and its status
+                            raise self.error_class(response.status, text, service=self.service) from None
+                        if response.status >= 400:
+                            raise self.error_class(response.status, body, service=self.service)
+                        return body
+            self.rate_limited += 1
+            logger.warning("%s rate limited %s %s; retrying in %.2fs", self.service, method, path, delay)
+            await asyncio.sleep(delay)
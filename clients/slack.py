@@ -1,15 +1,159 @@
+import asyncio
+import json
 import os
 import logging
-from dotenv import load_dotenv
-from slack_sdk import WebClient
+import threading
+import time
+from collections import OrderedDict
 from slack_sdk.errors import SlackApiError
 
-# Load environment variables from dotenv files
-load_dotenv(".env.shared")
-load_dotenv(".env.secret", override=True)
+from clients.slack_dispatcher import SlackDispatcher
+from utils import metrics
+from utils.settings import get_settings
 
 logger = logging.getLogger(__name__)
 
+# Cached "no such user" marker, distinct from a cache miss
+_MISSING = object()
+
+
+def _user_not_found(email):
+    return SlackApiError(f"No Slack user for {email} (cached)", {"ok": False, "error": "users_not_found"})
+
+
+class SlackUserDirectory:
+    """In-memory LRU of Slack users keyed by lower-cased email.
+
+    Entries expire after ``ttl`` seconds; unknown emails are remembered for
+    ``negative_ttl`` so repeated misses don't spend rate budget either. The
+    directory can be bulk-loaded from ``users.list`` and persisted to ``path``
+    so a restarted worker starts warm.
+    """
+
+    _instance = None
+
+    def __init__(self, ttl=3600.0, negative_ttl=300.0, maxsize=50000, path=None):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.maxsize = maxsize
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self.negative_hits = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        if path:
+            self.load()
+
+    @classmethod
+    def get_directory(cls, settings=None):
+        """Get the process-wide user directory."""
+        if cls._instance is None:
+            settings = settings or get_settings()
+            cls._instance = cls(
+                ttl=settings.slack_user_cache_ttl,
+                negative_ttl=settings.slack_user_cache_negative_ttl,
+                path=settings.slack_user_cache_path,
+            )
+        return cls._instance
+
+    def get(self, email):
+        """Return the cached user, ``_MISSING`` for a cached unknown email, or None on a miss."""
+        key = email.lower()
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                metrics.SLACK_USER_CACHE_LOOKUPS.labels("miss").inc()
+                return None
+            self._entries.move_to_end(key)
+            if entry[1] is _MISSING:
+                self.negative_hits += 1
+                metrics.SLACK_USER_CACHE_LOOKUPS.labels("negative_hit").inc()
+            else:
+                self.hits += 1
+                metrics.SLACK_USER_CACHE_LOOKUPS.labels("hit").inc()
+            return entry[1]
+
+    def _put(self, key, user, expires_at):
+        self._entries[key] = (expires_at, user)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def put(self, email, user):
+        with self._lock:
+            self._put(email.lower(), user, time.time() + self.ttl)
+
+    def put_missing(self, email):
+        with self._lock:
+            self._put(email.lower(), _MISSING, time.time() + self.negative_ttl)
+
+    def load_members(self, members):
+        """Upsert a page of ``users.list`` members, evicting deactivated ones.
+
+        Returns how many entries changed.
+        """
+        expires_at = time.time() + self.ttl
+        changed = 0
+        with self._lock:
+            for member in members:
+                email = member.get("profile", {}).get("email")
+                if not email:
+                    continue
+                key = email.lower()
+                current = self._entries.get(key)
+                if member.get("deleted"):
+                    # Don't keep routing to someone who has left the workspace
+                    if current is not None and current[1] is not _MISSING:
+                        del self._entries[key]
+                        changed += 1
+                    continue
+                if current is None or current[1] is _MISSING or current[1].get("updated") != member.get("updated"):
+                    changed += 1
+                self._put(key, member, expires_at)
+        return changed
+
+    def save(self):
+        """Write known users to ``path`` atomically."""
+        if not self.path:
+            return
+        with self._lock:
+            entries = [(key, expires_at, user) for key, (expires_at, user) in self._entries.items()
+                       if user is not _MISSING]
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(entries, f)
+        os.replace(tmp_path, self.path)
+
+    def load(self):
+        try:
+            with open(self.path) as f:
+                entries = json.load(f)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.warning("Ignoring unreadable Slack user cache %s: %s", self.path, e)
+            return
+        now = time.time()
+        with self._lock:
+            for key, expires_at, user in entries:
+                if expires_at > now:
+                    self._put(key, user, expires_at)
+        logger.info("Loaded %s Slack users from %s", len(self._entries), self.path)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "negative_hits": self.negative_hits,
+            }
+
 
 class SlackClient:
     """Slack API client that uses token from environment variables."""
@@ -17,15 +161,20 @@ class SlackClient:
     _client = None
     _instance = None
     
-    def __init__(self, token=None):
-        """Initialize Slack client with token from environment or parameter."""
+    def __init__(self, token=None, dispatcher=None, users=None, settings=None):
+        """Initialize Slack client with token from settings or parameter."""
+        settings = settings or get_settings()
         if token is None:
-            token = os.getenv("SLACK_BOT_TOKEN")
+            token = settings.slack_bot_token
             
         if not token:
             raise ValueError("Slack bot token not found. Set SLACK_BOT_TOKEN in environment or .env files.")
             
+        from slack_sdk import WebClient
+
         self.client = WebClient(token=token)
+        self.dispatcher = dispatcher or SlackDispatcher.get_dispatcher()
+        self.users = users or SlackUserDirectory.get_directory(settings)
         logger.info("Slack client initialized successfully")
     
     @classmethod
@@ -38,54 +187,368 @@ class SlackClient:
     def send_message(self, channel, text, **kwargs):
         """Send a message to a Slack channel."""
         try:
-            logger.info(f"Sending message to channel {channel}")
-            response = self.client.chat_postMessage(
+            logger.info("Sending message to channel %s", channel)
+            response = self.dispatcher.call(
+                "chat.postMessage",
+                self.client.chat_postMessage,
                 channel=channel,
                 text=text,
                 **kwargs
             )
-            logger.info(f"Message sent successfully. Timestamp: {response['ts']}")
+            logger.info("Message sent successfully. Timestamp: %s", response['ts'])
             return response
         except SlackApiError as e:
-            logger.error(f"Error sending message to {channel}: {e.response['error']}")
+            logger.error("Error sending message to %s: %s", channel, e.response['error'])
             raise
         except Exception as e:
-            logger.error(f"Unexpected error sending message: {str(e)}")
+            logger.error("Unexpected error sending message: %s", e)
             raise
 
     def add_reaction(self, channel, message_ts, emoji):
         """Add an emoji reaction to a message."""
         try:
-            logger.info(f"Adding reaction {emoji} to message {message_ts} in {channel}")
-            response = self.client.reactions_add(
+            logger.info("Adding reaction %s to message %s in %s", emoji, message_ts, channel)
+            response = self.dispatcher.call(
+                "reactions.add",
+                self.client.reactions_add,
                 channel=channel,
                 timestamp=message_ts,
                 name=emoji
             )
-            logger.info(f"Reaction added successfully")
+            logger.info("Reaction added successfully")
             return response
         except SlackApiError as e:
-            logger.error(f"Error adding reaction: {e.response['error']}")
+            logger.error("Error adding reaction: %s", e.response['error'])
             raise
         except Exception as e:
-            logger.error(f"Unexpected error adding reaction: {str(e)}")
+            logger.error("Unexpected error adding reaction: %s", e)
+            raise
+
+    def update_message(self, channel, message_ts, text, **kwargs):
+        """Replace the text of an existing message."""
+        try:
+            logger.info("Updating message %s in %s", message_ts, channel)
+            return self.dispatcher.call(
+                "chat.update",
+                self.client.chat_update,
+                channel=channel,
+                ts=message_ts,
+                text=text,
+                **kwargs
+            )
+        except SlackApiError as e:
+            logger.error("Error updating message %s: %s", message_ts, e.response['error'])
             raise
 
     def get_user_from_email(self, email):
         """Get user information by email address."""
+        cached = self.users.get(email)
+        if cached is _MISSING:
+            raise _user_not_found(email)
+        if cached is not None:
+            return cached
+
         try:
-            logger.info(f"Looking up user by email: {email}")
-            response = self.client.users_lookupByEmail(email=email)
+            logger.info("Looking up user by email: %s", email)
+            response = self.dispatcher.call("users.lookupByEmail", self.client.users_lookupByEmail, email=email)
             user = response['user']
-            logger.info(f"Found user: {user.get('name', 'Unknown')} ({user['id']})")
+            logger.info("Found user: %s (%s)", user.get('name', 'Unknown'), user['id'])
+            self.users.put(email, user)
             return user
         except SlackApiError as e:
-            logger.error(f"Error looking up user by email {email}: {e.response['error']}")
+            logger.error("Error looking up user by email %s: %s", email, e.response['error'])
+            if e.response['error'] == 'users_not_found':
+                self.users.put_missing(email)
             raise
         except Exception as e:
-            logger.error(f"Unexpected error looking up user: {str(e)}")
+            logger.error("Unexpected error looking up user: %s", e)
             raise
             
+    def warm_user_directory(self, page_size=200):
+        """Page through users.list into the user directory and persist it.
+
+        Always a full pass over every workspace member (users.list has no
+        "changed since" filter); about one tier 2 call per ``page_size`` users.
+        """
+        changed = 0
+        cursor = None
+        while True:
+            response = self.dispatcher.call("users.list", self.client.users_list, limit=page_size, cursor=cursor)
+            changed += self.users.load_members(response["members"])
+            cursor = response.get("response_metadata", {}).get("next_cursor")
+            if not cursor:
+                break
+        self.users.save()
+        logger.info("Slack user directory refreshed: %s users changed", changed)
+        return changed
+
     def chat_postMessage(self, **kwargs):
         """Direct access to chat.postMessage API (for backwards compatibility)."""
-        return self.send_message(**kwargs)
\ No newline at end of file
+        return self.send_message(**kwargs)
+
+
+class _Status:
+    __slots__ = ("channel", "ts", "sent_version", "last_sent", "pending", "waiters", "task")
+
+    def __init__(self, channel, ts):
+        self.channel = channel
+        self.ts = ts
+        self.sent_version = 0
+        self.last_sent = float("-inf")
+        # (version, text) of the newest state not yet sent
+        self.pending = None
+        self.waiters = []
+        self.task = None
+
+
+class StatusCoalescer:
+    """Keeps one status message per key (a request thread), edited in place.
+
+    Slack is called at most once per ``window`` seconds per key: the first
+    status is posted straight away, and anything arriving within the window
+    waits for it to close and goes out as a single ``chat.update`` carrying
+    only the newest text. Every call names the ``version`` of the state it
+    describes. A version no newer than one already sent (a retried activity,
+    a late attempt) is answered from memory without calling Slack, and an
+    older version than the one waiting is folded into it. Callers pass back
+    the message ``ts`` they were given, so a restarted worker edits the same
+    message rather than posting a new one. Must be used from a single event
+    loop.
+    """
+
+    def __init__(self, slack_client, window=1.0, maxsize=10000):
+        self.slack_client = slack_client
+        self.window = window
+        self.maxsize = maxsize
+        self.counts = {"posted": 0, "edited": 0, "coalesced": 0, "superseded": 0, "failed": 0}
+        self._statuses = OrderedDict()
+
+    def _count(self, outcome):
+        self.counts[outcome] += 1
+        metrics.SLACK_STATUS_UPDATES.labels(outcome).inc()
+
+    async def set_status(self, key, channel, text, version, message_ts=""):
+        """Bring ``key``'s status message up to ``version``.
+
+        Returns ``{"ts", "version", "sent"}`` once a Slack call covering this
+        version (or a newer one) has completed; ``sent`` is False when no call
+        was needed. Raises the SlackApiError if that call failed.
+        """
+        status = self._statuses.get(key)
+        if status is None:
+            status = self._statuses[key] = _Status(channel, message_ts)
+            self._evict()
+        else:
+            self._statuses.move_to_end(key)
+            status.ts = status.ts or message_ts
+
+        if version <= status.sent_version:
+            self._count("superseded")
+            return {"ts": status.ts, "version": status.sent_version, "sent": False}
+
+        if status.pending is None:
+            status.pending = (version, text)
+        elif version > status.pending[0]:
+            status.pending = (version, text)
+            self._count("coalesced")
+        else:
+            self._count("superseded")
+
+        waiter = asyncio.get_running_loop().create_future()
+        status.waiters.append(waiter)
+        if status.task is None:
+            status.task = asyncio.create_task(self._flush(status))
+        return await waiter
+
+    async def _flush(self, status):
+        try:
+            while status.pending is not None:
+                delay = status.last_sent + self.window - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+                (version, text), status.pending = status.pending, None
+                waiters, status.waiters = status.waiters, []
+                try:
+                    if status.ts:
+                        await self.slack_client.update_message(channel=status.channel, message_ts=status.ts,
+                                                               text=text)
+                        self._count("edited")
+                    else:
+                        response = await self.slack_client.send_message(channel=status.channel, text=text)
+                        status.ts = response["ts"]
+                        self._count("posted")
+                except Exception as e:
+                    self._count("failed")
+                    for waiter in waiters:
+                        if not waiter.done():
+                            waiter.set_exception(e)
+                    continue
+                finally:
+                    status.last_sent = time.monotonic()
+
+                status.sent_version = version
+                result = {"ts": status.ts, "version": version, "sent": True}
+                for waiter in waiters:
+                    if not waiter.done():
+                        waiter.set_result(result)
+        finally:
+            status.task = None
+
+    def _evict(self):
+        # Oldest idle keys first; a key with a flush in progress is kept
+        for key in list(self._statuses):
+            if len(self._statuses) <= self.maxsize:
+                break
+            if self._statuses[key].task is None:
+                del self._statuses[key]
+
+    def stats(self):
+        return {"keys": len(self._statuses), **self.counts}
+
+
+class AsyncSlackClient:
+    """Asyncio Slack API client sharing one keep-alive connection pool per process.
+
+    In-flight requests are capped by ``max_in_flight`` (``SLACK_MAX_IN_FLIGHT``)
+    so a burst of activities queues here instead of opening unbounded sockets.
+    Must be used from a single event loop (the worker's).
+    """
+
+    _instance = None
+
+    def __init__(self, token=None, max_in_flight=None, base_url=None, dispatcher=None, users=None,
+                 settings=None):
+        """Initialize async Slack client with token from settings or parameter."""
+        settings = settings or get_settings()
+        if token is None:
+            token = settings.slack_bot_token
+
+        if not token:
+            raise ValueError("Slack bot token not found. Set SLACK_BOT_TOKEN in environment or .env files.")
+
+        if max_in_flight is None:
+            max_in_flight = settings.slack_max_in_flight
+
+        self.token = token
+        self.base_url = base_url or settings.slack_api_url
+        self.max_in_flight = max_in_flight
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+        self.dispatcher = dispatcher or SlackDispatcher.get_dispatcher()
+        self.users = users or SlackUserDirectory.get_directory(settings)
+        self.statuses = StatusCoalescer(self, window=settings.slack_status_window)
+        self._session = None
+        self._client = None
+        logger.info("Async Slack client initialized (max %s in-flight requests)", max_in_flight)
+
+    @classmethod
+    def get_client(cls):
+        """Get a singleton instance of the async Slack client."""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    @property
+    def client(self):
+        # The aiohttp session binds to the running loop, so it is created on first use
+        if self._client is None:
+            import aiohttp
+            from slack_sdk.web.async_client import AsyncWebClient
+
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_in_flight, keepalive_timeout=60),
+            )
+            self._client = AsyncWebClient(token=self.token, base_url=self.base_url, session=self._session)
+        return self._client
+
+    @property
+    def in_flight(self):
+        return self.max_in_flight - self._semaphore._value
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+        self._session = None
+        self._client = None
+
+    async def _api_call(self, method, func, **kwargs):
+        # Wait for rate-limit tokens before taking an in-flight slot
+        async def limited(**call_kwargs):
+            async with self._semaphore:
+                return await func(**call_kwargs)
+
+        return await self.dispatcher.call_async(method, limited, **kwargs)
+
+    async def send_message(self, channel, text, **kwargs):
+        """Send a message to a Slack channel."""
+        try:
+            logger.info("Sending message to channel %s", channel)
+            response = await self._api_call("chat.postMessage", self.client.chat_postMessage, channel=channel, text=text, **kwargs)
+            logger.info("Message sent successfully. Timestamp: %s", response['ts'])
+            return response
+        except SlackApiError as e:
+            logger.error("Error sending message to %s: %s", channel, e.response['error'])
+            raise
+
+    async def add_reaction(self, channel, message_ts, emoji):
+        """Add an emoji reaction to a message."""
+        try:
+            logger.info("Adding reaction %s to message %s in %s", emoji, message_ts, channel)
+            response = await self._api_call("reactions.add", self.client.reactions_add, channel=channel, timestamp=message_ts, name=emoji)
+            logger.info("Reaction added successfully")
+            return response
+        except SlackApiError as e:
+            logger.error("Error adding reaction: %s", e.response['error'])
+            raise
+
+    async def update_message(self, channel, message_ts, text, **kwargs):
+        """Replace the text of an existing message."""
+        try:
+            logger.info("Updating message %s in %s", message_ts, channel)
+            return await self._api_call("chat.update", self.client.chat_update, channel=channel, ts=message_ts, text=text, **kwargs)
+        except SlackApiError as e:
+            logger.error("Error updating message %s: %s", message_ts, e.response['error'])
+            raise
+
+    async def set_status(self, key, channel, text, version, message_ts=""):
+        """Post or edit ``key``'s status message, coalesced (see StatusCoalescer)."""
+        return await self.statuses.set_status(key, channel, text, version, message_ts=message_ts)
+
+    async def get_user_from_email(self, email):
+        """Get user information by email address."""
+        cached = self.users.get(email)
+        if cached is _MISSING:
+            raise _user_not_found(email)
+        if cached is not None:
+            return cached
+
+        try:
+            logger.info("Looking up user by email: %s", email)
+            response = await self._api_call("users.lookupByEmail", self.client.users_lookupByEmail, email=email)
+            user = response['user']
+            logger.info("Found user: %s (%s)", user.get('name', 'Unknown'), user['id'])
+            self.users.put(email, user)
+            return user
+        except SlackApiError as e:
+            logger.error("Error looking up user by email %s: %s", email, e.response['error'])
+            if e.response['error'] == 'users_not_found':
+                self.users.put_missing(email)
+            raise
+
+    async def warm_user_directory(self, page_size=200):
+        """Page through users.list into the user directory and persist it.
+
+        Always a full pass over every workspace member (users.list has no
+        "changed since" filter); about one tier 2 call per ``page_size`` users.
+        """
+        changed = 0
+        cursor = None
+        while True:
+            response = await self._api_call("users.list", self.client.users_list, limit=page_size, cursor=cursor)
+            changed += self.users.load_members(response["members"])
+            cursor = response.get("response_metadata", {}).get("next_cursor")
+            if not cursor:
+                break
+        await asyncio.to_thread(self.users.save)
+        logger.info("Slack user directory refreshed: %s users changed", changed)
+        return changed
@@ -0,0 +1,248 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from slack_sdk.errors import SlackApiError
+
+from utils import metrics
+
+logger = logging.getLogger(__name__)
+
+# Requests per minute for Slack's Web API rate tiers
+TIER_RATES = {
+    1: 1,
+    2: 20,
+    3: 50,
+    4: 100,
+}
+
+# https://api.slack.com/methods - tier per method we call
+METHOD_TIERS = {
+    "chat.update": 3,
+    "reactions.add": 3,
+    "users.lookupByEmail": 3,
+    "users.list": 2,
+}
+
+# Methods that are additionally limited per channel
+CHANNEL_LIMITED_METHODS = {"chat.postMessage", "chat.update"}
+
+# chat.postMessage is "special": roughly one message per second per channel and
+# no per-method tier, so a workspace-wide bucket would only cap the sum of channels
+CHANNEL_ONLY_METHODS = {"chat.postMessage"}
+
+# Longest stretch a rate-limit wait goes without heartbeating its activity
+HEARTBEAT_INTERVAL = 5.0
+
+
+def _heartbeat():
+    # Keeps a long wait visible to Temporal and lets cancellation reach the activity
+    from temporalio import activity
+
+    if activity.in_activity() and not activity.info().is_local:
+        activity.heartbeat()
+
+
+class TokenBucket:
+    """Thread-safe token bucket handing out reservations instead of blocking.
+
+    ``reserve`` returns how long the caller must wait before its call, so the
+    same bucket can shape both threads (time.sleep) and tasks (asyncio.sleep).
+    """
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        with self._lock:
+            now = time.monotonic()
+            if now > self.updated:
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+            self.tokens -= 1
+            # `updated` lies in the future while paused by a Retry-After
+            return max(0.0, self.updated - now) + max(0.0, -self.tokens / self.rate)
+
+    def idle(self):
+        """True once the bucket has refilled, so dropping it loses no state."""
+        with self._lock:
+            now = time.monotonic()
+            return now >= self.updated and self.tokens + (now - self.updated) * self.rate >= self.capacity
+
+    def pause(self, seconds):
+        """Stop handing out tokens for ``seconds`` (Slack's Retry-After)."""
+        with self._lock:
+            resume_at = time.monotonic() + seconds
+            if resume_at > self.updated:
+                self.updated = resume_at
+                self.tokens = min(self.tokens, 0.0)
+
+
+class SlackDispatcher:
+    """Shapes outgoing Slack API calls to Slack's published rate limits.
+
+    One instance is shared by every activity thread and task in a worker so the
+    buckets see the process's whole call volume. Calls answered with
+    ``ratelimited`` are delayed by ``Retry-After`` and retried instead of failing.
+    Per-channel buckets are kept for the ``max_channels`` most recently used
+    channels; older ones are dropped once they have refilled.
+    """
+
+    _instance = None
+
+    def __init__(self, method_tiers=None, tier_rates=None, channel_rate=1.0, channel_burst=3, max_retries=5,
+                 max_channels=10000):
+        self.method_tiers = {**METHOD_TIERS, **(method_tiers or {})}
+        self.tier_rates = {**TIER_RATES, **(tier_rates or {})}
+        self.channel_rate = channel_rate
+        self.channel_burst = channel_burst
+        self.max_retries = max_retries
+        self.max_channels = max_channels
+        self._method_buckets = {}
+        self._channel_buckets = OrderedDict()
+        self._lock = threading.Lock()
+        self.waiting = 0
+        self.calls = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.rate_limited = 0
+
+    @classmethod
+    def get_dispatcher(cls):
+        """Get the process-wide dispatcher."""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def _method_bucket(self, method):
+        with self._lock:
+            bucket = self._method_buckets.get(method)
+            if bucket is None:
+                per_minute = self.tier_rates[self.method_tiers.get(method, 3)]
+                # Slack tolerates short bursts; allow about a tenth of a minute's budget
+                bucket = TokenBucket(per_minute / 60.0, max(1, per_minute // 10))
+                self._method_buckets[method] = bucket
+            return bucket
+
+    def _channel_bucket(self, channel):
+        with self._lock:
+            bucket = self._channel_buckets.get(channel)
+            if bucket is None:
+                bucket = TokenBucket(self.channel_rate, self.channel_burst)
+                self._channel_buckets[channel] = bucket
+                self._evict_channels()
+            else:
+                self._channel_buckets.move_to_end(channel)
+            return bucket
+
+    def _evict_channels(self):
+        # Least recently used first, never the one just added; a bucket still
+        # paying off a burst is kept
+        for channel in list(self._channel_buckets)[:-1]:
+            if len(self._channel_buckets) <= self.max_channels:
+                break
+            if self._channel_buckets[channel].idle():
+                del self._channel_buckets[channel]
+
+    def _buckets(self, method, kwargs):
+        channel = kwargs.get("channel")
+        if channel and method in CHANNEL_ONLY_METHODS:
+            return [self._channel_bucket(channel)]
+        buckets = [self._method_bucket(method)]
+        if channel and method in CHANNEL_LIMITED_METHODS:
+            buckets.append(self._channel_bucket(channel))
+        return buckets
+
+    def reserve(self, method, **kwargs):
+        """Reserve a slot for a call and return the delay before it may be sent."""
+        delay = max(bucket.reserve() for bucket in self._buckets(method, kwargs))
+        with self._lock:
+            self.calls += 1
+            self.total_wait += delay
+            self.max_wait = max(self.max_wait, delay)
+        metrics.SLACK_DISPATCH_WAIT.labels(method).observe(delay)
+        return delay
+
+    def _retry_after(self, method, error):
+        response = error.response
+        if getattr(response, "status_code", None) != 429 and response.get("error") != "ratelimited":
+            return None
+        with self._lock:
+            self.rate_limited += 1
+        metrics.SLACK_RATE_LIMITED.labels(method).inc()
+        headers = getattr(response, "headers", None) or {}
+        return float(headers.get("Retry-After", 1))
+
+    def _on_rate_limited(self, method, kwargs, retry_after, attempt):
+        logger.warning("Slack rate limited %s, retrying in %ss (attempt %s)", method, retry_after, attempt + 1)
+        for bucket in self._buckets(method, kwargs):
+            bucket.pause(retry_after)
+
+    def _track_waiting(self, delta):
+        with self._lock:
+            self.waiting += delta
+        metrics.SLACK_DISPATCH_WAITING.inc(delta)
+
+    def _wait(self, delay):
+        deadline = time.monotonic() + delay
+        self._track_waiting(1)
+        try:
+            while (remaining := deadline - time.monotonic()) > 0:
+                _heartbeat()
+                time.sleep(min(remaining, HEARTBEAT_INTERVAL))
+        finally:
+            self._track_waiting(-1)
+
+    async def _wait_async(self, delay):
+        deadline = time.monotonic() + delay
+        self._track_waiting(1)
+        try:
+            while (remaining := deadline - time.monotonic()) > 0:
+                _heartbeat()
+                await asyncio.sleep(min(remaining, HEARTBEAT_INTERVAL))
+        finally:
+            self._track_waiting(-1)
+
+    def call(self, method, func, **kwargs):
+        """Call a blocking Slack SDK method under the rate limits."""
+        for attempt in range(self.max_retries + 1):
+            delay = self.reserve(method, **kwargs)
+            if delay > 0:
+                self._wait(delay)
+            try:
+                return func(**kwargs)
+            except SlackApiError as e:
+                retry_after = self._retry_after(method, e)
+                if retry_after is None or attempt == self.max_retries:
+                    raise
+                self._on_rate_limited(method, kwargs, retry_after, attempt)
+
+    async def call_async(self, method, func, **kwargs):
+        """Await an async Slack SDK method under the rate limits."""
+        for attempt in range(self.max_retries + 1):
+            delay = self.reserve(method, **kwargs)
+            if delay > 0:
+                await self._wait_async(delay)
+            try:
+                return await func(**kwargs)
+            except SlackApiError as e:
+                retry_after = self._retry_after(method, e)
+                if retry_after is None or attempt == self.max_retries:
+                    raise
+                self._on_rate_limited(method, kwargs, retry_after, attempt)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "queue_depth": self.waiting,
+                "calls": self.calls,
+                "avg_wait_seconds": self.total_wait / self.calls if self.calls else 0.0,
+                "max_wait_seconds": self.max_wait,
+                "rate_limited": self.rate_limited,
+            }
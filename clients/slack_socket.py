@@ -0,0 +1,106 @@
+import asyncio
+import json
+import logging
+import random
+
+import aiohttp
+from slack_sdk.errors import SlackApiError
+
+from utils.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class SlackSocketClient:
+    """Slack Socket Mode connection over aiohttp.
+
+    ``envelopes()`` yields each envelope Slack pushes (events, slash commands,
+    interactivity), reconnecting with jittered backoff when the socket drops
+    and straight away when Slack asks for a refresh. aiohttp's heartbeat
+    answers and sends the pings. Must be used from a single event loop.
+    """
+
+    def __init__(self, app_token=None, base_url=None, heartbeat=10.0, max_reconnect_delay=30.0, settings=None):
+        settings = settings or get_settings()
+        if app_token is None:
+            app_token = settings.slack_app_token
+
+        if not app_token:
+            raise ValueError("Slack app token not found. Set SLACK_APP_TOKEN in environment or .env files.")
+
+        self.app_token = app_token
+        self.base_url = base_url or settings.slack_api_url
+        self.heartbeat = heartbeat
+        self.max_reconnect_delay = max_reconnect_delay
+        self.connections = 0
+        self.closed = False
+        self._session = None
+        self._socket = None
+
+    async def open_url(self):
+        """Ask Slack for a websocket URL (apps.connections.open)."""
+        if self._session is None:
+            self._session = aiohttp.ClientSession()
+        async with self._session.post(
+            f"{self.base_url}apps.connections.open",
+            headers={"Authorization": f"Bearer {self.app_token}"},
+        ) as response:
+            body = await response.json(content_type=None)
+        if not body.get("ok"):
+            raise SlackApiError("apps.connections.open failed", body)
+        return body["url"]
+
+    async def connect(self):
+        """Open a new socket, replacing the current one."""
+        url = await self.open_url()
+        socket = await self._session.ws_connect(url, heartbeat=self.heartbeat)
+        previous, self._socket = self._socket, socket
+        if previous is not None:
+            await previous.close()
+        self.connections += 1
+        logger.info("Socket Mode connection %s established", self.connections)
+
+    async def envelopes(self):
+        attempt = 0
+        while not self.closed:
+            try:
+                if self._socket is None or self._socket.closed:
+                    await self.connect()
+                async for message in self._socket:
+                    if message.type != aiohttp.WSMsgType.TEXT:
+                        continue
+                    envelope = json.loads(message.data)
+                    if envelope.get("type") == "hello":
+                        attempt = 0
+                    elif envelope.get("type") == "disconnect":
+                        # Slack refreshes connections every few hours and warns first
+                        logger.info("Slack asked to reconnect (%s)", envelope.get("reason"))
+                        await self.connect()
+                        break
+                    else:
+                        yield envelope
+                else:
+                    if not self.closed:
+                        raise aiohttp.ClientConnectionError("Socket Mode connection closed")
+            except (aiohttp.ClientError, SlackApiError, asyncio.TimeoutError) as e:
+                if self.closed:
+                    return
+                delay = min(self.max_reconnect_delay, 2 ** attempt)
+                attempt += 1
+                logger.warning("Socket Mode connection failed, reconnecting in %.1fs: %s", delay, e)
+                await asyncio.sleep(delay / 2 + random.uniform(0, delay / 2))
+
+    async def ack(self, envelope_id, payload=None):
+        message = {"envelope_id": envelope_id}
+        if payload is not None:
+            message["payload"] = payload
+        await self._socket.send_str(json.dumps(message))
+
+    async def close(self):
+        self.closed = True
+        if self._socket is not None:
+            await self._socket.close()
+        if self._session is not None:
+            await self._session.close()
+        self._socket = None
+        self._session = None
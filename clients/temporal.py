@@ -1,24 +1,26 @@
+import asyncio
 import logging
-import os
-from dotenv import load_dotenv
+import threading
+import weakref
 
-from temporalio.client import Client
-from temporalio.worker import Worker
-
-# Load environment variables from dotenv files
-load_dotenv(".env.shared")
-load_dotenv(".env.secret", override=True)
+from utils.settings import get_settings
 
 logger = logging.getLogger(__name__)
 
 # Temporal client connection
-async def start_temporal_client():
+async def start_temporal_client(settings=None):
     """Connect to the Temporal server."""
-    temporal_address = os.getenv("TEMPORAL_ADDRESS", "localhost:7233")
-    temporal_namespace = os.getenv("TEMPORAL_NAMESPACE", "default")
-    api_key = os.getenv("TEMPORAL_API_KEY")
+    # temporalio is imported on first connect, not when the web tier starts
+    from temporalio.client import Client
+
+    from clients.temporal_converter import compact_data_converter
+
+    settings = settings or TemporalClient.settings or get_settings()
+    temporal_address = settings.temporal_address
+    temporal_namespace = settings.temporal_namespace
+    api_key = settings.temporal_api_key
     
-    logger.info(f"Connecting to Temporal at {temporal_address}, namespace {temporal_namespace}")
+    logger.info("Connecting to Temporal at %s, namespace %s", temporal_address, temporal_namespace)
     
     # Configure TLS for Temporal Cloud
     tls_config = None
@@ -26,25 +28,66 @@ async def start_temporal_client():
         from temporalio.client import TLSConfig
         tls_config = TLSConfig()  # Use default TLS for Temporal Cloud
     
+    # Workers inherit the client's converter, so web and worker always agree.
+    # Payloads above the threshold are zlib-compressed.
+    data_converter = compact_data_converter(
+        compression_threshold=settings.temporal_compression_threshold
+    )
+
     return await Client.connect(
         temporal_address, 
         namespace=temporal_namespace,
         api_key=api_key if api_key else None,
-        tls=tls_config
+        tls=tls_config,
+        data_converter=data_converter
     )
 
 
 class TemporalClient:
-    _client = None
+    """Per-event-loop Temporal client cache.
+
+    A client is bound to the event loop it was connected on. Under the ASGI
+    entry point (``asgi.py``) every request shares one long-lived loop, so a
+    worker process connects exactly once. Under plain WSGI each async view
+    gets a fresh loop and therefore a fresh connection.
+    """
+
+    _clients = weakref.WeakKeyDictionary()
+    _locks = weakref.WeakKeyDictionary()
+    _guard = threading.Lock()
+    # Connection settings; the process-wide ones unless configure() injected others
+    settings = None
 
     def __init__(self):
-        if not self._client:
-            raise RuntimeError("Temporal client not initialized. Call get_client() first.")
-        
-        return self._client
+        raise RuntimeError("TemporalClient is not instantiable. Call get_client() instead.")
+
+    @classmethod
+    def configure(cls, settings):
+        """Use ``settings`` for connections made from now on."""
+        cls.settings = settings
 
     @classmethod
     async def get_client(cls):
-        if cls._client is None:
-            cls._client = await start_temporal_client()
-        return cls._client
\ No newline at end of file
+        loop = asyncio.get_running_loop()
+        client = cls._clients.get(loop)
+        if client is not None:
+            return client
+
+        with cls._guard:
+            lock = cls._locks.setdefault(loop, asyncio.Lock())
+
+        # Concurrent requests racing on a cold loop share a single connect
+        async with lock:
+            client = cls._clients.get(loop)
+            if client is None:
+                client = await start_temporal_client()
+                cls._clients[loop] = client
+        return client
+
+    @classmethod
+    async def close(cls):
+        """Drop the client bound to the running event loop."""
+        loop = asyncio.get_running_loop()
+        with cls._guard:
+            cls._clients.pop(loop, None)
+            cls._locks.pop(loop, None)
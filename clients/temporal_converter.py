@@ -0,0 +1,96 @@
+import dataclasses
+import zlib
+from typing import Any, List, Optional, Sequence, Type
+
+import orjson
+from temporalio.api.common.v1 import Payload
+from temporalio.converter import (
+    AdvancedJSONEncoder,
+    CompositePayloadConverter,
+    DataConverter,
+    DefaultPayloadConverter,
+    JSONPlainPayloadConverter,
+    PayloadCodec,
+    value_to_type,
+)
+
+ZLIB_ENCODING = b"binary/zlib"
+
+
+class OrjsonPlainPayloadConverter(JSONPlainPayloadConverter):
+    """``json/plain`` converter backed by orjson.
+
+    Emits the same encoding as the SDK default, so payloads stay readable in
+    the Temporal UI and by workers that still use the default converter.
+    """
+
+    _fallback = AdvancedJSONEncoder()
+
+    def to_payload(self, value: Any) -> Optional[Payload]:
+        return Payload(
+            metadata={"encoding": self.encoding.encode()},
+            data=orjson.dumps(value, default=self._fallback.default, option=orjson.OPT_NON_STR_KEYS),
+        )
+
+    def from_payload(self, payload: Payload, type_hint: Optional[Type] = None) -> Any:
+        try:
+            obj = orjson.loads(payload.data)
+        except orjson.JSONDecodeError as err:
+            raise RuntimeError("Failed parsing") from err
+        if type_hint:
+            obj = value_to_type(type_hint, obj, self._custom_type_converters)
+        return obj
+
+
+class CompactPayloadConverter(CompositePayloadConverter):
+    """The SDK's default converter chain with JSON handled by orjson."""
+
+    def __init__(self) -> None:
+        super().__init__(*[
+            OrjsonPlainPayloadConverter() if isinstance(converter, JSONPlainPayloadConverter) else converter
+            for converter in DefaultPayloadConverter.default_encoding_payload_converters
+        ])
+
+
+class ZlibPayloadCodec(PayloadCodec):
+    """Compresses payloads larger than ``threshold`` bytes.
+
+    Small payloads pass through untouched, and payloads that were never
+    compressed decode as-is, so existing histories keep replaying.
+    """
+
+    def __init__(self, threshold: int = 1024, level: int = 6) -> None:
+        self.threshold = threshold
+        self.level = level
+
+    async def encode(self, payloads: Sequence[Payload]) -> List[Payload]:
+        encoded = []
+        for payload in payloads:
+            if payload.ByteSize() < self.threshold:
+                encoded.append(payload)
+                continue
+            compressed = Payload(
+                metadata={"encoding": ZLIB_ENCODING},
+                data=zlib.compress(payload.SerializeToString(), self.level),
+            )
+            encoded.append(compressed if compressed.ByteSize() < payload.ByteSize() else payload)
+        return encoded
+
+    async def decode(self, payloads: Sequence[Payload]) -> List[Payload]:
+        decoded = []
+        for payload in payloads:
+            if payload.metadata.get("encoding") != ZLIB_ENCODING:
+                decoded.append(payload)
+                continue
+            original = Payload()
+            original.ParseFromString(zlib.decompress(payload.data))
+            decoded.append(original)
+        return decoded
+
+
+def compact_data_converter(compression_threshold: int = 1024) -> DataConverter:
+    return dataclasses.replace(
+        DataConverter.default,
+        payload_converter_class=CompactPayloadConverter,
+        payload_codec=ZlibPayloadCodec(threshold=compression_threshold),
+    )
@@ -0,0 +1,18 @@
+import os
+
+# Each uvicorn worker runs a single event loop with one Temporal client.
+# Concurrency within a worker comes from ASGI_THREADS (see asgi.py), not gunicorn threads.
+workers = int(os.environ.get('GUNICORN_PROCESSES', '2'))
+worker_class = 'uvicorn_worker.UvicornWorker'
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8888')
+
+forwarded_allow_ips = '*'
+secure_scheme_headers = { 'X-Forwarded-Proto': 'https' }
+
+
+def child_exit(server, worker):
+    # Drop the exited worker's live gauges from the shared Prometheus directory
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
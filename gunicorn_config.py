@@ -6,4 +6,11 @@ threads = int(os.environ.get('GUNICORN_THREADS', '4'))
 bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8888')
 
 forwarded_allow_ips = '*'
-secure_scheme_headers = { 'X-Forwarded-Proto': 'https' }
\ No newline at end of file
+secure_scheme_headers = { 'X-Forwarded-Proto': 'https' }
+
+
+def child_exit(server, worker):
+    # Drop the exited worker's live gauges from the shared Prometheus directory
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
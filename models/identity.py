@@ -0,0 +1,18 @@
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class Identity:
+    """One person's user ids across Slack, Jira and PagerDuty.
+
+    A system's id is None when it has no such user (or isn't configured).
+    """
+    email: str
+    slack_user_id: Optional[str] = None
+    jira_account_id: Optional[str] = None
+    pagerduty_user_id: Optional[str] = None
+
+    @property
+    def found(self) -> bool:
+        return any((self.slack_user_id, self.jira_account_id, self.pagerduty_user_id))
@@ -1,7 +1,64 @@
 from dataclasses import dataclass
 
 @dataclass
+class RequestEvent:
+    """The fields of a Slack Events API envelope that the workflow needs.
+
+    Passed to RequestStart instead of the raw payload so workflow history
+    doesn't record tokens, blocks, attachments and other unused fields.
+    component, request_type and route_channel are filled in by the routing
+    engine before the workflow starts.
+    """
+    event_id: str
+    event_type: str = ""
+    team_id: str = ""
+    channel: str = ""
+    user: str = ""
+    text: str = ""
+    ts: str = ""
+    thread_ts: str = ""
+    reaction: str = ""
+    component: str = ""
+    request_type: str = ""
+    route_channel: str = ""
+
+    @classmethod
+    def from_slack_payload(cls, payload: dict) -> "RequestEvent":
+        event = payload.get("event") or {}
+        # Reactions reference the message they were added to under "item"
+        item = event.get("item") or {}
+        # Edits carry the edited message (with its original ts and thread_ts) under
+        # "message"; the event's own ts is the time of the edit
+        message = event.get("message") if event.get("subtype") == "message_changed" else None
+        message = message or event
+        return cls(
+            event_id=payload.get("event_id", "unknown"),
+            event_type=event.get("type", ""),
+            team_id=payload.get("team_id", ""),
+            channel=event.get("channel") or item.get("channel", ""),
+            user=message.get("user", ""),
+            text=message.get("text", ""),
+            ts=message.get("ts") or event.get("event_ts", ""),
+            thread_ts=message.get("thread_ts") or item.get("ts", ""),
+            reaction=event.get("reaction", ""),
+        )
+
+    @property
+    def thread_key(self) -> str:
+        """Channel + root message ts identifying the request thread, or "" if unknown."""
+        root_ts = self.thread_ts or self.ts
+        if not self.channel or not root_ts:
+            return ""
+        return f"{self.channel}-{root_ts}"
+
+
+@dataclass(slots=True)
 class Request:
+    """A request's current state, held by its RequestStart workflow.
+
+    Copies are kept in the request store for listing; slots keep a page of
+    them (or a large cache) small in memory.
+    """
     id: str
     request_type: str
     status: str
@@ -12,4 +69,18 @@ class Request:
     component:str
     channel: str
     message: str
-    
+
+    @classmethod
+    def from_event(cls, event: RequestEvent) -> "Request":
+        return cls(
+            id=event.event_id,
+            request_type=event.request_type,
+            status="open",
+            created_at=event.ts,
+            updated_at=event.ts,
+            reporter_email="",
+            assignee_email="",
+            component=event.component,
+            channel=event.channel,
+            message=event.text,
+        )
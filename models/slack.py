@@ -0,0 +1,19 @@
+from dataclasses import dataclass
+
+@dataclass
+class SlackUpdate:
+    """One Slack UI change applied by the batch_update activity.
+
+    kind is "reaction" (add ``emoji`` to message ``ts``), "message" (post
+    ``text``, threaded under ``ts`` when set), "edit" (replace the text of
+    message ``ts``) or "status" (bring the status message for ``key`` up to
+    ``version``: posted on first use, edited in place after that, with ``ts``
+    the message to edit once known).
+    """
+    kind: str
+    channel: str
+    ts: str = ""
+    text: str = ""
+    emoji: str = ""
+    key: str = ""
+    version: int = 0
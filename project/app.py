@@ -1,21 +1,93 @@
 # Initialize Flask app
-import os
+import atexit
+import logging
+import time
 
-from flask import Flask
-from dotenv import dotenv_values
+from flask import Flask, g, request
 
+from clients.temporal import TemporalClient
+from project.routes import forward_spooled_event, main_bp, webhooks_bp
+from utils import metrics
+from utils.admission import AdaptiveLimiter
+from utils.dedup import RecentEvents
+from utils.settings import get_settings
+from utils.slack_signature import SignatureVerifier
+from utils.spool import SpoolForwarder, WebhookSpool
+from utils.threads import ThreadRoots
 
-from project.routes import main_bp, webhooks_bp
+logger = logging.getLogger(__name__)
 
-config = {
-    **dotenv_values(".env.shared"),  # load shared development variables
-    **dotenv_values(".env.secret"),  # load sensitive variables
-    **os.environ,  # override loaded values with environment variables
-}
+def create_app(intake_mode=None, settings=None):
+    settings = settings or get_settings()
+    TemporalClient.configure(settings)
 
-def create_app():
     app = Flask(__name__)
+    app.extensions["settings"] = settings
     app.register_blueprint(main_bp, url_prefix='')
     app.register_blueprint(webhooks_bp, url_prefix='/webhooks')
+    init_request_metrics(app)
 
-    return app
\ No newline at end of file
+    # Verify X-Slack-Signature when a signing secret is configured. The previous
+    # secret stays valid while a rotation rolls out.
+    if settings.slack_signing_secrets:
+        app.extensions["slack_verifier"] = SignatureVerifier(
+            settings.slack_signing_secrets, max_age=settings.slack_signature_max_age
+        )
+    else:
+        logger.warning("SLACK_SIGNING_SECRET is not set; /webhooks/slack accepts unsigned requests")
+
+    # Retry-After sent with every 503 asking Slack to redeliver later
+    app.config["WEBHOOK_RETRY_AFTER"] = settings.webhook_retry_after
+    app.extensions["event_dedup"] = RecentEvents(
+        maxsize=settings.webhook_dedup_size,
+        ttl=settings.webhook_dedup_ttl,
+        # Optional SQLite file shared by all gunicorn workers on the host
+        shared_path=settings.webhook_dedup_path,
+    )
+    # Lets a reaction on a reply find the reply's thread; shares the dedup file
+    app.extensions["thread_roots"] = ThreadRoots(shared_path=settings.webhook_dedup_path)
+
+    # "direct" starts workflows inside the request; "spool" acks after a local
+    # durable write and forwards to Temporal in the background
+    intake_mode = intake_mode or settings.webhook_intake_mode
+    if intake_mode == "spool":
+        init_spool(app, settings.webhook_spool_path, batch_size=settings.webhook_spool_batch_size)
+    else:
+        app.extensions["admission_limiter"] = AdaptiveLimiter(
+            initial_limit=settings.webhook_admission_limit,
+            max_limit=settings.webhook_admission_max_limit,
+            target_latency=settings.webhook_admission_target_latency,
+        )
+        # Optionally divert shed requests to the spool instead of rejecting them
+        if settings.webhook_overflow_spool:
+            init_spool(app, settings.webhook_spool_path, batch_size=settings.webhook_spool_batch_size,
+                       extension="overflow_spool")
+
+    return app
+
+
+def init_request_metrics(app):
+    @app.before_request
+    def start_timer():
+        g.request_started = time.perf_counter()
+
+    @app.after_request
+    def record_latency(response):
+        started = g.pop("request_started", None)
+        if started is not None:
+            # Label by URL rule rather than path to keep cardinality bounded
+            route = request.url_rule.rule if request.url_rule else "unmatched"
+            metrics.HTTP_REQUEST_DURATION.labels(route, request.method, response.status_code).observe(
+                time.perf_counter() - started
+            )
+        return response
+
+
+def init_spool(app, path, batch_size=50, extension="webhook_spool"):
+    spool = WebhookSpool(path)
+    forwarder = SpoolForwarder(spool, forward_spooled_event, batch_size=batch_size)
+    forwarder.start()
+    atexit.register(forwarder.stop)
+
+    app.extensions[extension] = spool
+    app.extensions["spool_forwarder"] = forwarder
@@ -0,0 +1,71 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from asgiref.wsgi import WsgiToAsgiInstance
+
+from clients.temporal import TemporalClient
+
+logger = logging.getLogger(__name__)
+
+
+class FlaskAsgiApp:
+    """Serve a Flask app over ASGI on one long-lived event loop.
+
+    Each HTTP request runs the WSGI app in a worker thread. Flask's async views
+    are dispatched back onto the server's event loop by asgiref, so everything
+    awaited inside a view (most importantly the Temporal client) lives on the
+    same loop for the lifetime of the process.
+    """
+
+    def __init__(self, flask_app, threads=8):
+        self.flask_app = flask_app
+        self.executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="asgi-wsgi")
+
+        executor = self.executor
+
+        class _Instance(WsgiToAsgiInstance):
+            # asgiref runs WSGI apps thread-sensitively (one shared thread), which
+            # would serialise every request in the process. Use our own pool instead.
+            run_wsgi_app = sync_to_async(
+                WsgiToAsgiInstance.__dict__["run_wsgi_app"].func,
+                thread_sensitive=False,
+                executor=executor,
+            )
+
+        self._instance_class = _Instance
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        await self._instance_class(self.flask_app)(scope, receive, send)
+
+    async def startup(self):
+        """Connect to Temporal once, on the loop that will serve every request."""
+        try:
+            await TemporalClient.get_client()
+            logger.info("Temporal client connected for ASGI worker")
+        except Exception as e:
+            # Routes retry the connection lazily and answer 503 until it succeeds
+            logger.error("Failed to connect to Temporal at startup: %s", e)
+
+    async def shutdown(self):
+        await TemporalClient.close()
+        self.executor.shutdown(wait=False)
+        logger.info("ASGI worker shut down")
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await self.startup()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.shutdown()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+
+def create_asgi_app(flask_app, threads=8):
+    return FlaskAsgiApp(flask_app, threads=threads)
@@ -1,43 +1,245 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, current_app, jsonify, request
 
 import logging
+import time
+from dataclasses import asdict
+
+import orjson
 
 from clients.temporal import TemporalClient
-from workflows.request_start import RequestStart
+from models.request import RequestEvent
+from utils import metrics
+from utils.logs import Payload
+from utils.request_store import FILTERS, RequestStore
+from utils.routing import RoutingEngine
+from utils.task_queues import task_queue_for
 
 logger = logging.getLogger(__name__)
 
+# Started by name so the web tier never imports the workflow module (or the
+# Temporal SDK with it) until the first event arrives
+REQUEST_START_WORKFLOW = "RequestStart"
+
 
 main_bp = Blueprint('main', __name__)
 webhooks_bp = Blueprint('webhooks', __name__)
 
 @main_bp.route('/health', methods=['GET'])
 def health_check():
-    return jsonify({'status': 'ok'}), 200
+    status = {'status': 'ok'}
+    forwarder = current_app.extensions.get("spool_forwarder")
+    if forwarder is not None:
+        status['spool'] = forwarder.stats()
+    limiter = current_app.extensions.get("admission_limiter")
+    if limiter is not None:
+        status['admission'] = limiter.stats()
+    return jsonify(status), 200
+
+
+@main_bp.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    body, content_type = metrics.render_metrics()
+    return Response(body, content_type=content_type)
+
+
+def _request_store():
+    # Opened on first use, so apps that never list requests don't create the file
+    store = current_app.extensions.get("request_store")
+    if store is None:
+        store = current_app.extensions.setdefault(
+            "request_store", RequestStore(current_app.extensions["settings"].request_store_path)
+        )
+    return store
+
+
+@main_bp.route('/requests', methods=['GET'])
+def list_requests():
+    """Newest requests first, filtered by status, component, assignee_email or reporter_email.
+
+    Served from the request store, never from Temporal. Pass ``next_cursor``
+    back as ``cursor`` for the next page.
+    """
+    try:
+        limit = int(request.args.get("limit", 50))
+        requests, next_cursor = _request_store().query(
+            limit=limit,
+            cursor=request.args.get("cursor"),
+            **{name: request.args.get(name) for name in FILTERS},
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify({"requests": [asdict(r) for r in requests], "next_cursor": next_cursor}), 200
+
+
+@main_bp.route('/requests/<request_id>', methods=['GET'])
+def get_request(request_id):
+    stored = _request_store().get(request_id)
+    if stored is None:
+        return jsonify({"error": "Request not found"}), 404
+    return jsonify(asdict(stored)), 200
+
+
+def request_workflow_id(event):
+    """One workflow per Slack thread; events without a thread get their own."""
+    if event.thread_key:
+        return f"slack-thread-{event.thread_key}"
+    return f"slack-webhook-{event.event_id}"
+
+
+async def signal_with_start(client, workflow_id, event):
+    """Start the thread's RequestStart workflow, or signal it if already running.
+
+    The event is classified by the routing rules first. The workflow goes to
+    its channel's task queue shard; a running workflow keeps the queue it
+    started on. The event travels once, as the start signal; the workflow
+    input only carries its id.
+    """
+    event = RoutingEngine.get_engine().route(event)
+    return await client.start_workflow(
+        REQUEST_START_WORKFLOW,
+        RequestEvent(event_id=event.event_id),
+        id=workflow_id,
+        task_queue=task_queue_for(event),
+        start_signal="new_event",
+        start_signal_args=[event]
+    )
+
+
+async def forward_spooled_event(workflow_id, payload):
+    """Start the workflow for a spooled event. Used by the spool forwarder."""
+    from temporalio.exceptions import WorkflowAlreadyStartedError
+
+    client = await TemporalClient.get_client()
+    try:
+        await signal_with_start(client, workflow_id, RequestEvent.from_slack_payload(payload))
+    except WorkflowAlreadyStartedError:
+        # Replayed after a crash or lease expiry; Temporal already has it
+        logger.info("Spooled workflow %s was already started", workflow_id)
 
 
 @webhooks_bp.route("/slack", methods=["POST"])
 async def slack_webhook():
     """Handle incoming Slack webhooks and start Temporal workflow."""
+    body = request.get_data()
+
+    # Authenticate the raw bytes before spending anything on parsing them
+    verifier = current_app.extensions.get("slack_verifier")
+    if verifier is not None:
+        reason = verifier.check(body, request.headers.get("X-Slack-Request-Timestamp"),
+                                request.headers.get("X-Slack-Signature"))
+        if reason is not None:
+            metrics.WEBHOOK_REJECTED.labels(reason).inc()
+            return jsonify({"error": "Invalid request signature"}), 401
+
     if not request.is_json:
         return jsonify({"error": "Request must be JSON"}), 400
 
-    payload = request.get_json()
-    logger.info(f"Received Slack webhook: {payload}")
+    try:
+        payload = orjson.loads(body)
+    except orjson.JSONDecodeError:
+        payload = None
+    if not isinstance(payload, dict):
+        metrics.WEBHOOK_REJECTED.labels("bad_json").inc()
+        return jsonify({"error": "Request body must be a JSON object"}), 400
+    logger.info("Received Slack webhook: %s", Payload(payload))
 
-    #TODO: Make it confirm to slack payload and also trigger it from a slack webhook
+    if payload.get("type") == "url_verification":
+        # Slack's one-off handshake when the Events API URL is configured
+        return jsonify({"challenge": payload.get("challenge")}), 200
 
     # Generate workflow ID
-    workflow_id = f"slack-webhook-{payload.get('event_id', 'unknown')}"
-    
+    event_id = payload.get('event_id')
+    event = RequestEvent.from_slack_payload(payload)
+    thread_roots = current_app.extensions.get("thread_roots")
+    if thread_roots is not None:
+        event = thread_roots.resolve(event)
+    workflow_id = request_workflow_id(event)
+
+    # Slack redelivers events we were slow to ack; answer those without touching Temporal.
+    # An event only counts as handled once its start (or spool write) succeeded.
+    dedup = current_app.extensions.get("event_dedup")
+    state = dedup.claim(event_id) if event_id and dedup is not None else "new"
+    if state == "seen":
+        logger.info("Ignoring duplicate event %s (retry %s)", event_id, request.headers.get('X-Slack-Retry-Num', 0))
+        return jsonify({
+            "status": "Duplicate event ignored",
+            "workflow_id": workflow_id
+        }), 200
+    if state == "in_flight":
+        # The first delivery may still fail, so don't tell Slack it's done yet
+        logger.info("Event %s is still being started (retry %s)", event_id, request.headers.get('X-Slack-Retry-Num', 0))
+        return jsonify({
+            "error": "Event is already being processed",
+            "workflow_id": workflow_id
+        }), 503, {"Retry-After": current_app.config.get("WEBHOOK_RETRY_AFTER", "1")}
+
+    spool = current_app.extensions.get("webhook_spool")
+    if spool is not None:
+        # Spool intake: ack once the event is on disk, the forwarder starts the workflow
+        return _spool_event(spool, dedup, event_id, workflow_id, payload)
+
+    limiter = current_app.extensions.get("admission_limiter")
+    if limiter is None:
+        return await _start_workflow(dedup, event_id, workflow_id, event)
+
+    if not limiter.try_acquire():
+        overflow = current_app.extensions.get("overflow_spool")
+        if overflow is not None:
+            metrics.WEBHOOK_SHED.labels("spooled").inc()
+            return _spool_event(overflow, dedup, event_id, workflow_id, payload)
+
+        # Fail fast instead of queueing behind a slow Temporal until Slack times out
+        metrics.WEBHOOK_SHED.labels("rejected").inc()
+        logger.warning("Shedding webhook %s: %s", workflow_id, limiter.stats())
+        _release_event(dedup, event_id)
+        return jsonify({
+            "error": "Too many workflow starts in flight",
+            "workflow_id": workflow_id
+        }), 503, {"Retry-After": current_app.config.get("WEBHOOK_RETRY_AFTER", "1")}
+
+    started = time.monotonic()
+    status = 500
+    metrics.WEBHOOK_IN_FLIGHT.inc()
+    try:
+        response, status = await _start_workflow(dedup, event_id, workflow_id, event)
+        return response, status
+    finally:
+        metrics.WEBHOOK_IN_FLIGHT.dec()
+        limiter.release(time.monotonic() - started, failed=status >= 500)
+
+
+def _spool_event(spool, dedup, event_id, workflow_id, payload):
+    try:
+        spool.append(workflow_id, payload)
+    except Exception as e:
+        logger.error("Failed to spool webhook %s: %s", workflow_id, e)
+        _release_event(dedup, event_id)
+        return jsonify({
+            "error": "Failed to accept event",
+            "details": str(e),
+            "workflow_id": workflow_id
+        }), 503
+    _complete_event(dedup, event_id)
+    return jsonify({
+        "status": "Event accepted",
+        "workflow_id": workflow_id
+    }), 202
+
+
+async def _start_workflow(dedup, event_id, workflow_id, event):
+    from temporalio.exceptions import WorkflowAlreadyStartedError
+
     try:
         # Connect to Temporal client
         logger.info("Connecting to Temporal client...")
-        client = await TemporalClient.get_client()
+        with metrics.TEMPORAL_CONNECT_DURATION.time():
+            client = await TemporalClient.get_client()
         logger.info("Successfully connected to Temporal client")
         
     except Exception as e:
-        logger.error(f"Failed to connect to Temporal server: {str(e)}")
+        logger.error("Failed to connect to Temporal server: %s", e)
+        metrics.TEMPORAL_START_ERRORS.labels(type(e).__name__).inc()
+        _release_event(dedup, event_id)
         return jsonify({
             "error": "Failed to connect to workflow service",
             "details": str(e),
@@ -46,33 +248,62 @@ async def slack_webhook():
 
     try:
         # Start workflow execution
-        logger.info(f"Starting workflow with ID: {workflow_id}")
-        workflow_handle = await client.start_workflow(
-            RequestStart.run,
-            payload,
-            id=workflow_id,
-            task_queue="slack-webhook-task-queue"
-        )
+        logger.info("Starting workflow with ID: %s", workflow_id)
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            workflow_handle = await signal_with_start(client, workflow_id, event)
+            outcome = "started"
+        except WorkflowAlreadyStartedError:
+            outcome = "already_started"
+            raise
+        finally:
+            metrics.TEMPORAL_START_DURATION.labels(outcome).observe(time.perf_counter() - started)
         
         # Verify workflow started successfully
         if workflow_handle:
-            logger.info(f"Successfully started workflow with ID: {workflow_id}")
+            logger.info("Successfully started workflow with ID: %s", workflow_id)
+            _complete_event(dedup, event_id)
             return jsonify({
                 "status": "Workflow started successfully", 
                 "workflow_id": workflow_id,
                 "workflow_run_id": workflow_handle.id
             }), 202
         else:
-            logger.error(f"Workflow handle is None for workflow ID: {workflow_id}")
+            logger.error("Workflow handle is None for workflow ID: %s", workflow_id)
+            _release_event(dedup, event_id)
             return jsonify({
                 "error": "Workflow started but handle is invalid",
                 "workflow_id": workflow_id
             }), 500
             
+    except WorkflowAlreadyStartedError:
+        # Another worker (or an earlier delivery) already started it
+        logger.info("Workflow %s was already started", workflow_id)
+        _complete_event(dedup, event_id)
+        return jsonify({
+            "status": "Workflow already started",
+            "workflow_id": workflow_id
+        }), 200
+
     except Exception as e:
-        logger.error(f"Failed to start workflow {workflow_id}: {str(e)}")
+        logger.error("Failed to start workflow %s: %s", workflow_id, e)
+        metrics.TEMPORAL_START_ERRORS.labels(type(e).__name__).inc()
+        _release_event(dedup, event_id)
         return jsonify({
             "error": "Failed to start workflow",
             "details": str(e),
             "workflow_id": workflow_id
         }), 500
+
+
+def _complete_event(dedup, event_id):
+    """Answer Slack's later redeliveries of an accepted event as duplicates."""
+    if event_id and dedup is not None:
+        dedup.complete(event_id)
+
+
+def _release_event(dedup, event_id):
+    """Let Slack's next redelivery through after we failed to accept an event."""
+    if event_id and dedup is not None:
+        dedup.release(event_id)
@@ -0,0 +1,204 @@
+import asyncio
+import logging
+import time
+
+from temporalio.exceptions import WorkflowAlreadyStartedError
+
+from clients.slack_socket import SlackSocketClient
+from clients.temporal import TemporalClient
+from models.request import RequestEvent
+from project.routes import request_workflow_id, signal_with_start
+from utils import metrics
+from utils.logs import Payload
+
+logger = logging.getLogger(__name__)
+
+
+class SocketModeIngest:
+    """Feed Events API envelopes from a Slack Socket Mode connection into Temporal.
+
+    Envelopes are acknowledged as soon as their event is queued, so the ack
+    never waits on Temporal. ``concurrency`` tasks drain the queue through the
+    same dedup, routing and signal-with-start path as the webhook, on one
+    Temporal client for the life of the process. When ``queue_size`` events
+    are already waiting, new envelopes are left unacknowledged and Slack
+    redelivers them later. An acknowledged event whose start still fails
+    after ``start_retries``, or that is still queued or starting when the
+    shutdown drain times out, is appended to ``spool`` (a WebhookSpool),
+    whose forwarder keeps retrying it; without a spool it is logged and
+    dropped.
+    """
+
+    def __init__(self, socket_client: SlackSocketClient, dedup=None, queue_size=1000, concurrency=16,
+                 start_retries=3, retry_backoff=0.5, thread_roots=None, spool=None):
+        self.socket_client = socket_client
+        self.dedup = dedup
+        self.thread_roots = thread_roots
+        self.spool = spool
+        self.concurrency = concurrency
+        self.start_retries = start_retries
+        self.retry_backoff = retry_backoff
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.counts = {"accepted": 0, "duplicate": 0, "shed": 0, "ignored": 0,
+                       "started": 0, "already_started": 0, "spooled": 0, "failed": 0}
+        self._consumers = []
+        self._reader = None
+        self._stopping = None
+
+    def _count(self, outcome):
+        self.counts[outcome] += 1
+        metrics.SOCKET_MODE_EVENTS.labels(outcome).inc()
+
+    async def _on_envelope(self, envelope):
+        envelope_id = envelope.get("envelope_id")
+        payload = envelope.get("payload")
+        if envelope.get("type") != "events_api" or not isinstance(payload, dict):
+            # Slash commands and interactivity aren't requests; ack so Slack stops retrying
+            self._count("ignored")
+            await self.socket_client.ack(envelope_id)
+            return
+
+        event_id = payload.get("event_id")
+        if event_id and self.dedup is not None and not self.dedup.add(event_id):
+            logger.info("Ignoring duplicate event %s (retry %s)", event_id, envelope.get("retry_attempt", 0))
+            self._count("duplicate")
+            await self.socket_client.ack(envelope_id)
+            return
+
+        try:
+            self.queue.put_nowait((payload, time.monotonic()))
+        except asyncio.QueueFull:
+            logger.warning("Ingest queue full, leaving envelope %s for redelivery", envelope_id)
+            self._count("shed")
+            self._forget_event(event_id)
+            return
+        metrics.SOCKET_MODE_QUEUED.set(self.queue.qsize())
+        self._count("accepted")
+        await self.socket_client.ack(envelope_id)
+
+    async def _read(self):
+        async for envelope in self.socket_client.envelopes():
+            try:
+                await self._on_envelope(envelope)
+            except Exception as e:
+                # Unacked, so Slack redelivers it
+                logger.error("Failed to handle envelope %s: %s", envelope.get("envelope_id"), e)
+
+    async def _consume(self):
+        while True:
+            payload, queued_at = await self.queue.get()
+            metrics.SOCKET_MODE_QUEUED.set(self.queue.qsize())
+            metrics.SOCKET_MODE_QUEUE_WAIT.observe(time.monotonic() - queued_at)
+            try:
+                await self._start(payload)
+            except Exception as e:
+                logger.error("Unexpected error starting workflow for %s: %s", payload.get("event_id"), e)
+            finally:
+                self.queue.task_done()
+
+    def _event(self, payload):
+        event = RequestEvent.from_slack_payload(payload)
+        if self.thread_roots is not None:
+            event = self.thread_roots.resolve(event)
+        return event
+
+    async def _start(self, payload):
+        logger.info("Received Slack event: %s", Payload(payload))
+        event = self._event(payload)
+        workflow_id = request_workflow_id(event)
+        try:
+            await self._start_with_retries(workflow_id, event, payload)
+        except asyncio.CancelledError:
+            # Only a shutdown whose drain timed out cancels a start; the event was acked
+            self._give_up(workflow_id, payload, "cancelled at shutdown")
+            raise
+
+    async def _start_with_retries(self, workflow_id, event, payload):
+        for attempt in range(self.start_retries + 1):
+            started = time.perf_counter()
+            outcome = "error"
+            try:
+                client = await TemporalClient.get_client()
+                await signal_with_start(client, workflow_id, event)
+                outcome = "started"
+                self._count("started")
+                return
+            except WorkflowAlreadyStartedError:
+                outcome = "already_started"
+                self._count("already_started")
+                return
+            except Exception as e:
+                metrics.TEMPORAL_START_ERRORS.labels(type(e).__name__).inc()
+                if attempt == self.start_retries:
+                    # Already acked, so Slack won't redeliver it
+                    self._give_up(workflow_id, payload, f"{attempt + 1} failed attempts: {e}")
+                    return
+                logger.warning("Failed to start workflow %s, retrying: %s", workflow_id, e)
+            finally:
+                metrics.TEMPORAL_START_DURATION.labels(outcome).observe(time.perf_counter() - started)
+            await asyncio.sleep(self.retry_backoff * 2 ** attempt)
+
+    def _give_up(self, workflow_id, payload, reason):
+        if self.spool is not None:
+            try:
+                self.spool.append(workflow_id, payload)
+                logger.warning("Spooled workflow %s (%s)", workflow_id, reason)
+                self._count("spooled")
+                return
+            except Exception as e:
+                logger.error("Failed to spool workflow %s: %s", workflow_id, e)
+        # Forget it so a manual replay can
+        logger.error("Failed to start workflow %s (%s)", workflow_id, reason)
+        self._count("failed")
+        self._forget_event(payload.get("event_id"))
+
+    def _forget_event(self, event_id):
+        if event_id and self.dedup is not None:
+            self.dedup.discard(event_id)
+
+    async def start(self):
+        """Connect to Temporal and Slack and start reading and draining the queue."""
+        await TemporalClient.get_client()
+        self._consumers = [asyncio.create_task(self._consume()) for _ in range(self.concurrency)]
+        await self.socket_client.connect()
+        self._reader = asyncio.create_task(self._read())
+        logger.info("Socket Mode ingest connected (%s consumers, queue size %s)",
+                    self.concurrency, self.queue.maxsize)
+
+    async def run(self):
+        """Run until ``stop()`` is called, returning once its drain has finished."""
+        await self.start()
+        try:
+            await self._reader
+        finally:
+            await self.stop()
+
+    async def stop(self, drain_timeout=10.0):
+        """Stop reading, give queued events ``drain_timeout`` seconds to start, then shut down.
+
+        Concurrent calls share one shutdown, so ``run()`` returns only after
+        a signal handler's ``stop()`` has drained the queue or timed out.
+        """
+        if self._stopping is None:
+            self._stopping = asyncio.ensure_future(self._shutdown(drain_timeout))
+        await asyncio.shield(self._stopping)
+
+    async def _shutdown(self, drain_timeout):
+        await self.socket_client.close()
+        try:
+            await asyncio.wait_for(self.queue.join(), timeout=drain_timeout)
+        except asyncio.TimeoutError:
+            self._spool_queued()
+        for consumer in self._consumers:
+            consumer.cancel()
+        await asyncio.gather(*self._consumers, return_exceptions=True)
+        self._consumers = []
+
+    def _spool_queued(self):
+        while not self.queue.empty():
+            payload, _ = self.queue.get_nowait()
+            self.queue.task_done()
+            self._give_up(request_workflow_id(self._event(payload)), payload, "still queued at shutdown")
+
+    def stats(self):
+        return {"queued": self.queue.qsize(), "queue_size": self.queue.maxsize, **self.counts}
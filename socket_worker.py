@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+
+import asyncio
+import logging
+import os
+import signal
+
+from utils.settings import get_settings
+
+# Read .env.shared/.env.secret once, before any module reads the environment at import
+settings = get_settings()
+
+from prometheus_client import start_http_server  # noqa: E402
+
+from clients.slack_socket import SlackSocketClient  # noqa: E402
+from clients.temporal import TemporalClient  # noqa: E402
+from project.routes import forward_spooled_event  # noqa: E402
+from project.socket_mode import SocketModeIngest  # noqa: E402
+from utils.dedup import RecentEvents  # noqa: E402
+from utils.logs import configure_logging  # noqa: E402
+from utils.spool import SpoolForwarder, WebhookSpool  # noqa: E402
+from utils.threads import ThreadRoots  # noqa: E402
+
+# Log through a background writer thread (LOG_LEVEL, LOG_FORMAT, LOG_SAMPLE)
+configure_logging()
+logger = logging.getLogger(__name__)
+
+
+async def main():
+    """Receive Slack events over Socket Mode and start their workflows.
+
+    An alternative to POST /webhooks/slack for workspaces that allow Socket
+    Mode: no public HTTP tier, and one Temporal client for the process.
+    """
+    metrics_port = os.getenv("SOCKET_MODE_METRICS_PORT", "9466")
+    if metrics_port:
+        start_http_server(int(metrics_port))
+        logger.info("Socket Mode metrics on port %s", metrics_port)
+
+    TemporalClient.configure(settings)
+    # Acked events whose start keeps failing wait here; the forwarder retries them
+    spool = WebhookSpool(settings.socket_mode_spool_path or settings.webhook_spool_path)
+    forwarder = SpoolForwarder(spool, forward_spooled_event, batch_size=settings.webhook_spool_batch_size)
+    forwarder.start()
+    ingest = SocketModeIngest(
+        SlackSocketClient(settings=settings),
+        # Same settings as the webhook's, so a shared path dedups across both intake paths
+        dedup=RecentEvents(
+            maxsize=settings.webhook_dedup_size,
+            ttl=settings.webhook_dedup_ttl,
+            shared_path=settings.webhook_dedup_path,
+        ),
+        queue_size=settings.socket_mode_queue_size,
+        concurrency=settings.socket_mode_concurrency,
+        start_retries=settings.socket_mode_start_retries,
+        thread_roots=ThreadRoots(shared_path=settings.webhook_dedup_path),
+        spool=spool,
+    )
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, lambda: asyncio.ensure_future(ingest.stop()))
+
+    try:
+        await ingest.run()
+    finally:
+        logger.info("Socket Mode ingest stopped: %s", ingest.stats())
+        forwarder.stop()
+        await TemporalClient.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
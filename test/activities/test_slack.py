@@ -0,0 +1,153 @@
+import asyncio
+
+import pytest
+from slack_sdk.errors import SlackApiError
+from temporalio.exceptions import ApplicationError
+from temporalio.testing import ActivityEnvironment
+
+from activities.errors import is_retryable
+from activities.slack import AsyncSlackActivity, SlackActivity
+from clients.rest import RestError
+from clients.slack import StatusCoalescer
+from models.slack import SlackUpdate
+
+
+class FakeSlackClient:
+    """Records calls; raises SlackApiError for any method listed in ``errors``."""
+
+    def __init__(self, errors=None):
+        self.errors = errors or {}
+        self.calls = []
+
+    def _call(self, name, **kwargs):
+        self.calls.append((name, kwargs))
+        if name in self.errors:
+            raise SlackApiError(self.errors[name], {"ok": False, "error": self.errors[name]})
+        return {"ok": True, "ts": "200.0", "channel": kwargs.get("channel")}
+
+    def add_reaction(self, **kwargs):
+        return self._call("add_reaction", **kwargs)
+
+    def send_message(self, **kwargs):
+        return self._call("send_message", **kwargs)
+
+    def update_message(self, **kwargs):
+        return self._call("update_message", **kwargs)
+
+
+class AsyncFakeSlackClient(FakeSlackClient):
+    async def add_reaction(self, **kwargs):
+        return self._call("add_reaction", **kwargs)
+
+    async def send_message(self, **kwargs):
+        return self._call("send_message", **kwargs)
+
+    async def update_message(self, **kwargs):
+        return self._call("update_message", **kwargs)
+
+
+UPDATES = [
+    SlackUpdate(kind="reaction", channel="C1", ts="100.0", emoji="eyes"),
+    SlackUpdate(kind="message", channel="C1", ts="100.0", text="On it"),
+    SlackUpdate(kind="edit", channel="C1", ts="150.0", text="Status: open"),
+]
+
+
+def make_activity(cls, client):
+    slack_activity = cls.__new__(cls)
+    slack_activity.slack_client = client
+    return slack_activity
+
+
+class TestBatchUpdate:
+    def test_applies_every_update_in_one_activity(self):
+        client = FakeSlackClient()
+        result = ActivityEnvironment().run(make_activity(SlackActivity, client).batch_update, UPDATES)
+
+        assert result["success"] is True
+        assert [r["kind"] for r in result["results"]] == ["reaction", "message", "edit"]
+        assert [name for name, _ in client.calls] == ["add_reaction", "send_message", "update_message"]
+        assert client.calls[1][1]["thread_ts"] == "100.0"
+
+    def test_async_reports_failures_per_update(self):
+        client = AsyncFakeSlackClient(errors={"update_message": "message_not_found"})
+        slack_activity = make_activity(AsyncSlackActivity, client)
+        result = asyncio.run(ActivityEnvironment().run(slack_activity.batch_update, UPDATES))
+
+        assert result["success"] is False
+        assert [r["success"] for r in result["results"]] == [True, True, False]
+        assert result["results"][2]["error"] == "message_not_found"
+
+    def test_rate_limit_is_raised_and_the_retry_resumes(self):
+        client = FakeSlackClient(errors={"send_message": "ratelimited"})
+        slack_activity = make_activity(SlackActivity, client)
+        env = ActivityEnvironment()
+
+        with pytest.raises(ApplicationError) as e:
+            env.run(slack_activity.batch_update, UPDATES)
+        assert e.value.type == "SlackApiError"
+        assert [r["kind"] for r in e.value.details[0]] == ["reaction"]
+        # The retry (same activity) doesn't react again
+        client.errors = {}
+        result = env.run(slack_activity.batch_update, UPDATES)
+
+        assert result["success"] is True
+        assert [name for name, _ in client.calls] == ["add_reaction", "send_message", "send_message", "update_message"]
+
+    def test_async_applies_updates_in_order(self):
+        client = AsyncFakeSlackClient(errors={"send_message": "ratelimited"})
+        slack_activity = make_activity(AsyncSlackActivity, client)
+        env = ActivityEnvironment()
+
+        with pytest.raises(ApplicationError):
+            asyncio.run(env.run(slack_activity.batch_update, UPDATES))
+        assert [name for name, _ in client.calls] == ["add_reaction", "send_message"]
+        client.errors = {}
+        asyncio.run(env.run(slack_activity.batch_update, UPDATES))
+        assert [name for name, _ in client.calls] == ["add_reaction", "send_message", "send_message", "update_message"]
+
+    def test_already_reacted_counts_as_success(self):
+        client = FakeSlackClient(errors={"add_reaction": "already_reacted"})
+        slack_activity = make_activity(SlackActivity, client)
+
+        result = ActivityEnvironment().run(slack_activity.batch_update, UPDATES[:1])
+        assert result["success"] is True
+        result = ActivityEnvironment().run(slack_activity.add_reaction, "C1", "100.0", "eyes")
+        assert result["success"] is True
+
+    def test_status_posts_then_edits_through_the_coalescer(self):
+        client = AsyncFakeSlackClient()
+        client.set_status = StatusCoalescer(client, window=0).set_status
+        slack_activity = make_activity(AsyncSlackActivity, client)
+
+        async def scenario():
+            posted = await slack_activity.batch_update([SlackUpdate(kind="status", channel="C1", text="open",
+                                                                    key="thread-1", version=1)])
+            edited = await slack_activity.batch_update([SlackUpdate(kind="status", channel="C1", text="closed",
+                                                                    key="thread-1", version=2, ts="200.0")])
+            return posted, edited
+
+        posted, edited = asyncio.run(ActivityEnvironment().run(scenario))
+        assert posted["results"] == [{"success": True, "kind": "status", "timestamp": "200.0"}]
+        assert edited["results"] == [{"success": True, "kind": "status", "timestamp": "200.0"}]
+        assert [name for name, _ in client.calls] == ["send_message", "update_message"]
+
+
+class TestRetryableErrors:
+    def test_ratelimited_is_raised_for_temporal_to_retry(self):
+        slack_activity = make_activity(SlackActivity, FakeSlackClient(errors={"send_message": "ratelimited"}))
+
+        with pytest.raises(SlackApiError):
+            slack_activity.send_message("C1", "hi")
+
+    def test_permanent_errors_are_returned(self):
+        slack_activity = make_activity(SlackActivity, FakeSlackClient(errors={"send_message": "channel_not_found"}))
+
+        result = slack_activity.send_message("C1", "hi")
+        assert result["success"] is False
+        assert result["error"] == "channel_not_found"
+
+    def test_rest_errors_retry_on_429_and_5xx_only(self):
+        assert is_retryable(RestError(429))
+        assert is_retryable(RestError(503))
+        assert not is_retryable(RestError(404))
@@ -0,0 +1,33 @@
+import asyncio
+import os
+
+import pytest
+
+import clients.temporal
+from bench.bench_intake import run_benchmark
+from clients.slack import AsyncSlackClient
+from clients.slack_dispatcher import SlackDispatcher
+from clients.temporal import TemporalClient
+
+
+class TestBenchIntake:
+    @pytest.fixture(autouse=True)
+    def restore_globals(self, monkeypatch):
+        # run_benchmark rewires these for the process it normally owns
+        for name in ("SLACK_BOT_TOKEN", "SLACK_API_URL", "WEBHOOK_INTAKE_MODE", "WEBHOOK_SPOOL_PATH"):
+            monkeypatch.setenv(name, os.environ.get(name, ""))
+        monkeypatch.setattr(clients.temporal, "start_temporal_client", clients.temporal.start_temporal_client)
+        monkeypatch.setattr(SlackDispatcher, "_instance", None)
+        monkeypatch.setattr(AsyncSlackClient, "_instance", None)
+        monkeypatch.setattr(TemporalClient, "settings", TemporalClient.settings)
+
+    @pytest.mark.parametrize("intake_mode", ["direct", "spool"])
+    def test_fake_mode_delivers_every_event(self, intake_mode):
+        result = asyncio.run(run_benchmark(temporal="fake", rate=40, duration=0.5, duplicates=0.2,
+                                           retry_storm=1, intake_mode=intake_mode))
+
+        assert result["unique_events"] > 0
+        assert result["delivered"] == result["unique_events"]
+        # 503 is a retry arriving while the first delivery is still starting the workflow
+        assert set(result["status_counts"]) <= {"200", "202", "503"}
+        assert result["ack_latency_ms"]["p50"] is not None
@@ -0,0 +1,124 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+from slack_sdk.errors import SlackApiError
+
+from clients.slack import AsyncSlackClient, StatusCoalescer
+from clients.slack_dispatcher import SlackDispatcher
+
+
+class FakeSlackApi:
+    """Minimal Slack Web API stand-in that records peak concurrency."""
+
+    def __init__(self, delay=0.02):
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+        self.calls = 0
+
+    async def chat_post_message(self, request):
+        self.calls += 1
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(self.delay)
+        self.active -= 1
+        body = await request.json()
+        return web.json_response({"ok": True, "channel": body["channel"], "ts": f"{self.calls}.0001"})
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_post("/api/chat.postMessage", self.chat_post_message)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        return runner, f"http://127.0.0.1:{port}/api/"
+
+
+class TestAsyncSlackClient:
+    def test_concurrent_sends_share_pool_and_respect_cap(self):
+        fake = FakeSlackApi()
+
+        async def scenario():
+            runner, base_url = await fake.start()
+            unlimited = SlackDispatcher(tier_rates={4: 60000}, channel_rate=1000, channel_burst=100)
+            client = AsyncSlackClient(token="xoxb-test", max_in_flight=4, base_url=base_url, dispatcher=unlimited)
+            try:
+                responses = await asyncio.gather(*[
+                    client.send_message(channel="C123", text=f"message {i}") for i in range(20)
+                ])
+                session = client._session
+                assert all(r["ok"] for r in responses)
+                assert session is client._session
+            finally:
+                await client.close()
+                await runner.cleanup()
+
+        asyncio.run(scenario())
+        assert fake.calls == 20
+        assert 1 < fake.peak <= 4
+
+
+class FakeStatusClient:
+    def __init__(self):
+        self.calls = []
+        self.fail = False
+
+    async def send_message(self, channel, text):
+        self.calls.append(("post", text))
+        return {"ok": True, "ts": "200.0"}
+
+    async def update_message(self, channel, message_ts, text):
+        self.calls.append(("edit", text))
+        if self.fail:
+            raise SlackApiError("edit failed", {"ok": False, "error": "ratelimited"})
+        return {"ok": True}
+
+
+class TestStatusCoalescer:
+    def test_burst_becomes_one_edit_with_the_newest_text(self):
+        fake = FakeStatusClient()
+        coalescer = StatusCoalescer(fake, window=0.05)
+
+        async def scenario():
+            first = await coalescer.set_status("thread-1", "C1", "open", 1)
+            burst = await asyncio.gather(*[
+                coalescer.set_status("thread-1", "C1", f"state {version}", version) for version in (2, 4, 3)
+            ])
+            return first, burst
+
+        first, burst = asyncio.run(scenario())
+        assert first == {"ts": "200.0", "version": 1, "sent": True}
+        assert fake.calls == [("post", "open"), ("edit", "state 4")]
+        assert all(result["version"] == 4 and result["ts"] == "200.0" for result in burst)
+        assert coalescer.stats()["coalesced"] == 1
+        assert coalescer.stats()["superseded"] == 1
+
+    def test_retried_version_is_not_resent(self):
+        fake = FakeStatusClient()
+        coalescer = StatusCoalescer(fake, window=0)
+
+        async def scenario():
+            await coalescer.set_status("thread-1", "C1", "open", 1, message_ts="150.0")
+            return await coalescer.set_status("thread-1", "C1", "open", 1)
+
+        assert asyncio.run(scenario()) == {"ts": "150.0", "version": 1, "sent": False}
+        # The workflow already knew the message, so it was edited rather than posted
+        assert fake.calls == [("edit", "open")]
+
+    def test_failed_edit_raises_and_the_retry_resends(self):
+        fake = FakeStatusClient()
+        fake.fail = True
+        coalescer = StatusCoalescer(fake, window=0)
+
+        async def scenario():
+            with pytest.raises(SlackApiError):
+                await coalescer.set_status("thread-1", "C1", "closed", 2, message_ts="150.0")
+            fake.fail = False
+            return await coalescer.set_status("thread-1", "C1", "closed", 2, message_ts="150.0")
+
+        assert asyncio.run(scenario())["sent"] is True
+        assert fake.calls == [("edit", "closed"), ("edit", "closed")]
+        assert coalescer.stats()["failed"] == 1
@@ -0,0 +1,93 @@
+import asyncio
+import time
+
+import pytest
+from slack_sdk.errors import SlackApiError
+
+from clients.identity import IdentityResolver
+from clients.rest import RestError
+
+
+class FakeDirectory:
+    """Async get_user_from_email over a dict, counting calls."""
+
+    def __init__(self, users, error=None, delay=0.01):
+        self.users = users
+        self.error = error
+        self.delay = delay
+        self.calls = 0
+
+    async def get_user_from_email(self, email):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return self.users.get(email)
+
+
+class FakeSlackDirectory(FakeDirectory):
+    async def get_user_from_email(self, email):
+        user = await super().get_user_from_email(email)
+        if user is None:
+            raise SlackApiError("not found", {"ok": False, "error": "users_not_found"})
+        return user
+
+
+def make_resolver(**overrides):
+    systems = {
+        "slack": FakeSlackDirectory({"ada@example.com": {"id": "U1"}}),
+        "jira": FakeDirectory({"ada@example.com": {"accountId": "J1"}}),
+        "pagerduty": FakeDirectory({"ada@example.com": {"id": "P1"}}),
+    }
+    systems.update(overrides)
+    return IdentityResolver(**systems), systems
+
+
+class TestIdentityResolver:
+    def test_fans_out_once_and_caches_the_joined_identity(self):
+        resolver, systems = make_resolver()
+
+        async def scenario():
+            first = await asyncio.gather(*[resolver.resolve("Ada@example.com") for _ in range(5)])
+            return first, await resolver.resolve("ada@example.com")
+
+        first, again = asyncio.run(scenario())
+        assert first[0].slack_user_id == "U1"
+        assert first[0].jira_account_id == "J1"
+        assert first[0].pagerduty_user_id == "P1"
+        assert again == first[0]
+        assert [system.calls for system in systems.values()] == [1, 1, 1]
+        assert resolver.stats()["lookups"] == 1
+
+    def test_unknown_people_are_negatively_cached(self):
+        resolver, systems = make_resolver()
+
+        async def scenario():
+            await resolver.resolve("nobody@example.com")
+            return await resolver.resolve("nobody@example.com")
+
+        identity = asyncio.run(scenario())
+        assert not identity.found
+        assert systems["slack"].calls == 1
+        expires_at, _ = resolver._entries["nobody@example.com"]
+        assert expires_at < time.time() + resolver.negative_ttl + 1
+
+    def test_partial_failure_keeps_what_resolved_for_a_short_time(self):
+        resolver, _ = make_resolver(jira=FakeDirectory({}, error=RestError(503, "unavailable")), negative_ttl=0)
+
+        async def scenario():
+            identity = await resolver.resolve("ada@example.com")
+            return identity, resolver.get("ada@example.com")
+
+        identity, cached = asyncio.run(scenario())
+        assert identity.slack_user_id == "U1"
+        assert identity.jira_account_id is None
+        assert cached is None
+
+    def test_total_failure_raises_and_is_not_cached(self):
+        error = RestError(503, "unavailable")
+        resolver, _ = make_resolver(slack=None, jira=FakeDirectory({}, error=error), pagerduty=None)
+
+        with pytest.raises(RestError):
+            asyncio.run(resolver.resolve("ada@example.com"))
+        assert resolver.stats()["entries"] == 0
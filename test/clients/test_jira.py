@@ -0,0 +1,103 @@
+import asyncio
+
+import pytest
+
+from bench.fakes import FakeJiraServer
+from clients.jira import JIRAClient, JIRAError
+
+
+def run_with_jira(scenario, **server_options):
+    async def main():
+        server = FakeJiraServer(**server_options)
+        base_url = await server.start()
+        client = JIRAClient(base_url=base_url, batch_window=0.02, base_backoff=0.01)
+        try:
+            return server, await scenario(client)
+        finally:
+            await client.close()
+            await server.stop()
+
+    return asyncio.run(main())
+
+
+class TestJIRAClient:
+    def test_concurrent_creates_share_one_bulk_request(self):
+        async def scenario(client):
+            return await asyncio.gather(*[
+                client.create_issue("OPS", f"Request {i}", "Details") for i in range(20)
+            ])
+
+        server, issues = run_with_jira(scenario)
+        assert server.requests == 1
+        assert server.bulk_requests == 1
+        assert sorted(issue["key"] for issue in issues) == sorted(f"OPS-{i}" for i in range(1, 21))
+
+    def test_bulk_failures_are_reported_per_issue(self):
+        async def scenario(client):
+            return await asyncio.gather(
+                client.create_issue("OPS", "Fine", "Details"),
+                client.create_issue("OPS", "INVALID one", "Details"),
+                client.create_issue("OPS", "Also fine", "Details"),
+                return_exceptions=True,
+            )
+
+        _, results = run_with_jira(scenario)
+        assert results[0]["key"] == "OPS-1"
+        assert isinstance(results[1], JIRAError)
+        assert results[2]["key"] == "OPS-2"
+
+    def test_issues_missing_from_a_bulk_response_raise(self):
+        async def scenario(client):
+            results = await asyncio.gather(
+                client.create_issue("OPS", "First", "Details"),
+                client.create_issue("OPS", "Second", "Details"),
+                return_exceptions=True,
+            )
+            return client, results
+
+        _, (client, results) = run_with_jira(scenario, drop_bulk_issues=1)
+        assert results[0]["key"] == "OPS-1"
+        assert isinstance(results[1], JIRAError) and results[1].status == 502
+        assert client.issues_created == 1
+
+    def test_rate_limited_requests_are_retried(self):
+        async def scenario(client):
+            first = await client.create_issue("OPS", "First", "Details")
+            second = await client.create_issue("OPS", "Second", "Details")
+            return client, [first, second]
+
+        server, (client, issues) = run_with_jira(scenario, rate_limit_every=2)
+        assert [issue["key"] for issue in issues] == ["OPS-1", "OPS-2"]
+        assert server.rate_limited == 1
+        assert client.rate_limited == 1
+
+    def test_client_errors_raise(self):
+        async def scenario(client):
+            with pytest.raises(JIRAError) as excinfo:
+                await client.get_issue("OPS-404")
+            return excinfo.value.status
+
+        _, status = run_with_jira(scenario)
+        assert status == 404
+
+    def test_non_json_error_bodies_raise_the_service_error(self):
+        async def scenario(client):
+            with pytest.raises(JIRAError) as excinfo:
+                await client.get_issue("GATEWAY-1")
+            return excinfo.value
+
+        _, error = run_with_jira(scenario)
+        assert error.status == 502
+        assert "Bad Gateway" in error.errors
+
+    def test_cancelled_callers_are_dropped_from_the_bulk_request(self):
+        async def scenario(client):
+            kept = asyncio.create_task(client.create_issue("OPS", "Kept", "Details"))
+            cancelled = asyncio.create_task(client.create_issue("OPS", "Cancelled", "Details"))
+            await asyncio.sleep(0)
+            cancelled.cancel()
+            return await kept
+
+        server, issue = run_with_jira(scenario)
+        assert issue["key"] == "OPS-1"
+        assert [i["fields"]["summary"] for i in server.issues.values()] == ["Kept"]
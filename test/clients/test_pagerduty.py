@@ -0,0 +1,87 @@
+import asyncio
+import time
+from datetime import datetime, timezone
+
+from bench.fakes import FakePagerdutyServer
+from clients.pagerduty import OnCallIndex, PagerdutyClient, parse_schedules
+
+HOUR = 3600
+
+
+def iso(timestamp):
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def rotation(start, people, shift=8 * HOUR, shifts=30):
+    return [
+        {"start": iso(start + i * shift), "end": iso(start + (i + 1) * shift),
+         "user": {"id": people[i % len(people)], "summary": people[i % len(people)].lower()}}
+        for i in range(shifts)
+    ]
+
+
+def run_with_pagerduty(scenario, schedules):
+    async def main():
+        server = FakePagerdutyServer(schedules=schedules)
+        base_url = await server.start()
+        client = PagerdutyClient(api_token="test", base_url=base_url)
+        try:
+            return await scenario(server, client)
+        finally:
+            await client.close()
+            await server.stop()
+
+    return asyncio.run(main())
+
+
+class TestOnCallIndex:
+    def test_lookups_bisect_the_rendered_schedule(self):
+        start = int(time.time() // HOUR) * HOUR - 4 * HOUR
+        schedules = {"PAPI": rotation(start, ["P1", "P2", "P3"]), "PDB": rotation(start, ["P9"], shift=24 * HOUR)}
+
+        async def scenario(server, client):
+            index = OnCallIndex(client, {"api": "PAPI", "database": "PDB"}, window=48 * HOUR)
+            assert await index.refresh() == 2
+            requests = server.requests
+            results = (
+                index.on_call("api", start + 1),
+                index.on_call("api", start + 8 * HOUR),
+                index.on_call("api", start + 17 * HOUR),
+                index.on_call("database", start + 30 * HOUR),
+                index.on_call("api", start - 1),
+                index.on_call("unknown"),
+            )
+            assert server.requests == requests
+            return results
+
+        results = run_with_pagerduty(scenario, schedules)
+        assert [user and user["id"] for user in results] == ["P1", "P2", "P3", "P9", None, None]
+
+    def test_failed_refresh_keeps_previous_entries(self):
+        start = time.time() - HOUR
+
+        async def scenario(server, client):
+            index = OnCallIndex(client, {"api": "PAPI"})
+            await index.refresh()
+            server.fail = True
+            assert await index.refresh() == 0
+            return index
+
+        index = run_with_pagerduty(scenario, {"PAPI": rotation(start, ["P1"])})
+        assert index.on_call("api")["id"] == "P1"
+        assert index.stats()["failures"] == 1
+
+    def test_snapshot_starts_a_new_index_warm(self, tmp_path):
+        path = str(tmp_path / "oncall.json")
+        start = time.time() - HOUR
+
+        async def scenario(server, client):
+            await OnCallIndex(client, {"api": "PAPI"}, path=path).refresh()
+
+        run_with_pagerduty(scenario, {"PAPI": rotation(start, ["P1", "P2"])})
+        warm = OnCallIndex(client=None, schedules={"api": "PAPI"}, path=path)
+        assert warm.on_call("api", start + 10)["id"] == "P1"
+        assert warm.stats()["entries"] > 0
+
+    def test_parse_schedules(self):
+        assert parse_schedules("api=PAPI, database=PDB,") == {"api": "PAPI", "database": "PDB"}
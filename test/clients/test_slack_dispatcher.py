@@ -0,0 +1,125 @@
+import asyncio
+import time
+
+import pytest
+from prometheus_client import REGISTRY
+from slack_sdk.errors import SlackApiError
+from slack_sdk.web.slack_response import SlackResponse
+from temporalio.testing import ActivityEnvironment
+
+from clients import slack_dispatcher
+from clients.slack_dispatcher import SlackDispatcher, TokenBucket
+
+
+def ratelimited(retry_after="0"):
+    response = SlackResponse(
+        client=None,
+        http_verb="POST",
+        api_url="https://slack.com/api/chat.postMessage",
+        req_args={},
+        data={"ok": False, "error": "ratelimited"},
+        headers={"Retry-After": retry_after},
+        status_code=429,
+    )
+    return SlackApiError("ratelimited", response)
+
+
+class TestTokenBucket:
+    def test_burst_then_shaped(self):
+        bucket = TokenBucket(rate=10.0, capacity=2)
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == pytest.approx(0.1, abs=0.01)
+        assert bucket.reserve() == pytest.approx(0.2, abs=0.01)
+
+    def test_pause_delays_next_reservation(self):
+        bucket = TokenBucket(rate=10.0, capacity=5)
+        bucket.pause(2.0)
+        assert bucket.reserve() == pytest.approx(2.1, abs=0.02)
+
+
+class TestSlackDispatcher:
+    def test_channel_posts_are_limited_per_channel(self):
+        dispatcher = SlackDispatcher(tier_rates={4: 60000}, channel_rate=1.0, channel_burst=1)
+
+        assert dispatcher.reserve("chat.postMessage", channel="C1") == 0
+        assert dispatcher.reserve("chat.postMessage", channel="C2") == 0
+        assert dispatcher.reserve("chat.postMessage", channel="C1") == pytest.approx(1.0, abs=0.01)
+        # Reactions are not subject to the per-channel posting limit
+        assert dispatcher.reserve("reactions.add", channel="C1") == 0
+
+    def test_retries_after_ratelimited(self):
+        dispatcher = SlackDispatcher(tier_rates={4: 60000}, channel_rate=1000)
+        attempts = []
+
+        def post(**kwargs):
+            attempts.append(kwargs)
+            if len(attempts) < 3:
+                raise ratelimited()
+            return {"ok": True, "ts": "1.0"}
+
+        assert dispatcher.call("chat.postMessage", post, channel="C1", text="hi") == {"ok": True, "ts": "1.0"}
+        assert len(attempts) == 3
+        assert dispatcher.stats()["rate_limited"] == 2
+
+    def test_waits_and_rate_limits_are_exported(self):
+        dispatcher = SlackDispatcher(tier_rates={3: 60000}, max_retries=1)
+        labels = {"method": "users.lookupByEmail"}
+        before = REGISTRY.get_sample_value("slack_rate_limited_total", labels) or 0.0
+        waits_before = REGISTRY.get_sample_value("slack_dispatch_wait_seconds_count", labels) or 0.0
+
+        def lookup(**kwargs):
+            raise ratelimited()
+
+        with pytest.raises(SlackApiError):
+            dispatcher.call("users.lookupByEmail", lookup, email="a@example.com")
+        assert REGISTRY.get_sample_value("slack_rate_limited_total", labels) == before + 2
+        assert REGISTRY.get_sample_value("slack_dispatch_wait_seconds_count", labels) == waits_before + 2
+        assert REGISTRY.get_sample_value("slack_dispatch_calls_waiting") == 0
+
+    def test_idle_channel_buckets_are_evicted(self):
+        dispatcher = SlackDispatcher(channel_rate=1000.0, channel_burst=1, max_channels=2)
+        dispatcher.reserve("chat.postMessage", channel="C1")
+        dispatcher.reserve("chat.postMessage", channel="C2")
+        time.sleep(0.01)  # both refill
+        dispatcher.reserve("chat.postMessage", channel="C3")
+        assert list(dispatcher._channel_buckets) == ["C2", "C3"]
+
+        # A bucket still owed time is kept over the limit rather than reset
+        busy = SlackDispatcher(channel_rate=0.001, channel_burst=1, max_channels=1)
+        busy.reserve("chat.postMessage", channel="C1")
+        busy.reserve("chat.postMessage", channel="C2")
+        assert list(busy._channel_buckets) == ["C1", "C2"]
+
+    def test_async_gives_up_after_max_retries(self):
+        dispatcher = SlackDispatcher(tier_rates={3: 60000}, max_retries=1)
+
+        async def react(**kwargs):
+            raise ratelimited()
+
+        with pytest.raises(SlackApiError):
+            asyncio.run(dispatcher.call_async("reactions.add", react, channel="C1", timestamp="1.0", name="eyes"))
+        assert dispatcher.stats()["rate_limited"] == 2
+
+    def test_posts_are_not_capped_workspace_wide(self):
+        # chat.postMessage has no method tier: only each channel's one-per-second limit applies
+        dispatcher = SlackDispatcher(tier_rates={4: 1}, channel_rate=1.0, channel_burst=1)
+
+        assert all(dispatcher.reserve("chat.postMessage", channel=f"C{i}") == 0 for i in range(100))
+
+    def test_waits_heartbeat_inside_activities(self, monkeypatch):
+        monkeypatch.setattr(slack_dispatcher, "HEARTBEAT_INTERVAL", 0.01)
+        dispatcher = SlackDispatcher(channel_rate=20.0, channel_burst=1)
+        heartbeats = []
+
+        def post(**kwargs):
+            return {"ok": True}
+
+        def send_twice():
+            dispatcher.call("chat.postMessage", post, channel="C1", text="one")
+            dispatcher.call("chat.postMessage", post, channel="C1", text="two")
+
+        env = ActivityEnvironment()
+        env.on_heartbeat = lambda *details: heartbeats.append(details)
+        env.run(send_twice)
+        assert len(heartbeats) >= 3
@@ -0,0 +1,113 @@
+import pytest
+from prometheus_client import REGISTRY
+from slack_sdk.errors import SlackApiError
+
+from clients.slack import SlackClient, SlackUserDirectory
+from clients.slack_dispatcher import SlackDispatcher
+from utils.settings import Settings
+
+
+class FakeWebClient:
+    def __init__(self, users):
+        self.users = users
+        self.lookups = 0
+
+    def users_lookupByEmail(self, email):
+        self.lookups += 1
+        for user in self.users:
+            if user["profile"]["email"] == email:
+                return {"ok": True, "user": user}
+        raise SlackApiError("users_not_found", {"ok": False, "error": "users_not_found"})
+
+    def users_list(self, limit, cursor=None):
+        start = int(cursor or 0)
+        page = self.users[start:start + limit]
+        next_cursor = str(start + limit) if start + limit < len(self.users) else ""
+        return {"ok": True, "members": page, "response_metadata": {"next_cursor": next_cursor}}
+
+
+def make_user(n):
+    return {"id": f"U{n}", "name": f"user{n}", "updated": 1, "profile": {"email": f"user{n}@example.com"}}
+
+
+@pytest.fixture
+def slack_client():
+    def build(users, directory):
+        client = SlackClient(token="xoxb-test", dispatcher=SlackDispatcher(tier_rates={2: 60000, 3: 60000}), users=directory)
+        client.client = FakeWebClient(users)
+        return client
+    return build
+
+
+class TestSlackUserDirectory:
+    def test_lookup_is_cached(self, slack_client):
+        directory = SlackUserDirectory()
+        client = slack_client([make_user(1)], directory)
+
+        assert client.get_user_from_email("user1@example.com")["id"] == "U1"
+        assert client.get_user_from_email("USER1@example.com")["id"] == "U1"
+        assert client.client.lookups == 1
+        assert directory.stats()["hits"] == 1
+
+    def test_lookups_are_exported_by_outcome(self, slack_client):
+        def lookups(outcome):
+            return REGISTRY.get_sample_value("slack_user_cache_lookups_total", {"outcome": outcome}) or 0.0
+
+        before = {outcome: lookups(outcome) for outcome in ("hit", "miss", "negative_hit")}
+        client = slack_client([make_user(1)], SlackUserDirectory())
+        client.get_user_from_email("user1@example.com")
+        client.get_user_from_email("user1@example.com")
+        for _ in range(2):
+            with pytest.raises(SlackApiError):
+                client.get_user_from_email("nobody@example.com")
+
+        assert {outcome: lookups(outcome) - before[outcome] for outcome in before} == {
+            "hit": 1, "miss": 2, "negative_hit": 1,
+        }
+
+    def test_directory_is_configured_from_settings(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(SlackUserDirectory, "_instance", None)
+        path = str(tmp_path / "users.json")
+        directory = SlackUserDirectory.get_directory(
+            Settings(slack_user_cache_ttl=60.0, slack_user_cache_negative_ttl=5.0, slack_user_cache_path=path)
+        )
+
+        assert (directory.ttl, directory.negative_ttl, directory.path) == (60.0, 5.0, path)
+
+    def test_unknown_email_is_negatively_cached(self, slack_client):
+        directory = SlackUserDirectory()
+        client = slack_client([], directory)
+
+        for _ in range(3):
+            with pytest.raises(SlackApiError) as e:
+                client.get_user_from_email("nobody@example.com")
+            assert e.value.response["error"] == "users_not_found"
+        assert client.client.lookups == 1
+        assert directory.stats()["negative_hits"] == 2
+
+    def test_warm_up_pages_and_persists(self, slack_client, tmp_path):
+        path = str(tmp_path / "users.json")
+        client = slack_client([make_user(n) for n in range(5)], SlackUserDirectory(path=path))
+
+        assert client.warm_user_directory(page_size=2) == 5
+        # A fresh process starts warm from the snapshot
+        restarted = slack_client([], SlackUserDirectory(path=path))
+        assert restarted.get_user_from_email("user3@example.com")["id"] == "U3"
+        assert restarted.client.lookups == 0
+
+    def test_refresh_evicts_deleted_members(self, slack_client):
+        directory = SlackUserDirectory()
+        users = [make_user(n) for n in range(3)]
+        client = slack_client(users, directory)
+        client.warm_user_directory()
+
+        users[1] = {**users[1], "deleted": True, "updated": 2}
+        assert client.warm_user_directory() == 1
+        assert directory.get("user1@example.com") is None
+        assert directory.get("user2@example.com")["id"] == "U2"
+
+    def test_expired_entries_are_refetched(self, slack_client):
+        client = slack_client([make_user(1)], SlackUserDirectory(ttl=0))
+        client.get_user_from_email("user1@example.com")
+        client.get_user_from_email("user1@example.com")
+        assert client.client.lookups == 2
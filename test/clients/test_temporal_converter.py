@@ -0,0 +1,32 @@
+import asyncio
+
+from temporalio.converter import DataConverter
+
+from clients.temporal_converter import ZLIB_ENCODING, compact_data_converter
+from models.request import RequestEvent
+
+
+class TestCompactDataConverter:
+    def test_round_trip_with_compression(self):
+        converter = compact_data_converter(compression_threshold=64)
+        event = RequestEvent(event_id="Ev1", channel="C1", text="help " * 200)
+
+        payloads = asyncio.run(converter.encode([event, {"ok": True}]))
+        assert payloads[0].metadata["encoding"] == ZLIB_ENCODING
+        assert payloads[1].metadata["encoding"] == b"json/plain"
+        assert asyncio.run(converter.decode(payloads, [RequestEvent, dict])) == [event, {"ok": True}]
+
+    def test_reads_payloads_written_by_default_converter(self):
+        payloads = asyncio.run(DataConverter.default.encode([{"event_id": "Ev1"}]))
+        decoded = asyncio.run(compact_data_converter().decode(payloads, [RequestEvent]))
+        assert decoded == [RequestEvent(event_id="Ev1")]
+
+    def test_trims_slack_envelope(self):
+        event = RequestEvent.from_slack_payload({
+            "token": "secret",
+            "team_id": "T1",
+            "event_id": "Ev1",
+            "event": {"type": "message", "channel": "C1", "user": "U1", "text": "hi", "ts": "1.0", "blocks": []},
+        })
+        assert event == RequestEvent(event_id="Ev1", event_type="message", team_id="T1",
+                                     channel="C1", user="U1", text="hi", ts="1.0")
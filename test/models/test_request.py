@@ -0,0 +1,26 @@
+from models.request import RequestEvent
+
+
+class TestRequestEventFromSlackPayload:
+    def test_edit_keys_on_the_edited_message(self):
+        event = RequestEvent.from_slack_payload({
+            "event_id": "Ev3",
+            "event": {
+                "type": "message", "subtype": "message_changed", "channel": "C1", "ts": "105.0",
+                "message": {"user": "U1", "text": "fixed typo", "ts": "101.0", "thread_ts": "100.0"},
+                "previous_message": {"user": "U1", "text": "fixed tpyo", "ts": "101.0", "thread_ts": "100.0"},
+            },
+        })
+
+        assert (event.ts, event.thread_ts, event.text, event.user) == ("101.0", "100.0", "fixed typo", "U1")
+        assert event.thread_key == "C1-100.0"
+
+    def test_reaction_keys_on_its_item(self):
+        event = RequestEvent.from_slack_payload({
+            "event_id": "Ev4",
+            "event": {"type": "reaction_added", "user": "U2", "reaction": "eyes", "event_ts": "106.0",
+                      "item": {"type": "message", "channel": "C1", "ts": "100.0"}},
+        })
+
+        assert event.thread_key == "C1-100.0"
+        assert event.reaction == "eyes"
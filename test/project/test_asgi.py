@@ -0,0 +1,113 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+import clients.temporal
+from project.app import create_app
+from project.asgi import create_asgi_app
+
+
+class FakeTemporalClient:
+    def __init__(self):
+        self.loops = []
+
+    async def start_workflow(self, workflow, payload, id, task_queue, **kwargs):
+        self.loops.append(asyncio.get_running_loop())
+        return SimpleNamespace(id=id)
+
+
+async def _call(app, method, path, body=b""):
+    scope = {
+        "type": "http",
+        "http_version": "1.1",
+        "method": method,
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "scheme": "http",
+        "query_string": b"",
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"host", b"testserver"),
+        ],
+        "client": ("127.0.0.1", 1234),
+        "server": ("testserver", 80),
+    }
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    await app(scope, receive, send)
+    status = sent[0]["status"]
+    payload = b"".join(m.get("body", b"") for m in sent[1:])
+    return status, json.loads(payload)
+
+
+async def _lifespan(app, message_type):
+    sent = []
+
+    async def receive():
+        return {"type": message_type}
+
+    async def send(message):
+        sent.append(message)
+        raise asyncio.CancelledError  # stop the lifespan loop after one event
+
+    try:
+        await app({"type": "lifespan"}, receive, send)
+    except asyncio.CancelledError:
+        pass
+    return sent[0]["type"]
+
+
+class TestAsgiApp:
+    """The ASGI entry point must reuse one Temporal client per process."""
+
+    @pytest.fixture
+    def fake_connect(self, monkeypatch):
+        connects = []
+
+        async def start_temporal_client():
+            client = FakeTemporalClient()
+            connects.append(client)
+            return client
+
+        monkeypatch.setattr(clients.temporal, "start_temporal_client", start_temporal_client)
+        return connects
+
+    def test_health_over_asgi(self, fake_connect):
+        app = create_asgi_app(create_app(), threads=2)
+
+        async def scenario():
+            return await _call(app, "GET", "/health")
+
+        status, body = asyncio.run(scenario())
+        assert status == 200
+        assert body["status"] == "ok"
+
+    def test_webhooks_share_one_client_and_loop(self, fake_connect):
+        app = create_asgi_app(create_app(), threads=4)
+
+        async def scenario():
+            assert await _lifespan(app, "lifespan.startup") == "lifespan.startup.complete"
+            results = await asyncio.gather(*[
+                _call(app, "POST", "/webhooks/slack", json.dumps({"event_id": f"asgi-{i}"}).encode())
+                for i in range(5)
+            ])
+            server_loop = asyncio.get_running_loop()
+            assert await _lifespan(app, "lifespan.shutdown") == "lifespan.shutdown.complete"
+            return results, server_loop
+
+        results, server_loop = asyncio.run(scenario())
+
+        assert [status for status, _ in results] == [202] * 5
+        assert len(fake_connect) == 1
+        assert fake_connect[0].loops == [server_loop] * 5
@@ -0,0 +1,45 @@
+import asyncio
+
+from prometheus_client import REGISTRY
+
+from project.app import create_app
+from utils.metrics import timed_activity
+
+
+def sample(name, labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class TestMetrics:
+    def test_metrics_endpoint_reports_route_latency(self):
+        test_app = create_app().test_client()
+        before = sample("http_request_duration_seconds_count", {"route": "/health", "method": "GET", "status": "200"})
+
+        test_app.get("/health")
+        response = test_app.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.content_type.startswith("text/plain")
+        assert b"http_request_duration_seconds_bucket" in response.data
+        after = sample("http_request_duration_seconds_count", {"route": "/health", "method": "GET", "status": "200"})
+        assert after == before + 1
+
+    def test_timed_activity_records_outcomes(self):
+        @timed_activity
+        def lookup(ok):
+            return {"success": ok}
+
+        @timed_activity
+        async def react():
+            raise RuntimeError("boom")
+
+        lookup(True)
+        lookup(False)
+        try:
+            asyncio.run(react())
+        except RuntimeError:
+            pass
+
+        assert sample("activity_duration_seconds_count", {"activity": "lookup", "outcome": "success"}) == 1
+        assert sample("activity_duration_seconds_count", {"activity": "lookup", "outcome": "failure"}) == 1
+        assert sample("activity_duration_seconds_count", {"activity": "react", "outcome": "error"}) == 1
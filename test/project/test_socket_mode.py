@@ -0,0 +1,177 @@
+import asyncio
+
+import pytest
+
+from bench.fakes import FakeSlackSocketServer, FakeTemporalClient
+import clients.temporal
+from clients.slack_socket import SlackSocketClient
+from project.socket_mode import SocketModeIngest
+from utils.dedup import RecentEvents
+from utils.spool import WebhookSpool
+
+
+def event_payload(event_id, channel="C1", ts="1700000000.000100"):
+    return {"event_id": event_id, "type": "event_callback",
+            "event": {"type": "message", "channel": channel, "ts": ts, "text": "deploy pipeline broke"}}
+
+
+async def wait_for(condition, timeout=5.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+
+class TestSocketModeIngest:
+    @pytest.fixture
+    def temporal(self, monkeypatch):
+        connects = []
+
+        async def start_temporal_client():
+            client = FakeTemporalClient()
+            connects.append(client)
+            return client
+
+        monkeypatch.setattr(clients.temporal, "start_temporal_client", start_temporal_client)
+        return connects
+
+    async def _ingest(self, server, **options):
+        base_url = await server.start()
+        socket_client = SlackSocketClient(app_token="xapp-test", base_url=base_url)
+        ingest = SocketModeIngest(socket_client, dedup=RecentEvents(), **options)
+        await ingest.start()
+        return ingest
+
+    def test_acks_and_starts_workflows_on_one_client(self, temporal):
+        server = FakeSlackSocketServer()
+
+        async def scenario():
+            ingest = await self._ingest(server, concurrency=4)
+            try:
+                sent = [await server.send_event(event_payload(f"Ev{i}", ts=f"1700000000.00010{i}"))
+                        for i in range(3)]
+                sent.append(await server.send_event(event_payload("Ev0"), retry_attempt=1))
+                sent.append(await server.send_event({"command": "/help"}, envelope_type="slash_commands"))
+                await wait_for(lambda: len(server.acked) == len(sent) and ingest.counts["started"] == 3)
+                return ingest.stats()
+            finally:
+                await ingest.stop(drain_timeout=1)
+                await server.stop()
+
+        stats = asyncio.run(scenario())
+        assert len(temporal) == 1
+        assert temporal[0].starts == 3
+        assert (stats["accepted"], stats["duplicate"], stats["ignored"]) == (3, 1, 1)
+
+    def test_full_queue_leaves_envelopes_unacked(self, temporal, monkeypatch):
+        server = FakeSlackSocketServer()
+        release = asyncio.Event()
+
+        async def blocked_start(self, payload):
+            await release.wait()
+
+        monkeypatch.setattr(SocketModeIngest, "_start", blocked_start)
+
+        async def scenario():
+            ingest = await self._ingest(server, queue_size=1, concurrency=1)
+            try:
+                first = await server.send_event(event_payload("Ev1"))
+                await wait_for(lambda: first in server.acked and ingest.queue.empty())
+                queued = await server.send_event(event_payload("Ev2"))
+                shed = await server.send_event(event_payload("Ev3"))
+                await wait_for(lambda: ingest.counts["shed"] == 1)
+                # Once there is room again, Slack's redelivery is accepted
+                release.set()
+                await wait_for(lambda: ingest.queue.empty())
+                retried = await server.send_event(event_payload("Ev3"), retry_attempt=1)
+                await wait_for(lambda: retried in server.acked)
+                return queued, shed, set(server.acked)
+            finally:
+                await ingest.stop(drain_timeout=1)
+                await server.stop()
+
+        queued, shed, acked = asyncio.run(scenario())
+        assert queued in acked
+        assert shed not in acked
+
+    def test_failed_starts_are_spooled(self, temporal, monkeypatch, tmp_path):
+        server = FakeSlackSocketServer()
+        spool = WebhookSpool(str(tmp_path / "spool.db"))
+
+        async def failing_start(*args, **kwargs):
+            raise RuntimeError("Temporal unavailable")
+
+        monkeypatch.setattr(FakeTemporalClient, "start_workflow", failing_start)
+
+        async def scenario():
+            ingest = await self._ingest(server, start_retries=1, retry_backoff=0, spool=spool)
+            try:
+                acked = await server.send_event(event_payload("Ev1"))
+                await wait_for(lambda: ingest.counts["spooled"] == 1)
+                return acked, set(server.acked), ingest.stats()
+            finally:
+                await ingest.stop(drain_timeout=1)
+                await server.stop()
+
+        acked, acks, stats = asyncio.run(scenario())
+        assert acked in acks
+        assert stats["failed"] == 0
+        [(_, workflow_id, payload, _)] = spool.claim(10)
+        assert payload["event_id"] == "Ev1"
+        assert workflow_id.endswith("1700000000.000100")
+
+    def test_run_returns_after_stop_drains_the_queue(self, temporal, monkeypatch):
+        server = FakeSlackSocketServer()
+        release = asyncio.Event()
+        started = []
+
+        async def slow_start(self, payload):
+            await release.wait()
+            started.append(payload["event_id"])
+
+        monkeypatch.setattr(SocketModeIngest, "_start", slow_start)
+
+        async def scenario():
+            base_url = await server.start()
+            ingest = SocketModeIngest(SlackSocketClient(app_token="xapp-test", base_url=base_url))
+            runner = asyncio.create_task(ingest.run())
+            try:
+                await wait_for(lambda: ingest._reader is not None)
+                await server.send_event(event_payload("Ev1"))
+                await wait_for(lambda: ingest.counts["accepted"] == 1)
+                stopper = asyncio.create_task(ingest.stop(drain_timeout=5))
+                await wait_for(lambda: ingest.socket_client.closed)
+                await asyncio.sleep(0.05)
+                assert not runner.done()
+                release.set()
+                await asyncio.wait_for(runner, timeout=5)
+                await stopper
+            finally:
+                await server.stop()
+
+        asyncio.run(scenario())
+        assert started == ["Ev1"]
+
+    def test_starts_cut_off_by_shutdown_are_spooled(self, temporal, monkeypatch, tmp_path):
+        server = FakeSlackSocketServer()
+        spool = WebhookSpool(str(tmp_path / "spool.db"))
+
+        async def hanging_start(*args, **kwargs):
+            await asyncio.Event().wait()
+
+        monkeypatch.setattr(FakeTemporalClient, "start_workflow", hanging_start)
+
+        async def scenario():
+            ingest = await self._ingest(server, concurrency=1, spool=spool)
+            try:
+                await server.send_event(event_payload("Ev1"))
+                await server.send_event(event_payload("Ev2", ts="1700000000.000200"))
+                await wait_for(lambda: ingest.counts["accepted"] == 2 and ingest.queue.qsize() == 1)
+            finally:
+                await ingest.stop(drain_timeout=0.1)
+                await server.stop()
+            return ingest.stats()
+
+        stats = asyncio.run(scenario())
+        assert stats["spooled"] == 2
+        assert sorted(payload["event_id"] for _, _, payload, _ in spool.claim(10)) == ["Ev1", "Ev2"]
@@ -0,0 +1,89 @@
+import dataclasses
+import threading
+import time
+
+from temporalio.testing import ActivityEnvironment
+
+from utils.activity_executor import ActivityPool, ActivityPoolExecutor, parse_pool_config
+
+
+def info_for(activity_type):
+    return dataclasses.replace(ActivityEnvironment().info, activity_type=activity_type)
+
+
+class TestActivityPool:
+    def test_grows_under_queue_wait_and_shrinks_when_idle(self):
+        pool = ActivityPool("test", min_threads=1, max_threads=6, target_queue_wait=0.005,
+                            idle_timeout=0.1, adjust_interval=0.02)
+        peak = 0
+        lock = threading.Lock()
+
+        def task():
+            nonlocal peak
+            with lock:
+                peak = max(peak, pool.busy)
+            time.sleep(0.02)
+
+        futures = [pool.submit(task) for _ in range(60)]
+        for future in futures:
+            future.result(5)
+
+        assert 1 < peak <= 6
+        assert pool.stats()["saturated"] > 0
+
+        deadline = time.monotonic() + 2
+        while pool.threads > 1 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert pool.threads == 1
+        pool.shutdown()
+
+    def test_propagates_exceptions(self):
+        pool = ActivityPool("errors")
+
+        def fail():
+            raise ValueError("boom")
+
+        future = pool.submit(fail)
+        assert isinstance(future.exception(5), ValueError)
+        pool.shutdown()
+
+
+class TestActivityPoolExecutor:
+    def test_routes_by_activity_type(self):
+        executor = ActivityPoolExecutor.from_config({"reads": (("lookup_user_by_email",), 1, 3)})
+        try:
+            seen = {}
+
+            def runner(info):
+                seen[info.activity_type] = threading.current_thread().name
+
+            executor.submit(runner, info_for("lookup_user_by_email")).result(5)
+            executor.submit(runner, info_for("send_message")).result(5)
+
+            assert seen["lookup_user_by_email"].startswith("activity-reads-")
+            assert seen["send_message"].startswith("activity-default-")
+            # Slots for a group's worker are bounded by the pools its types run in
+            assert executor.max_concurrency_for(["lookup_user_by_email"]) == 3
+            assert executor.max_concurrency_for(["lookup_user_by_email", "send_message", "batch_update"]) == 3 + 5
+        finally:
+            executor.shutdown()
+
+    def test_slow_pool_does_not_starve_others(self):
+        executor = ActivityPoolExecutor.from_config({"reads": (("lookup_user_by_email",), 1, 1)})
+        release = threading.Event()
+        try:
+            blocked = [executor.submit(lambda info: release.wait(5), info_for("lookup_user_by_email"))
+                       for _ in range(3)]
+            assert executor.submit(lambda info: "sent", info_for("send_message")).result(2) == "sent"
+            assert executor.stats()["reads"]["queued"] == 2
+        finally:
+            release.set()
+            for future in blocked:
+                future.result(5)
+            executor.shutdown()
+
+    def test_parse_pool_config(self):
+        assert parse_pool_config("writes=send_message,add_reaction:2-10;reads=lookup_user_by_email:3") == {
+            "writes": (("send_message", "add_reaction"), 2, 10),
+            "reads": (("lookup_user_by_email",), 3, 3),
+        }
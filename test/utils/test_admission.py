@@ -0,0 +1,69 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from prometheus_client import REGISTRY
+
+from clients.temporal import TemporalClient
+from project.app import create_app
+from utils.admission import AdaptiveLimiter
+from utils.settings import Settings
+
+
+class TestAdaptiveLimiter:
+    def test_rejects_when_saturated(self):
+        limiter = AdaptiveLimiter(initial_limit=2)
+        assert limiter.try_acquire()
+        assert limiter.try_acquire()
+        assert not limiter.try_acquire()
+        assert limiter.stats() == {"limit": 2, "in_flight": 2, "rejected": 1, "latency_ewma_seconds": 0.0}
+
+    def test_grows_when_fast_and_busy(self):
+        limiter = AdaptiveLimiter(initial_limit=4, target_latency=1.0)
+        for _ in range(20):
+            for _ in range(4):
+                limiter.try_acquire()
+            for _ in range(4):
+                limiter.release(0.01)
+        assert limiter.stats()["limit"] > 4
+
+    def test_shrinks_on_slow_or_failed_starts(self):
+        limiter = AdaptiveLimiter(initial_limit=20, min_limit=2, target_latency=0.5)
+        limiter.try_acquire()
+        limiter.release(2.0)
+        assert limiter.stats()["limit"] == 14
+
+        limiter._last_decrease = 0.0
+        limiter.try_acquire()
+        limiter.release(0.01, failed=True)
+        assert limiter.stats()["limit"] == 9
+        assert REGISTRY.get_sample_value("webhook_admission_limit") == 9
+
+
+class TestWebhookLoadShedding:
+    @pytest.fixture
+    def slow_client(self, monkeypatch):
+        async def start_workflow(workflow, payload, id, task_queue, **kwargs):
+            await asyncio.sleep(0.05)
+            return SimpleNamespace(id=id)
+
+        async def get_client():
+            return SimpleNamespace(start_workflow=start_workflow)
+
+        monkeypatch.setattr(TemporalClient, "get_client", get_client)
+
+    def test_saturated_route_fails_fast_with_retry_after(self, slow_client):
+        app = create_app(intake_mode="direct", settings=Settings(webhook_admission_limit=1))
+        limiter = app.extensions["admission_limiter"]
+        assert limiter.try_acquire()  # another request holds the only slot
+
+        response = app.test_client().post("/webhooks/slack", json={"event_id": "Ev1"})
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+        assert limiter.stats()["rejected"] == 1
+        assert REGISTRY.get_sample_value("webhook_shed_total", {"action": "rejected"}) >= 1
+
+        limiter.release(0.01)
+        assert app.test_client().post("/webhooks/slack", json={"event_id": "Ev1"}).status_code == 202
+        assert limiter.stats()["in_flight"] == 0
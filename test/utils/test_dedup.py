@@ -0,0 +1,141 @@
+from types import SimpleNamespace
+
+import pytest
+from temporalio.exceptions import WorkflowAlreadyStartedError
+
+from clients.temporal import TemporalClient
+from project.app import create_app
+from utils.dedup import RecentEvents
+
+
+class TestRecentEvents:
+    def test_duplicates_within_ttl(self):
+        events = RecentEvents(maxsize=10, ttl=60)
+        assert events.add("Ev1")
+        assert not events.add("Ev1")
+        assert events.stats()["duplicates"] == 1
+
+    def test_expired_and_evicted_events_are_new_again(self):
+        events = RecentEvents(maxsize=2, ttl=0)
+        assert events.add("Ev1")
+        assert events.add("Ev1")  # ttl elapsed
+
+        events = RecentEvents(maxsize=2, ttl=60)
+        for event_id in ("Ev1", "Ev2", "Ev3"):
+            assert events.add(event_id)
+        assert events.add("Ev1")  # evicted as least recently used
+
+    def test_shared_store_spans_processes(self, tmp_path):
+        path = str(tmp_path / "dedup.db")
+        worker_a = RecentEvents(ttl=60, shared_path=path)
+        worker_b = RecentEvents(ttl=60, shared_path=path)
+
+        assert worker_a.add("Ev1")
+        assert not worker_b.add("Ev1")
+
+        worker_a.discard("Ev1")
+        assert RecentEvents(ttl=60, shared_path=path).add("Ev1")
+
+    def test_claim_is_seen_only_once_completed(self):
+        events = RecentEvents(ttl=60)
+        assert events.claim("Ev1") == "new"
+        assert events.claim("Ev1") == "in_flight"
+
+        events.release("Ev1")
+        assert events.claim("Ev1") == "new"
+        events.complete("Ev1")
+        assert events.claim("Ev1") == "seen"
+
+    def test_abandoned_claim_lapses(self):
+        events = RecentEvents(ttl=60, in_flight_ttl=0)
+        assert events.claim("Ev1") == "new"
+        assert events.claim("Ev1") == "new"
+
+    def test_shared_claims_span_processes(self, tmp_path):
+        path = str(tmp_path / "dedup.db")
+        worker_a = RecentEvents(ttl=60, shared_path=path)
+        worker_b = RecentEvents(ttl=60, shared_path=path)
+
+        assert worker_a.claim("Ev1") == "new"
+        assert worker_b.claim("Ev1") == "in_flight"
+        worker_a.complete("Ev1")
+        assert worker_b.claim("Ev1") == "seen"
+
+    def test_claims_prune_expired_shared_rows(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(RecentEvents, "PRUNE_EVERY", 1)
+        events = RecentEvents(ttl=0, in_flight_ttl=0, shared_path=str(tmp_path / "dedup.db"))
+
+        for i in range(3):
+            assert events.claim(f"Ev{i}") == "new"
+            events.complete(f"Ev{i}")
+        events.claim("Ev-crashed")  # never completed
+        events.claim("Ev-latest")
+
+        conn = events._conn()
+        assert conn.execute("SELECT COUNT(*) FROM seen_events").fetchone()[0] == 0
+        assert conn.execute("SELECT event_id FROM in_flight_events").fetchall() == [("Ev-latest",)]
+        assert events.stats()["in_flight"] == 1
+
+
+class FakeTemporalClient:
+    def __init__(self, error=None):
+        self.error = error
+        self.starts = 0
+
+    async def start_workflow(self, workflow, payload, id, task_queue, **kwargs):
+        self.starts += 1
+        if self.error:
+            raise self.error
+        return SimpleNamespace(id=id)
+
+
+class TestWebhookDeduplication:
+    @pytest.fixture
+    def fake_client(self, monkeypatch):
+        client = FakeTemporalClient()
+
+        async def get_client():
+            return client
+
+        monkeypatch.setattr(TemporalClient, "get_client", get_client)
+        return client
+
+    def test_retry_is_acked_without_starting_workflow(self, fake_client):
+        test_app = create_app().test_client()
+
+        first = test_app.post("/webhooks/slack", json={"event_id": "Ev1"})
+        retry = test_app.post("/webhooks/slack", json={"event_id": "Ev1"}, headers={"X-Slack-Retry-Num": "1"})
+
+        assert first.status_code == 202
+        assert retry.status_code == 200
+        assert retry.get_json()["status"] == "Duplicate event ignored"
+        assert fake_client.starts == 1
+
+    def test_already_started_is_success(self, fake_client):
+        fake_client.error = WorkflowAlreadyStartedError("slack-webhook-Ev2", "RequestStart")
+        response = create_app().test_client().post("/webhooks/slack", json={"event_id": "Ev2"})
+
+        assert response.status_code == 200
+        assert response.get_json()["status"] == "Workflow already started"
+
+    def test_failed_start_allows_redelivery(self, fake_client):
+        test_app = create_app().test_client()
+        fake_client.error = RuntimeError("boom")
+        assert test_app.post("/webhooks/slack", json={"event_id": "Ev3"}).status_code == 500
+
+        fake_client.error = None
+        assert test_app.post("/webhooks/slack", json={"event_id": "Ev3"}).status_code == 202
+
+    def test_retry_during_start_is_asked_to_come_back(self, fake_client):
+        app = create_app()
+        app.extensions["event_dedup"].claim("Ev4")  # the first delivery is still starting
+
+        retry = app.test_client().post("/webhooks/slack", json={"event_id": "Ev4"}, headers={"X-Slack-Retry-Num": "1"})
+
+        assert retry.status_code == 503
+        assert retry.headers["Retry-After"] == "1"
+        assert fake_client.starts == 0
+
+        # The first attempt failed, so the next redelivery starts the workflow
+        app.extensions["event_dedup"].release("Ev4")
+        assert app.test_client().post("/webhooks/slack", json={"event_id": "Ev4"}).status_code == 202
@@ -0,0 +1,102 @@
+import io
+import json
+import logging
+import queue
+import threading
+
+import pytest
+
+from utils.logs import (
+    DeferredQueueHandler,
+    JsonFormatter,
+    Payload,
+    SamplingFilter,
+    configure_logging,
+    redact,
+    stop_logging,
+)
+
+
+def make_record(name="clients.slack", level=logging.INFO, msg="hello %s", args=("world",), **extra):
+    record = logging.LogRecord(name, level, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+@pytest.fixture
+def root_logger():
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    yield root
+    stop_logging()
+    for handler in handlers:
+        root.addHandler(handler)
+    root.setLevel(level)
+
+
+class TestRedaction:
+    def test_redacts_content_and_truncates_long_values(self):
+        payload = {"event_id": "Ev1", "token": "xoxb-secret",
+                   "event": {"text": "my password is hunter2", "channel": "C" * 300, "files": [{"id": "F1"}]}}
+
+        redacted = redact(payload, max_chars=10)
+
+        assert redacted["event_id"] == "Ev1"
+        assert redacted["token"] == "<redacted 11 chars>"
+        assert redacted["event"]["text"] == "<redacted 22 chars>"
+        assert redacted["event"]["channel"] == "CCCCCCCCCC...<+290 chars>"
+        assert redacted["event"]["files"] == "<redacted 1 items>"
+        assert payload["event"]["text"] == "my password is hunter2"
+
+    def test_json_formatter_emits_structured_redacted_fields(self):
+        record = make_record(msg="Received %s", args=(Payload({"text": "secret"}),),
+                             event={"text": "secret", "channel": "C1"})
+
+        entry = json.loads(JsonFormatter().format(record))
+
+        assert entry["level"] == "INFO"
+        assert entry["logger"] == "clients.slack"
+        assert entry["msg"] == 'Received {"text": "<redacted 6 chars>"}'
+        assert entry["event"] == {"text": "<redacted 6 chars>", "channel": "C1"}
+
+
+class TestSamplingFilter:
+    def test_keeps_a_steady_fraction_of_info_records(self):
+        sampler = SamplingFilter({"clients": 0.25, "clients.jira": 0})
+
+        kept = sum(sampler.filter(make_record("clients.slack")) for _ in range(100))
+
+        assert kept == 25
+        assert not sampler.filter(make_record("clients.jira"))
+        assert sampler.filter(make_record("project.routes"))
+        assert all(sampler.filter(make_record("clients.slack", logging.WARNING)) for _ in range(10))
+
+
+class TestQueuedLogging:
+    def test_formats_on_the_listener_thread(self, root_logger):
+        formatted_on = []
+
+        class Probe:
+            def __str__(self):
+                formatted_on.append(threading.current_thread())
+                return "probe"
+
+        stream = io.StringIO()
+        configure_logging(level="INFO", json_output=True, sample_rates={}, stream=stream)
+        logging.getLogger("project.routes").info("Received %s", Probe(), extra={"event_id": "Ev1"})
+        logging.getLogger("project.routes").debug("not written %s", Probe())
+        stop_logging()
+
+        entry = json.loads(stream.getvalue())
+        assert (entry["msg"], entry["event_id"]) == ("Received probe", "Ev1")
+        assert len(formatted_on) == 1
+        assert formatted_on[0] is not threading.current_thread()
+
+    def test_drops_records_when_the_queue_is_full(self):
+        handler = DeferredQueueHandler(queue.SimpleQueue(), maxsize=1)
+
+        handler.handle(make_record())
+        handler.handle(make_record())
+
+        assert handler.queue.qsize() == 1
+        assert handler.dropped == 1
@@ -0,0 +1,90 @@
+import pytest
+
+from models.request import Request
+from project.app import create_app
+from utils.request_store import RequestStore
+from utils.settings import Settings
+
+
+def make_request(i, **fields):
+    values = dict(
+        id=f"Ev{i:04d}", request_type="bug", status="open", created_at=f"{1700000000 + i}.000100",
+        updated_at=f"{1700000000 + i}.000100", reporter_email=f"user{i % 3}@example.com",
+        assignee_email="", component="api" if i % 2 else "web", channel="C1", message=f"request {i}",
+    )
+    values.update(fields)
+    return Request(**values)
+
+
+class TestRequestStore:
+    @pytest.fixture
+    def store(self, tmp_path):
+        store = RequestStore(str(tmp_path / "requests.db"))
+        store.save_many(make_request(i) for i in range(10))
+        return store
+
+    def test_save_replaces_the_latest_state(self, store):
+        store.save(make_request(3, status="closed", assignee_email="oncall@example.com"))
+
+        saved = store.get("Ev0003")
+        assert saved.status == "closed"
+        assert saved.assignee_email == "oncall@example.com"
+        assert store.count() == 10
+        assert store.get("missing") is None
+
+    def test_filters_newest_first(self, store):
+        requests, next_cursor = store.query(component="api", reporter_email="user0@example.com")
+
+        assert [r.id for r in requests] == ["Ev0009", "Ev0003"]
+        assert next_cursor is None
+
+    def test_pages_with_a_cursor(self, store):
+        seen = []
+        cursor = None
+        while True:
+            page, cursor = store.query(limit=4, cursor=cursor, status="open")
+            seen.extend(r.id for r in page)
+            if cursor is None:
+                break
+
+        assert seen == [f"Ev{i:04d}" for i in reversed(range(10))]
+
+    def test_rejects_unknown_filters_and_bad_cursors(self, store):
+        with pytest.raises(ValueError):
+            store.query(message="x")
+        with pytest.raises(ValueError):
+            store.query(cursor="not a cursor")
+
+    def test_filters_use_their_index(self, store):
+        plan = store._conn().execute(
+            "EXPLAIN QUERY PLAN SELECT id FROM requests WHERE component = ? AND (created_at, id) < (?, ?) "
+            "ORDER BY created_at DESC, id DESC LIMIT 50", ("api", "1700000005", "Ev0005"),
+        ).fetchall()
+
+        assert "requests_component" in str(plan)
+        assert "TEMP B-TREE" not in str(plan)
+
+
+class TestRequestsEndpoint:
+    @pytest.fixture
+    def client(self, tmp_path):
+        app = create_app(settings=Settings(request_store_path=str(tmp_path / "requests.db")))
+        RequestStore(app.extensions["settings"].request_store_path).save_many(make_request(i) for i in range(5))
+        return app.test_client()
+
+    def test_lists_a_page(self, client):
+        response = client.get("/requests?component=web&limit=2")
+
+        body = response.get_json()
+        assert response.status_code == 200
+        assert [r["id"] for r in body["requests"]] == ["Ev0004", "Ev0002"]
+        next_page = client.get(f"/requests?component=web&cursor={body['next_cursor']}").get_json()
+        assert [r["id"] for r in next_page["requests"]] == ["Ev0000"]
+
+    def test_gets_one_request(self, client):
+        assert client.get("/requests/Ev0001").get_json()["component"] == "api"
+        assert client.get("/requests/missing").status_code == 404
+
+    def test_bad_parameters(self, client):
+        assert client.get("/requests?limit=ten").status_code == 400
+        assert client.get("/requests?cursor=nope").status_code == 400
@@ -0,0 +1,102 @@
+import json
+import os
+
+from models.request import RequestEvent
+from utils.routing import CompiledRules, RoutingEngine
+
+RULES = {
+    "default": {"request_type": "question", "channel": "#help"},
+    "rules": [
+        {"name": "incident", "priority": 100, "keywords": ["outage", "is down"], "regex": [r"\bINC-\d+\b"],
+         "emoji": ["rotating_light"], "request_type": "incident", "channel": "#incidents"},
+        {"name": "ci", "priority": 10, "keywords": ["deploy pipeline"], "component": "ci",
+         "request_type": "bug", "channel": "#ci"},
+        {"name": "db-channel", "channels": ["CDB"], "component": "database", "channel": "#db"},
+        {"name": "db-keyword", "channels": ["CDB", "COPS"], "keywords": ["replica lag"], "component": "database",
+         "request_type": "bug", "channel": "#db-oncall"},
+    ],
+}
+
+
+class TestCompiledRules:
+    def test_keywords_phrases_and_priority(self):
+        rules = CompiledRules(RULES)
+
+        assert rules.classify("C1", "The deploy pipeline is stuck").rule == "ci"
+        assert rules.classify("C1", "Deploy   Pipeline failed and the API is down").rule == "incident"
+        assert rules.classify("C1", "pipeline deploy").rule == ""
+
+    def test_regex_and_emoji(self):
+        rules = CompiledRules(RULES)
+
+        assert rules.classify("C1", "Follow-up on inc-1234 please").channel == "#incidents"
+        assert rules.classify("C1", "help :rotating_light:").request_type == "incident"
+        assert rules.classify("C1", "", reaction="rotating_light").request_type == "incident"
+
+    def test_regexes_overlapping_a_worse_match_still_win(self):
+        rules = CompiledRules({"rules": [
+            {"name": "low", "priority": 1, "regex": [r"error \w+"]},
+            {"name": "high", "priority": 5, "regex": [r"code\d+"]},
+        ]})
+
+        assert rules.classify("C1", "error code42 in build").rule == "high"
+        assert rules.classify("C1", "error here").rule == "low"
+
+    def test_scoped_regex_does_not_hide_an_unscoped_one(self):
+        rules = CompiledRules({"rules": [
+            {"name": "scoped", "priority": 10, "channels": ["COPS"], "regex": [r"disk \w+"]},
+            {"name": "unscoped", "priority": 1, "regex": [r"disk full"]},
+        ]})
+
+        assert rules.classify("C1", "disk full on web-1").rule == "unscoped"
+        assert rules.classify("COPS", "disk full on web-1").rule == "scoped"
+
+    def test_scoped_rules_sharing_a_keyword_yield_one_candidate(self):
+        rules = CompiledRules({"rules": [
+            {"name": f"team-{i}", "channels": [f"C{i}"], "keywords": ["pager"], "priority": i % 7}
+            for i in range(1000)
+        ] + [{"name": "ops", "channels": ["C5"], "keywords": ["pager"], "priority": 100}]})
+
+        assert len(rules.candidates("C5", "the pager fired")) == 1
+        assert rules.classify("C5", "the pager fired").rule == "ops"
+        assert rules.classify("C6", "the pager fired").rule == "team-6"
+        assert rules.classify("C-other", "the pager fired").rule == ""
+
+    def test_channel_scoped_rules(self):
+        rules = CompiledRules(RULES)
+
+        assert rules.classify("CDB", "anything at all").rule == "db-channel"
+        assert rules.classify("CDB", "replica lag again").channel == "#db-oncall"
+        assert rules.classify("C1", "replica lag again").rule == ""
+
+    def test_default_route(self):
+        route = CompiledRules(RULES).classify("C1", "How do I get a laptop?")
+        assert (route.component, route.request_type, route.channel) == ("", "question", "#help")
+
+
+class TestRoutingEngine:
+    def test_routes_events_and_hot_reloads(self, tmp_path):
+        path = tmp_path / "rules.json"
+        path.write_text(json.dumps(RULES))
+        engine = RoutingEngine(str(path), reload_interval=0)
+
+        event = engine.route(RequestEvent(event_id="Ev1", channel="C1", text="deploy pipeline broke"))
+        assert (event.component, event.request_type, event.route_channel) == ("ci", "bug", "#ci")
+
+        changed = {**RULES, "rules": [{"name": "new", "keywords": ["broke"], "component": "misc"}]}
+        path.write_text(json.dumps(changed))
+        os.utime(path, ns=(1, 10 ** 18))
+        assert engine.route(event).component == "misc"
+
+    def test_bad_file_keeps_previous_rules(self, tmp_path):
+        path = tmp_path / "rules.json"
+        path.write_text(json.dumps(RULES))
+        engine = RoutingEngine(str(path), reload_interval=0)
+
+        path.write_text('{"rules": [{"regex": ["(unclosed"]}]}')
+        os.utime(path, ns=(1, 10 ** 18))
+        assert engine.classify("C1", "deploy pipeline").rule == "ci"
+
+    def test_missing_file_uses_default_route(self, tmp_path):
+        engine = RoutingEngine(str(tmp_path / "missing.json"))
+        assert engine.classify("C1", "anything").channel == "#tmp-rohan-test"
@@ -0,0 +1,57 @@
+import subprocess
+import sys
+
+from temporalio import workflow
+
+from project.routes import REQUEST_START_WORKFLOW
+from utils.settings import Settings
+from workflows.request_start import RequestStart
+
+
+class TestSettings:
+    def test_defaults(self):
+        settings = Settings.from_env({})
+
+        assert settings.temporal_address == "localhost:7233"
+        assert settings.slack_signing_secrets == ()
+        assert settings.webhook_overflow_spool is False
+
+    def test_parses_by_field_type(self):
+        settings = Settings.from_env({
+            "TEMPORAL_COMPRESSION_THRESHOLD": "4096",
+            "WEBHOOK_DEDUP_TTL": "30",
+            "WEBHOOK_OVERFLOW_SPOOL": "true",
+            "WEBHOOK_RETRY_AFTER": "5",
+            "WEBHOOK_DEDUP_PATH": "",
+        })
+
+        assert settings.temporal_compression_threshold == 4096
+        assert settings.webhook_dedup_ttl == 30.0
+        assert settings.webhook_overflow_spool is True
+        assert settings.webhook_retry_after == "5"
+        assert settings.webhook_dedup_path is None
+
+    def test_collects_rotating_signing_secrets(self):
+        assert Settings.from_env({"SLACK_SIGNING_SECRET_PREVIOUS": "old"}).slack_signing_secrets == ("old",)
+        assert Settings.from_env({
+            "SLACK_SIGNING_SECRET": "new", "SLACK_SIGNING_SECRET_PREVIOUS": "old",
+        }).slack_signing_secrets == ("new", "old")
+
+    def test_takes_the_first_variable_set(self):
+        assert Settings.from_env({}).worker_activity_queues is True
+        assert Settings.from_env({"WORKER_ACK_QUEUE": "false"}).worker_activity_queues is False
+        assert Settings.from_env({
+            "WORKER_ACTIVITY_QUEUES": "true", "WORKER_ACK_QUEUE": "false",
+        }).worker_activity_queues is True
+
+
+class TestLazyImports:
+    def test_workflow_name_matches_definition(self):
+        assert workflow._Definition.must_from_class(RequestStart).name == REQUEST_START_WORKFLOW
+
+    def test_web_tier_does_not_import_sdks(self):
+        code = ("import sys, project.app; "
+                "print(sorted(m for m in ('temporalio', 'slack_sdk', 'aiohttp') if m in sys.modules))")
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+
+        assert output.strip() == "[]"
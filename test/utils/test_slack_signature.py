@@ -0,0 +1,110 @@
+import json
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from clients.temporal import TemporalClient
+from project.app import create_app
+from utils.settings import Settings
+from utils.slack_signature import SignatureVerifier
+
+SECRET = "8f742231b10e8888abcd99yyyzzz85a5"
+BODY = b'{"token":"xyz","team_id":"T1","event_id":"Ev1","type":"event_callback"}'
+
+
+class TestSignatureVerifier:
+    def test_accepts_slacks_signature(self):
+        verifier = SignatureVerifier([SECRET])
+        now = int(time.time())
+        assert verifier.verify(BODY, str(now), SignatureVerifier.sign(SECRET, BODY, now))
+
+    def test_rejects_tampering_staleness_and_junk(self):
+        verifier = SignatureVerifier([SECRET], max_age=300)
+        now = int(time.time())
+        signature = SignatureVerifier.sign(SECRET, BODY, now)
+
+        assert verifier.check(BODY + b" ", str(now), signature) == "invalid"
+        assert verifier.check(BODY, str(now - 301), SignatureVerifier.sign(SECRET, BODY, now - 301)) == "stale"
+        assert verifier.check(BODY, str(now), "v0=abc") == "malformed"
+        assert verifier.check(BODY, "yesterday", signature) == "malformed"
+        assert verifier.check(BODY, None, signature) == "missing"
+
+    def test_previous_secret_is_accepted_during_rotation(self):
+        now = int(time.time())
+        signature = SignatureVerifier.sign("old-secret", BODY, now)
+
+        assert SignatureVerifier([SECRET, "old-secret"]).verify(BODY, str(now), signature)
+        assert not SignatureVerifier([SECRET]).verify(BODY, str(now), signature)
+
+
+class FakeTemporalClient:
+    def __init__(self):
+        self.starts = 0
+
+    async def start_workflow(self, workflow, payload, id, task_queue, **kwargs):
+        self.starts += 1
+        return SimpleNamespace(id=id)
+
+
+class TestSignedWebhook:
+    @pytest.fixture
+    def signed_app(self, monkeypatch):
+        client = FakeTemporalClient()
+
+        async def get_client():
+            return client
+
+        monkeypatch.setattr(TemporalClient, "get_client", get_client)
+        return create_app(settings=Settings(slack_signing_secrets=(SECRET,))).test_client(), client
+
+    def post(self, app, payload, secret=SECRET, timestamp=None):
+        body = json.dumps(payload).encode()
+        timestamp = timestamp or int(time.time())
+        return app.post("/webhooks/slack", data=body, content_type="application/json", headers={
+            "X-Slack-Request-Timestamp": str(timestamp),
+            "X-Slack-Signature": SignatureVerifier.sign(secret, body, timestamp),
+        })
+
+    def test_only_signed_requests_start_workflows(self, signed_app):
+        app, client = signed_app
+
+        assert app.post("/webhooks/slack", json={"event_id": "Ev1"}).status_code == 401
+        assert self.post(app, {"event_id": "Ev1"}, secret="forged").status_code == 401
+        assert self.post(app, {"event_id": "Ev1"}, timestamp=int(time.time()) - 3600).status_code == 401
+        assert client.starts == 0
+
+        assert self.post(app, {"event_id": "Ev1"}).status_code == 202
+        assert client.starts == 1
+
+    def test_url_verification_is_answered_inline(self, signed_app):
+        app, client = signed_app
+
+        response = self.post(app, {"type": "url_verification", "challenge": "3eZbrw1aBm2rZgRNFdxV2595E9CY3gmd"})
+
+        assert response.status_code == 200
+        assert response.get_json() == {"challenge": "3eZbrw1aBm2rZgRNFdxV2595E9CY3gmd"}
+        assert client.starts == 0
+
+    def test_signed_junk_is_rejected_before_temporal(self, signed_app):
+        app, client = signed_app
+        body = b"not json"
+        timestamp = int(time.time())
+
+        response = app.post("/webhooks/slack", data=body, content_type="application/json", headers={
+            "X-Slack-Request-Timestamp": str(timestamp),
+            "X-Slack-Signature": SignatureVerifier.sign(SECRET, body, timestamp),
+        })
+
+        assert response.status_code == 400
+        assert client.starts == 0
+
+    def test_missing_secret_is_logged_at_startup(self, caplog):
+        with caplog.at_level("WARNING", logger="project.app"):
+            create_app(settings=Settings())
+        assert "SLACK_SIGNING_SECRET is not set" in caplog.text
+
+        caplog.clear()
+        with caplog.at_level("WARNING", logger="project.app"):
+            create_app(settings=Settings(slack_signing_secrets=(SECRET,)))
+        assert "SLACK_SIGNING_SECRET" not in caplog.text
@@ -0,0 +1,107 @@
+import asyncio
+
+import pytest
+from flask import Flask
+from prometheus_client import REGISTRY
+
+from project.routes import main_bp, webhooks_bp
+from utils.spool import SpoolForwarder, WebhookSpool
+
+
+class TestWebhookSpool:
+    """Durability and replay semantics of the local webhook spool."""
+
+    @pytest.fixture
+    def spool(self, tmp_path):
+        return WebhookSpool(str(tmp_path / "spool.db"), lease_seconds=30.0)
+
+    def test_append_claim_ack(self, spool):
+        spool.append("slack-webhook-a", {"event_id": "a"})
+        spool.append("slack-webhook-b", {"event_id": "b"})
+
+        batch = spool.claim(10)
+        assert [(workflow_id, payload) for _, workflow_id, payload, _ in batch] == [
+            ("slack-webhook-a", {"event_id": "a"}),
+            ("slack-webhook-b", {"event_id": "b"}),
+        ]
+        # Leased rows are not handed out twice
+        assert spool.claim(10) == []
+
+        spool.ack([row_id for row_id, *_ in batch])
+        assert spool.stats()["depth"] == 0
+
+    def test_unacked_events_replay_after_restart(self, tmp_path):
+        path = str(tmp_path / "spool.db")
+        spool = WebhookSpool(path, lease_seconds=0.0)
+        spool.append("slack-webhook-a", {"event_id": "a"})
+        assert len(spool.claim(10)) == 1
+
+        # Simulate a crash before ack: a new process reopens the same file
+        reopened = WebhookSpool(path, lease_seconds=0.0)
+        assert [workflow_id for _, workflow_id, _, _ in reopened.claim(10)] == ["slack-webhook-a"]
+
+    def test_forwarder_retries_failures_with_backoff(self, spool):
+        calls = []
+
+        async def start_workflow(workflow_id, payload):
+            calls.append(workflow_id)
+            if workflow_id == "slack-webhook-bad":
+                raise RuntimeError("temporal unavailable")
+
+        spool.append("slack-webhook-ok", {"event_id": "ok"})
+        spool.append("slack-webhook-bad", {"event_id": "bad"})
+        forwarder = SpoolForwarder(spool, start_workflow, base_backoff=60.0)
+
+        assert asyncio.run(forwarder.forward_batch()) == 2
+        assert sorted(calls) == ["slack-webhook-bad", "slack-webhook-ok"]
+
+        stats = forwarder.stats()
+        assert stats["depth"] == 1
+        assert stats["max_attempts"] == 1
+        assert stats["forwarded"] == 1
+        assert stats["failures"] == 1
+        # The failed event is backed off rather than retried immediately
+        assert asyncio.run(forwarder.forward_batch()) == 0
+
+    def test_events_of_one_thread_are_forwarded_in_order(self, spool):
+        calls = []
+
+        async def start_workflow(workflow_id, payload):
+            calls.append(payload["event_id"])
+            await asyncio.sleep(0.01 if payload["event_id"] == "a1" else 0)
+            if payload["event_id"] == "b1":
+                raise RuntimeError("temporal unavailable")
+
+        for event_id in ("a1", "b1", "a2", "b2"):
+            spool.append(f"slack-thread-{event_id[0]}", {"event_id": event_id})
+        forwarder = SpoolForwarder(spool, start_workflow, base_backoff=60.0)
+
+        assert asyncio.run(forwarder.forward_batch()) == 4
+        # b2 waits for b1 rather than overtaking it
+        assert calls == ["a1", "b1", "a2"]
+        assert spool.stats()["depth"] == 2
+        assert spool.claim(10) == []
+
+    def test_forwarder_exports_depth_and_age(self, spool):
+        async def start_workflow(workflow_id, payload):
+            raise RuntimeError("temporal unavailable")
+
+        spool.append("slack-webhook-a", {"event_id": "a"})
+        forwarder = SpoolForwarder(spool, start_workflow, base_backoff=60.0)
+        asyncio.run(forwarder.forward_batch())
+        asyncio.run(forwarder.forward_batch())
+
+        assert REGISTRY.get_sample_value("webhook_spool_depth") == 1
+        assert REGISTRY.get_sample_value("webhook_spool_oldest_age_seconds") >= 0
+
+    def test_route_acks_after_spooling(self, spool):
+        app = Flask(__name__)
+        app.register_blueprint(main_bp, url_prefix='')
+        app.register_blueprint(webhooks_bp, url_prefix='/webhooks')
+        app.extensions["webhook_spool"] = spool
+
+        response = app.test_client().post("/webhooks/slack", json={"event_id": "spooled"})
+
+        assert response.status_code == 202
+        assert response.get_json()["workflow_id"] == "slack-webhook-spooled"
+        assert spool.stats()["depth"] == 1
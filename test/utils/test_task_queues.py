@@ -0,0 +1,51 @@
+import pytest
+
+from models.request import RequestEvent
+from utils.task_queues import (
+    ACK_TASK_QUEUE,
+    TASK_QUEUE,
+    activity_task_queue,
+    parse_shards,
+    shard_for,
+    task_queue_for,
+    worker_task_queues,
+)
+
+
+class TestTaskQueueSharding:
+    def test_unsharded_uses_the_plain_queue(self):
+        assert task_queue_for(RequestEvent(event_id="Ev1", channel="C1"), shards=1) == TASK_QUEUE
+
+    def test_channel_always_maps_to_the_same_shard(self):
+        first = task_queue_for(RequestEvent(event_id="Ev1", channel="C123"), shards=8)
+        reply = task_queue_for(RequestEvent(event_id="Ev2", channel="C123", thread_ts="1.0"), shards=8)
+
+        assert first == reply == f"{TASK_QUEUE}-{shard_for('C123', 8)}"
+
+    def test_channels_spread_over_shards(self):
+        used = {shard_for(f"C{i:05d}", 8) for i in range(200)}
+        assert used == set(range(8))
+
+    def test_falls_back_to_team(self):
+        event = RequestEvent(event_id="Ev1", team_id="T1")
+        assert task_queue_for(event, shards=4) == f"{TASK_QUEUE}-{shard_for('T1', 4)}"
+
+    def test_parse_shards(self):
+        assert parse_shards("all", 4) == [0, 1, 2, 3]
+        assert parse_shards("0, 2-3", 8) == [0, 2, 3]
+        with pytest.raises(ValueError):
+            parse_shards("7", 4)
+
+    def test_worker_task_queues(self, monkeypatch):
+        monkeypatch.setenv("WORKER_SHARDS", "1,3")
+        assert worker_task_queues(shards=4) == [f"{TASK_QUEUE}-1", f"{TASK_QUEUE}-3"]
+
+
+class TestActivityTaskQueues:
+    def test_slack_writes_share_the_ack_queue(self):
+        assert activity_task_queue("batch_update") == activity_task_queue("send_message") == ACK_TASK_QUEUE
+
+    def test_each_group_has_its_own_queue(self):
+        queues = {activity_task_queue(t) for t in ("send_message", "lookup_user_by_email", "create_issue")}
+        assert len(queues) == 3
+        assert activity_task_queue("create_issue") == activity_task_queue("save_request")
@@ -0,0 +1,60 @@
+from flask import Flask
+
+from models.request import RequestEvent
+from project.routes import main_bp, webhooks_bp
+from utils.spool import WebhookSpool
+from utils.threads import ThreadRoots
+
+
+def reply(ts="101.0", root="100.0"):
+    return RequestEvent(event_id=f"Ev{ts}", event_type="message", channel="C1", ts=ts, thread_ts=root)
+
+
+def reaction(item_ts):
+    return RequestEvent(event_id=f"Ev-r{item_ts}", event_type="reaction_added", channel="C1",
+                        ts="110.0", thread_ts=item_ts, reaction="white_check_mark")
+
+
+class TestThreadRoots:
+    def test_reaction_on_a_reply_keys_on_the_thread_root(self):
+        roots = ThreadRoots()
+        roots.resolve(reply())
+
+        assert roots.resolve(reaction("101.0")).thread_key == "C1-100.0"
+        assert roots.stats()["resolved"] == 1
+
+    def test_reaction_on_a_root_or_unknown_message_is_unchanged(self):
+        roots = ThreadRoots()
+        roots.resolve(reply())
+
+        assert roots.resolve(reaction("100.0")).thread_key == "C1-100.0"
+        assert roots.resolve(reaction("999.0")).thread_key == "C1-999.0"
+
+    def test_oldest_replies_are_evicted(self):
+        roots = ThreadRoots(maxsize=2)
+        for ts in ("101.0", "102.0", "103.0"):
+            roots.resolve(reply(ts))
+
+        assert roots.root_of("C1", "101.0") is None
+        assert roots.root_of("C1", "103.0") == "100.0"
+
+    def test_shared_path_is_seen_by_other_processes(self, tmp_path):
+        path = str(tmp_path / "dedup.db")
+        ThreadRoots(shared_path=path).resolve(reply())
+
+        assert ThreadRoots(shared_path=path).resolve(reaction("101.0")).thread_key == "C1-100.0"
+
+    def test_webhook_routes_a_reaction_on_a_reply_to_its_thread(self, tmp_path):
+        app = Flask(__name__)
+        app.register_blueprint(main_bp, url_prefix='')
+        app.register_blueprint(webhooks_bp, url_prefix='/webhooks')
+        app.extensions["webhook_spool"] = WebhookSpool(str(tmp_path / "spool.db"))
+        app.extensions["thread_roots"] = ThreadRoots()
+        client = app.test_client()
+
+        client.post("/webhooks/slack", json={"event_id": "Ev1", "event": {
+            "type": "message", "channel": "C1", "ts": "101.0", "thread_ts": "100.0", "text": "any update?"}})
+        response = client.post("/webhooks/slack", json={"event_id": "Ev2", "event": {
+            "type": "reaction_added", "reaction": "eyes", "item": {"type": "message", "channel": "C1", "ts": "101.0"}}})
+
+        assert response.get_json()["workflow_id"] == "slack-thread-C1-100.0"
@@ -0,0 +1,42 @@
+import pytest
+from temporalio.worker import PollerBehaviorSimpleMaximum, WorkerTuner
+from temporalio.worker.workflow_sandbox import SandboxedWorkflowRunner
+
+from utils.worker_tuning import PROFILES, load_worker_profile
+
+
+class TestWorkerProfiles:
+    def test_sdk_profile_leaves_defaults(self):
+        assert PROFILES["sdk"].worker_kwargs() == {}
+
+    def test_balanced_profile_passes_models_through_the_sandbox(self):
+        kwargs = PROFILES["balanced"].worker_kwargs()
+
+        assert isinstance(kwargs["workflow_runner"], SandboxedWorkflowRunner)
+        assert "models" in kwargs["workflow_runner"].restrictions.passthrough_modules
+        assert kwargs["max_cached_workflows"] == 1000
+        assert kwargs["workflow_task_poller_behavior"] == PollerBehaviorSimpleMaximum(4)
+
+    def test_resource_profile_uses_a_tuner_instead_of_fixed_limits(self):
+        kwargs = PROFILES["resource"].worker_kwargs(max_concurrent_activities=5)
+
+        assert isinstance(kwargs["tuner"], WorkerTuner)
+        assert "max_concurrent_activities" not in kwargs
+        assert "max_concurrent_workflow_tasks" not in kwargs
+
+    def test_explicit_activity_limit_overrides_profile(self):
+        assert PROFILES["balanced"].worker_kwargs(max_concurrent_activities=5)["max_concurrent_activities"] == 5
+
+    def test_environment_overrides(self, monkeypatch):
+        monkeypatch.setenv("WORKER_PROFILE", "throughput")
+        monkeypatch.setenv("WORKER_MAX_CACHED_WORKFLOWS", "42")
+        monkeypatch.setenv("WORKER_SANDBOX_PASSTHROUGH", "false")
+
+        profile = load_worker_profile()
+        assert profile.name == "throughput"
+        assert profile.max_cached_workflows == 42
+        assert "workflow_runner" not in profile.worker_kwargs()
+
+    def test_unknown_profile(self):
+        with pytest.raises(ValueError):
+            load_worker_profile("turbo")
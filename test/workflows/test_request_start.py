@@ -0,0 +1,302 @@
+import asyncio
+import collections
+import dataclasses
+import logging
+import uuid
+from typing import List
+
+import pytest
+from temporalio import activity
+from temporalio.exceptions import ActivityError, ApplicationError
+from temporalio.testing import WorkflowEnvironment
+from temporalio.worker import Worker
+
+from clients.temporal_converter import compact_data_converter
+from models.request import Request, RequestEvent
+from models.slack import SlackUpdate
+from project.routes import signal_with_start
+from utils.task_queues import activity_task_queue
+from workflows import request_start
+from workflows.request_start import RequestStart
+
+TASK_QUEUE = "test-request-start"
+
+
+async def start_environment():
+    try:
+        return await WorkflowEnvironment.start_time_skipping(data_converter=compact_data_converter())
+    except RuntimeError as e:
+        pytest.skip(f"Temporal test server unavailable: {e}")
+
+
+class TestRequestStartWorkflow:
+    """RequestStart is one long-lived workflow per Slack thread."""
+
+    def test_start_records_the_event_once(self):
+        starts = []
+
+        class RecordingClient:
+            async def start_workflow(self, workflow, arg, **kwargs):
+                starts.append((arg, kwargs))
+
+        event = RequestEvent(event_id="Ev1", channel="C1", text="help", ts="100.0")
+        asyncio.run(signal_with_start(RecordingClient(), "slack-thread-C1-100.0", event))
+
+        [(arg, kwargs)] = starts
+        assert arg == RequestEvent(event_id="Ev1")
+        assert kwargs["start_signal_args"][0].text == "help"
+
+    def test_follow_up_events_signal_the_thread_workflow(self):
+        sent = []
+        saved = []
+
+        @activity.defn(name="batch_update")
+        async def batch_update(updates: List[SlackUpdate]):
+            sent.extend((update.kind, update.emoji or update.text) for update in updates)
+            return {"success": True, "results": [{"success": True, "kind": u.kind, "timestamp": "200.0"}
+                                                 for u in updates]}
+
+        @activity.defn(name="save_request")
+        async def save_request(request: Request):
+            saved.append(request.updated_at)
+            return {"success": True, "id": request.id}
+
+        async def scenario():
+            env = await start_environment()
+            async with env:
+                async with Worker(env.client, task_queue=TASK_QUEUE, workflows=[RequestStart],
+                                  activities=[batch_update, save_request]):
+                    workflow_id = f"slack-thread-{uuid.uuid4().hex}"
+                    root = RequestEvent(event_id="Ev1", channel="C1", text="help", ts="100.0")
+                    reply = RequestEvent(event_id="Ev2", channel="C1", text="more", ts="101.0", thread_ts="100.0")
+
+                    handles = []
+                    for event in (root, root, reply):
+                        handles.append(await env.client.start_workflow(
+                            RequestStart.run, event, id=workflow_id, task_queue=TASK_QUEUE,
+                            start_signal="new_event", start_signal_args=[event],
+                        ))
+
+                    handle = handles[-1]
+                    for _ in range(50):
+                        request = await handle.query(RequestStart.get_request)
+                        if request and request.updated_at == "101.0" and saved[-1:] == ["101.0"]:
+                            break
+                        await asyncio.sleep(0.1)
+                    return request
+
+        request = asyncio.run(scenario())
+        assert request.id == "Ev1"
+        assert request.channel == "C1"
+        assert request.updated_at == "101.0"
+        assert sent == [("reaction", "eyes"), ("status", "Hello from workflow! Event: Ev1")]
+        assert saved[0] == "100.0" and saved[-1] == "101.0"
+
+
+class ContinuedAsNew(Exception):
+    def __init__(self, args):
+        super().__init__("continue-as-new")
+        self.args = args
+
+
+class FakeWorkflowRuntime:
+    """Stands in for ``temporalio.workflow`` so RequestStart's logic runs without a Temporal server.
+
+    ``signals`` are batches of events delivered one batch per wait; once they
+    run out the workflow's idle wait times out. ``during`` maps
+    ``(activity name, nth call)`` to events delivered while that call is in
+    flight. ``partial`` maps ``(local/remote, activity name)`` to a number of
+    updates a batch_update applies before failing every attempt.
+    """
+
+    def __init__(self, workflow, signals=(), history_length=0, failing=(), flaky=None, during=None, partial=None):
+        self.workflow = workflow
+        self.signals = list(signals)
+        self.during = dict(during or {})
+        self.calls = collections.Counter()
+        self.history_length = history_length
+        # (local/remote, activity name) pairs that fail every attempt, or only their first n
+        self.failing = set(failing)
+        self.flaky = dict(flaky or {})
+        self.partial = dict(partial or {})
+        self.workflow_id = "slack-thread-C1-100.0"
+        self.logger = logging.getLogger(__name__)
+        self.sent = []
+        self.saved = []
+        self.sleeps = []
+
+    async def execute_local_activity(self, name, args, **kwargs):
+        return self._execute("local", name, args)
+
+    async def execute_activity(self, name, args, task_queue=None, **kwargs):
+        return self._execute(task_queue, name, args)
+
+    def _execute(self, where, name, args):
+        self.calls[name] += 1
+        for event in self.during.pop((name, self.calls[name]), ()):
+            self.workflow.new_event(event)
+        if self.flaky.get((where, name)):
+            self.flaky[(where, name)] -= 1
+            self.failing.add((where, name))
+        elif (where, name) in self.flaky:
+            self.failing.discard((where, name))
+        if (where, name) in self.partial:
+            applied = self._apply(args[0][:self.partial.pop((where, name))])["results"]
+            raise self._failure(name) from ApplicationError("ratelimited", applied, type="SlackApiError")
+        if (where, name) in self.failing:
+            raise self._failure(name)
+        if name == "save_request":
+            self.saved.append(dataclasses.replace(args[0]))
+            return {"success": True, "id": args[0].id}
+        return self._apply(args[0])
+
+    @staticmethod
+    def _failure(name):
+        return ActivityError("activity failed", scheduled_event_id=1, started_event_id=2, identity="test",
+                             activity_type=name, activity_id="1", retry_state=None)
+
+    def _apply(self, updates):
+        self.sent.extend((update.kind, update.emoji or update.text) for update in updates)
+        return {"success": True, "results": [{"success": True, "kind": u.kind, "timestamp": "200.0"}
+                                             for u in updates]}
+
+    async def sleep(self, duration):
+        self.sleeps.append(duration)
+
+    async def wait_condition(self, condition, timeout=None):
+        while not condition():
+            if not self.signals:
+                raise TimeoutError
+            for event in self.signals.pop(0):
+                self.workflow.new_event(event)
+
+    def info(self):
+        return self
+
+    def is_continue_as_new_suggested(self):
+        return False
+
+    def get_current_history_length(self):
+        return self.history_length
+
+    def continue_as_new(self, args):
+        raise ContinuedAsNew(args)
+
+
+class TestRequestStartLogic:
+    """RequestStart's state handling, run against a fake workflow runtime."""
+
+    ROOT = RequestEvent(event_id="Ev1", channel="C1", text="help", ts="100.0")
+    REPLY = RequestEvent(event_id="Ev2", channel="C1", text="more", ts="101.0", thread_ts="100.0")
+
+    def run_workflow(self, monkeypatch, signals=(), **kwargs):
+        workflow = RequestStart()
+        runtime = FakeWorkflowRuntime(workflow, signals, **kwargs)
+        monkeypatch.setattr(request_start, "workflow", runtime)
+        # signal-with-start delivers the start event as a signal too
+        workflow.new_event(self.ROOT)
+        return workflow, runtime, asyncio.run(workflow.run(self.ROOT))
+
+    def test_acks_applies_follow_ups_and_closes_when_idle(self, monkeypatch):
+        workflow, runtime, result = self.run_workflow(monkeypatch, signals=[[self.REPLY, self.REPLY]])
+
+        assert result == {"status": "completed", "event_id": "Ev1", "request_id": "Ev1"}
+        assert runtime.sent == [
+            ("reaction", "eyes"),
+            ("status", "Hello from workflow! Event: Ev1"),
+            ("status", "Hello from workflow! Event: Ev1\nStatus: closed"),
+        ]
+        assert [(r.status, r.updated_at) for r in runtime.saved] == [
+            ("open", "100.0"), ("open", "101.0"), ("closed", "101.0"),
+        ]
+        assert workflow.seen_event_ids == ["Ev1", "Ev2"]
+        assert workflow.status_ts == "200.0"
+
+    def test_start_signal_supplies_the_event_for_a_key_only_input(self, monkeypatch):
+        workflow = RequestStart()
+        runtime = FakeWorkflowRuntime(workflow, signals=[[self.ROOT]])
+        monkeypatch.setattr(request_start, "workflow", runtime)
+
+        result = asyncio.run(workflow.run(RequestEvent(event_id="Ev1")))
+
+        assert result == {"status": "completed", "event_id": "Ev1", "request_id": "Ev1"}
+        assert workflow.request.channel == "C1"
+        assert runtime.sent[0] == ("reaction", "eyes")
+
+    def test_continues_as_new_with_its_state(self, monkeypatch):
+        with pytest.raises(ContinuedAsNew) as e:
+            self.run_workflow(monkeypatch, signals=[[self.REPLY]], history_length=request_start.MAX_HISTORY_LENGTH + 1)
+
+        event, request, seen_event_ids, status_ts, status_version = e.value.args
+        assert event == self.ROOT
+        assert request.updated_at == "101.0"
+        assert seen_event_ids == ["Ev1", "Ev2"]
+        assert (status_ts, status_version) == ("200.0", 1)
+
+    def test_signals_during_activities_are_applied_before_continuing_as_new(self, monkeypatch):
+        late = RequestEvent(event_id="Ev3", channel="C1", text="still there?", ts="102.0", thread_ts="100.0")
+        with pytest.raises(ContinuedAsNew) as e:
+            self.run_workflow(monkeypatch, signals=[[self.REPLY]], during={("save_request", 2): [late]},
+                              history_length=request_start.MAX_HISTORY_LENGTH + 1)
+
+        _, request, seen_event_ids, _, _ = e.value.args
+        assert request.updated_at == "102.0"
+        assert seen_event_ids == ["Ev1", "Ev2", "Ev3"]
+
+    def test_slack_updates_fall_back_to_the_ack_queue(self, monkeypatch):
+        _, runtime, result = self.run_workflow(monkeypatch, failing={("local", "batch_update")})
+
+        assert result["status"] == "completed"
+        assert runtime.sent[:2] == [("reaction", "eyes"), ("status", "Hello from workflow! Event: Ev1")]
+
+    def test_fallback_skips_updates_the_local_attempts_applied(self, monkeypatch):
+        workflow, runtime, _ = self.run_workflow(monkeypatch, partial={("local", "batch_update"): 1})
+
+        assert runtime.sent[:2] == [("reaction", "eyes"), ("status", "Hello from workflow! Event: Ev1")]
+        assert workflow.status_ts == "200.0"
+
+    def test_partly_applied_updates_are_reported_when_the_fallback_fails(self, monkeypatch):
+        queue = activity_task_queue("batch_update")
+        workflow = RequestStart()
+        runtime = FakeWorkflowRuntime(workflow, partial={("local", "batch_update"): 1, (queue, "batch_update"): 0})
+        monkeypatch.setattr(request_start, "workflow", runtime)
+        updates = [SlackUpdate(kind="reaction", channel="C1", ts="100.0", emoji="eyes"),
+                   SlackUpdate(kind="status", channel="C1", text="open")]
+
+        result = asyncio.run(workflow._update_slack(updates))
+
+        assert result == {"success": False, "results": [{"success": True, "kind": "reaction", "timestamp": "200.0"}]}
+        assert runtime.sent == [("reaction", "eyes")]
+
+    def test_failed_slack_updates_do_not_fail_the_request(self, monkeypatch):
+        failing = {("local", "batch_update"), (activity_task_queue("batch_update"), "batch_update")}
+        workflow, runtime, result = self.run_workflow(monkeypatch, failing=failing)
+
+        assert result["status"] == "completed"
+        assert runtime.sent == []
+        assert runtime.saved[-1].status == "closed"
+
+    def test_final_save_retries_on_the_activity_queue(self, monkeypatch):
+        _, runtime, result = self.run_workflow(monkeypatch, signals=[[self.REPLY]],
+                                               failing={("local", "save_request")})
+
+        assert result["status"] == "completed"
+        # Open states wait for the next change; the closed one has none, so it moves on
+        assert [r.status for r in runtime.saved] == ["closed"]
+
+    def test_closed_status_is_retried_with_backoff(self, monkeypatch):
+        queue = activity_task_queue("batch_update")
+        _, runtime, result = self.run_workflow(
+            monkeypatch, flaky={("local", "batch_update"): 3, (queue, "batch_update"): 2})
+
+        assert result["status"] == "completed"
+        assert runtime.sent == [("status", "Hello from workflow! Event: Ev1\nStatus: closed")]
+        assert runtime.sleeps == [request_start.CLOSE_STATUS_BACKOFF]
+
+    def test_closed_status_gives_up_after_its_attempts(self, monkeypatch):
+        failing = {("local", "batch_update"), (activity_task_queue("batch_update"), "batch_update")}
+        _, runtime, result = self.run_workflow(monkeypatch, failing=failing)
+
+        assert result["status"] == "completed"
+        assert len(runtime.sleeps) == request_start.CLOSE_STATUS_ATTEMPTS - 1
+        assert runtime.sleeps[-1] == request_start.CLOSE_STATUS_BACKOFF * 2 ** (request_start.CLOSE_STATUS_ATTEMPTS - 2)
@@ -0,0 +1,242 @@
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from temporalio import activity
+
+from utils.task_queues import ACTIVITY_GROUPS
+from utils.settings import get_settings
+from utils.metrics import (
+    ACTIVITY_POOL_LIMIT,
+    ACTIVITY_POOL_QUEUE_WAIT,
+    ACTIVITY_POOL_QUEUED,
+    ACTIVITY_POOL_SATURATED,
+    ACTIVITY_POOL_THREADS,
+)
+
+logger = logging.getLogger(__name__)
+
+# pool name -> (activity types, min threads, max threads). Activity types not
+# listed run in "default". One pool per activity group (utils/task_queues.py).
+DEFAULT_POOLS = {
+    "slack_write": (tuple(t for t, group in ACTIVITY_GROUPS.items() if group == "slack_write"), 2, 20),
+    "slack_read": (tuple(t for t, group in ACTIVITY_GROUPS.items() if group == "slack_read"), 1, 5),
+    "default": ((), 1, 5),
+}
+
+
+class ActivityPool:
+    """Bounded thread pool whose size follows queue wait and latency.
+
+    Threads start on demand up to ``limit``. Every ``adjust_interval`` the
+    limit grows (towards ``max_threads``) when tasks waited longer than
+    ``target_queue_wait`` for a thread, unless latency has more than doubled
+    against its baseline, which means the downstream is saturated and more
+    threads would only queue there instead; then it shrinks. Threads above
+    the limit exit after their current task, and idle ones after
+    ``idle_timeout``, down to ``min_threads``.
+    """
+
+    def __init__(self, name, min_threads=1, max_threads=10, target_queue_wait=0.05,
+                 idle_timeout=60.0, adjust_interval=1.0):
+        self.name = name
+        self.min_threads = min_threads
+        self.max_threads = max_threads
+        self.target_queue_wait = target_queue_wait
+        self.idle_timeout = idle_timeout
+        self.adjust_interval = adjust_interval
+        self.limit = min_threads
+        self.threads = 0
+        self.busy = 0
+        self.completed = 0
+        self.saturated = 0
+        self.latency_baseline = 0.0
+        self._idle = 0
+        self._queue = deque()
+        self._waits = []
+        self._latencies = []
+        self._last_adjust = time.monotonic()
+        self._shutdown = False
+        self._cond = threading.Condition()
+        ACTIVITY_POOL_LIMIT.labels(name).set(self.limit)
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        with self._cond:
+            if self._shutdown:
+                raise RuntimeError(f"Activity pool {self.name} is shut down")
+            self._queue.append((future, fn, args, kwargs, time.monotonic()))
+            ACTIVITY_POOL_QUEUED.labels(self.name).set(len(self._queue))
+            if self._idle:
+                self._cond.notify()
+            elif self.threads < self.limit:
+                self._spawn()
+            else:
+                self.saturated += 1
+                ACTIVITY_POOL_SATURATED.labels(self.name).inc()
+        return future
+
+    def _spawn(self):
+        self.threads += 1
+        ACTIVITY_POOL_THREADS.labels(self.name).set(self.threads)
+        threading.Thread(target=self._run, name=f"activity-{self.name}-{self.threads}", daemon=True).start()
+
+    def _exit(self):
+        self.threads -= 1
+        ACTIVITY_POOL_THREADS.labels(self.name).set(self.threads)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._queue and not self._shutdown:
+                    self._idle += 1
+                    notified = self._cond.wait(self.idle_timeout)
+                    self._idle -= 1
+                    if not notified and not self._queue and self.threads > self.min_threads:
+                        self._exit()
+                        return
+                if not self._queue or self.threads > self.limit:
+                    self._exit()
+                    return
+                future, fn, args, kwargs, enqueued = self._queue.popleft()
+                ACTIVITY_POOL_QUEUED.labels(self.name).set(len(self._queue))
+                self.busy += 1
+
+            started = time.monotonic()
+            ACTIVITY_POOL_QUEUE_WAIT.labels(self.name).observe(started - enqueued)
+            try:
+                if future.set_running_or_notify_cancel():
+                    try:
+                        future.set_result(fn(*args, **kwargs))
+                    except BaseException as e:
+                        future.set_exception(e)
+            finally:
+                with self._cond:
+                    self.busy -= 1
+                    self.completed += 1
+                    self._waits.append(started - enqueued)
+                    self._latencies.append(time.monotonic() - started)
+                    self._adjust()
+
+    def _adjust(self):
+        now = time.monotonic()
+        if now - self._last_adjust < self.adjust_interval or not self._latencies:
+            return
+        avg_wait = sum(self._waits) / len(self._waits)
+        avg_latency = sum(self._latencies) / len(self._latencies)
+        self._waits.clear()
+        self._latencies.clear()
+        self._last_adjust = now
+
+        if self.latency_baseline and avg_latency > 2 * self.latency_baseline:
+            self.limit = max(self.min_threads, int(self.limit * 0.75))
+        else:
+            self.latency_baseline = avg_latency if not self.latency_baseline else \
+                0.8 * self.latency_baseline + 0.2 * avg_latency
+            if avg_wait > self.target_queue_wait:
+                self.limit = min(self.max_threads, self.limit + max(1, self.limit // 2))
+        ACTIVITY_POOL_LIMIT.labels(self.name).set(self.limit)
+
+        # Start threads for work already queued behind the old limit
+        while self.threads < self.limit and len(self._queue) > self._idle:
+            self._spawn()
+
+    def shutdown(self, wait=True):
+        with self._cond:
+            self._shutdown = True
+            self._cond.notify_all()
+        while wait and self.threads:
+            time.sleep(0.01)
+
+    def stats(self):
+        with self._cond:
+            return {
+                "threads": self.threads,
+                "limit": self.limit,
+                "max_threads": self.max_threads,
+                "busy": self.busy,
+                "queued": len(self._queue),
+                "completed": self.completed,
+                "saturated": self.saturated,
+                "latency_baseline_seconds": round(self.latency_baseline, 4),
+            }
+
+
+class ActivityPoolExecutor(ThreadPoolExecutor):
+    """Activity executor that runs each activity type in its own ActivityPool.
+
+    A slow backlog of one activity type then queues in its own pool instead of
+    starving the others. Subclasses ThreadPoolExecutor because the Temporal
+    worker only passes context and payload converter instances to thread
+    executors; the base class's own threads are never started.
+
+    A worker accepts tasks before it knows their type, so one worker for
+    every type could fill all of its slots with tasks queued in a single
+    pool. Workers serve one activity group each instead, with
+    ``max_concurrency_for`` the group's types as ``max_concurrent_activities``.
+    """
+
+    def __init__(self, pools, routes, default_pool="default"):
+        self.pools = pools
+        self.routes = routes
+        self.default_pool = default_pool
+        super().__init__(max_workers=sum(pool.max_threads for pool in pools.values()))
+
+    @classmethod
+    def from_config(cls, config=None, settings=None, **pool_options):
+        """Build from ``{name: (activity types, min, max)}``; defaults to ACTIVITY_POOLS or DEFAULT_POOLS."""
+        if not config:
+            config = parse_pool_config((settings or get_settings()).activity_pools) or DEFAULT_POOLS
+        if "default" not in config:
+            config = {**config, "default": DEFAULT_POOLS["default"]}
+        pools = {}
+        routes = {}
+        for name, (activity_types, min_threads, max_threads) in config.items():
+            pools[name] = ActivityPool(name, min_threads=min_threads, max_threads=max_threads, **pool_options)
+            routes.update((activity_type, name) for activity_type in activity_types)
+        return cls(pools, routes)
+
+    def max_concurrency_for(self, activity_types):
+        """Tasks of ``activity_types`` the pools can run at once, at their maximum size."""
+        names = {self.routes.get(activity_type, self.default_pool) for activity_type in activity_types}
+        return sum(self.pools[name].max_threads for name in names)
+
+    def pool_for(self, args):
+        # The worker submits its sync activity runner with the activity's Info
+        # among the arguments.
+        info = next((arg for arg in args if isinstance(arg, activity.Info)), None)
+        name = self.routes.get(info.activity_type, self.default_pool) if info else self.default_pool
+        return self.pools[name]
+
+    def submit(self, fn, /, *args, **kwargs):
+        return self.pool_for(args).submit(fn, *args, **kwargs)
+
+    def shutdown(self, wait=True, *, cancel_futures=False):
+        for pool in self.pools.values():
+            pool.shutdown(wait=wait)
+        super().shutdown(wait=wait, cancel_futures=cancel_futures)
+
+    def stats(self):
+        return {name: pool.stats() for name, pool in self.pools.items()}
+
+
+def parse_pool_config(value):
+    """Parse ``name=type1,type2:min-max;...`` (as in ACTIVITY_POOLS) into a pool config."""
+    if not value:
+        return None
+    config = {}
+    for entry in value.split(";"):
+        entry = entry.strip()
+        if not entry:
+            continue
+        name, _, rest = entry.partition("=")
+        types, _, sizes = rest.rpartition(":")
+        min_threads, _, max_threads = sizes.partition("-")
+        config[name.strip()] = (
+            tuple(t.strip() for t in types.split(",") if t.strip()),
+            int(min_threads),
+            int(max_threads or min_threads),
+        )
+    return config
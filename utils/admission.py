@@ -0,0 +1,64 @@
+import threading
+import time
+
+from utils import metrics
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency limit for in-flight workflow starts in one process.
+
+    Each completed start reports its latency. Fast, successful starts while the
+    limit is being used grow it additively (about +1 per limit's worth of
+    calls); a start slower than ``target_latency`` or a failure shrinks it
+    multiplicatively, at most once per observed latency window so a single
+    slow burst doesn't collapse the limit. The limit is exported as a gauge;
+    the route exports the in-flight count and shed requests.
+    """
+
+    def __init__(self, initial_limit=20, min_limit=2, max_limit=200,
+                 target_latency=1.0, decrease_factor=0.7):
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.target_latency = target_latency
+        self.decrease_factor = decrease_factor
+        self.in_flight = 0
+        self.rejected = 0
+        self.latency_ewma = 0.0
+        self._last_decrease = 0.0
+        self._lock = threading.Lock()
+        metrics.WEBHOOK_ADMISSION_LIMIT.set(int(self.limit))
+
+    def try_acquire(self):
+        """Take a slot, or return False if the process is saturated."""
+        with self._lock:
+            if self.in_flight >= int(self.limit):
+                self.rejected += 1
+                return False
+            self.in_flight += 1
+            return True
+
+    def release(self, latency, failed=False):
+        """Return a slot and adapt the limit from the call's outcome."""
+        now = time.monotonic()
+        with self._lock:
+            utilised = self.in_flight >= int(self.limit) // 2
+            self.in_flight -= 1
+            self.latency_ewma = latency if not self.latency_ewma else 0.9 * self.latency_ewma + 0.1 * latency
+
+            if failed or latency > self.target_latency:
+                if now - self._last_decrease > latency:
+                    self.limit = max(self.min_limit, self.limit * self.decrease_factor)
+                    self._last_decrease = now
+            elif utilised:
+                self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+            metrics.WEBHOOK_ADMISSION_LIMIT.set(int(self.limit))
+
+    def stats(self):
+        with self._lock:
+            return {
+                "limit": int(self.limit),
+                "in_flight": self.in_flight,
+                "rejected": self.rejected,
+                "latency_ewma_seconds": round(self.latency_ewma, 4),
+            }
@@ -0,0 +1,192 @@
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+class RecentEvents:
+    """Bounded TTL/LRU set of recently seen Slack event_ids.
+
+    The in-memory set is per process. When ``shared_path`` is given, a SQLite
+    table behind it lets all gunicorn workers on the host see each other's
+    events, since Slack retries can land on a different worker.
+
+    ``add`` marks an event seen straight away. ``claim``/``complete``/``release``
+    separate an event that is still being handled from one that was: it only
+    counts as seen once ``complete`` is called, and a claim left behind by a
+    crashed attempt lapses after ``in_flight_ttl`` seconds. Expired rows of
+    the shared tables, and lapsed claims in memory, are pruned every
+    ``PRUNE_EVERY`` writes.
+    """
+
+    PRUNE_EVERY = 1000
+
+    def __init__(self, maxsize=10000, ttl=600.0, shared_path=None, in_flight_ttl=60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.in_flight_ttl = in_flight_ttl
+        self.shared_path = shared_path
+        self.hits = 0
+        self._seen = OrderedDict()
+        self._in_flight = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._claims = 0
+        self._shared_writes = 0
+
+        if shared_path:
+            self._conn().execute(
+                "CREATE TABLE IF NOT EXISTS seen_events (event_id TEXT PRIMARY KEY, seen_at REAL NOT NULL)"
+            )
+            self._conn().execute(
+                "CREATE TABLE IF NOT EXISTS in_flight_events (event_id TEXT PRIMARY KEY, started_at REAL NOT NULL)"
+            )
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.shared_path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def add(self, event_id):
+        """Record ``event_id``. Returns False if it was already seen within the TTL."""
+        now = time.monotonic()
+        with self._lock:
+            if self._is_seen(event_id, now):
+                self.hits += 1
+                return False
+            self._remember(event_id, now)
+
+        if self.shared_path and not self._add_shared(event_id):
+            with self._lock:
+                self.hits += 1
+            return False
+        return True
+
+    def _is_seen(self, event_id, now):
+        seen_at = self._seen.get(event_id)
+        if seen_at is not None and now - seen_at < self.ttl:
+            self._seen.move_to_end(event_id)
+            return True
+        return False
+
+    def _remember(self, event_id, now):
+        self._seen[event_id] = now
+        self._seen.move_to_end(event_id)
+        if len(self._seen) > self.maxsize:
+            self._seen.popitem(last=False)
+
+    def claim(self, event_id):
+        """Start handling ``event_id``.
+
+        Returns "new" (the caller must ``complete`` or ``release`` it), "seen"
+        (handled within the TTL) or "in_flight" (another attempt is still
+        handling it).
+        """
+        now = time.monotonic()
+        with self._lock:
+            if self._is_seen(event_id, now):
+                self.hits += 1
+                return "seen"
+            started_at = self._in_flight.get(event_id)
+            if started_at is not None and now - started_at < self.in_flight_ttl:
+                return "in_flight"
+            self._claims += 1
+            if self._claims % self.PRUNE_EVERY == 0:
+                self._prune_in_flight(now)
+            self._in_flight[event_id] = now
+
+        if self.shared_path:
+            state = self._claim_shared(event_id)
+            if state != "new":
+                with self._lock:
+                    self._in_flight.pop(event_id, None)
+                    if state == "seen":
+                        self.hits += 1
+                return state
+        return "new"
+
+    def _claim_shared(self, event_id):
+        now = time.time()
+        conn = self._conn()
+        if conn.execute(
+            "SELECT 1 FROM seen_events WHERE event_id = ? AND seen_at >= ?", (event_id, now - self.ttl)
+        ).fetchone():
+            return "seen"
+        claimed = conn.execute(
+            """
+            INSERT INTO in_flight_events (event_id, started_at) VALUES (?, ?)
+            ON CONFLICT (event_id) DO UPDATE SET started_at = excluded.started_at
+            WHERE in_flight_events.started_at < ?
+            """,
+            (event_id, now, now - self.in_flight_ttl),
+        ).rowcount == 1
+        self._maybe_prune_shared(conn, now)
+        return "new" if claimed else "in_flight"
+
+    def complete(self, event_id):
+        """Mark a claimed event handled; redeliveries are duplicates from now on."""
+        with self._lock:
+            self._in_flight.pop(event_id, None)
+            self._remember(event_id, time.monotonic())
+        if self.shared_path:
+            now = time.time()
+            conn = self._conn()
+            conn.execute(
+                """
+                INSERT INTO seen_events (event_id, seen_at) VALUES (?, ?)
+                ON CONFLICT (event_id) DO UPDATE SET seen_at = excluded.seen_at
+                """,
+                (event_id, now),
+            )
+            conn.execute("DELETE FROM in_flight_events WHERE event_id = ?", (event_id,))
+            self._maybe_prune_shared(conn, now)
+
+    def release(self, event_id):
+        """Give up a claim so Slack's next redelivery is handled again."""
+        with self._lock:
+            self._in_flight.pop(event_id, None)
+        if self.shared_path:
+            self._conn().execute("DELETE FROM in_flight_events WHERE event_id = ?", (event_id,))
+
+    def _add_shared(self, event_id):
+        now = time.time()
+        conn = self._conn()
+        inserted = conn.execute(
+            """
+            INSERT INTO seen_events (event_id, seen_at) VALUES (?, ?)
+            ON CONFLICT (event_id) DO UPDATE SET seen_at = excluded.seen_at
+            WHERE seen_events.seen_at < ?
+            """,
+            (event_id, now, now - self.ttl),
+        ).rowcount == 1
+
+        self._maybe_prune_shared(conn, now)
+        return inserted
+
+    def _maybe_prune_shared(self, conn, now):
+        with self._lock:
+            self._shared_writes += 1
+            due = self._shared_writes % self.PRUNE_EVERY == 0
+        if due:
+            conn.execute("DELETE FROM seen_events WHERE seen_at < ?", (now - self.ttl,))
+            conn.execute("DELETE FROM in_flight_events WHERE started_at < ?", (now - self.in_flight_ttl,))
+
+    def _prune_in_flight(self, now):
+        # Claims whose attempt crashed without complete() or release()
+        for event_id in [e for e, started_at in self._in_flight.items() if now - started_at >= self.in_flight_ttl]:
+            del self._in_flight[event_id]
+
+    def discard(self, event_id):
+        """Forget ``event_id`` so a redelivery is processed again (e.g. after a failed start)."""
+        with self._lock:
+            self._seen.pop(event_id, None)
+        if self.shared_path:
+            self._conn().execute("DELETE FROM seen_events WHERE event_id = ?", (event_id,))
+
+    def stats(self):
+        with self._lock:
+            return {"size": len(self._seen), "in_flight": len(self._in_flight), "duplicates": self.hits}
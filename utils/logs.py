@@ -0,0 +1,256 @@
+import atexit
+import itertools
+import json
+import logging
+import logging.handlers
+import os
+import queue
+
+TEXT_FORMAT = "%(asctime)s [%(levelname)s] %(message)s"
+
+# Keys whose values are message content or credentials; only their size is logged
+REDACTED_KEYS = frozenset({
+    "text", "blocks", "attachments", "files", "message", "previous_message",
+    "token", "authorization", "password", "secret", "client_secret", "api_key",
+})
+
+# LogRecord attributes; anything else on a record came from ``extra``
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+_listener = None
+_handler = None
+_saved_record_options = None
+
+
+def redact(value, max_chars=200, _depth=0):
+    """Copy of ``value`` with sensitive keys replaced by their size and long strings truncated."""
+    if isinstance(value, dict):
+        if _depth >= 4:
+            return f"<{len(value)} keys>"
+        return {
+            key: _redacted(item) if str(key).lower() in REDACTED_KEYS else redact(item, max_chars, _depth + 1)
+            for key, item in value.items()
+        }
+    if isinstance(value, (list, tuple)):
+        if _depth >= 4:
+            return f"<{len(value)} items>"
+        items = [redact(item, max_chars, _depth + 1) for item in value[:10]]
+        if len(value) > 10:
+            items.append(f"<+{len(value) - 10} items>")
+        return items
+    if isinstance(value, str) and len(value) > max_chars:
+        return f"{value[:max_chars]}...<+{len(value) - max_chars} chars>"
+    return value
+
+
+def _redacted(value):
+    # Only the size, and without serialising the value to measure it
+    if isinstance(value, str):
+        return f"<redacted {len(value)} chars>"
+    if isinstance(value, (dict, list, tuple)):
+        return f"<redacted {len(value)} items>"
+    return "<redacted>"
+
+
+class Payload:
+    """Log argument that redacts a payload only if the record is actually written.
+
+    ``logger.info("Received %s", Payload(body))`` costs one object on the
+    calling thread; the redaction and serialisation happen in the listener
+    thread, and not at all if the record is filtered out.
+    """
+
+    __slots__ = ("value", "max_chars")
+
+    def __init__(self, value, max_chars=None):
+        self.value = value
+        self.max_chars = max_chars
+
+    def redacted(self):
+        max_chars = self.max_chars or int(os.getenv("LOG_PAYLOAD_CHARS", 200))
+        return redact(self.value, max_chars)
+
+    def __str__(self):
+        return json.dumps(self.redacted(), default=str)
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record: time, level, logger, message, then ``extra`` fields."""
+
+    def format(self, record):
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key in record.__dict__.keys() - _RECORD_ATTRS:
+            if not key.startswith("_"):
+                value = record.__dict__[key]
+                entry[key] = value.redacted() if isinstance(value, Payload) else redact(value)
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Keep only a fraction of INFO and lower records from the configured loggers.
+
+    ``rates`` maps logger names to the fraction to keep; a name covers its
+    child loggers and the most specific name wins. Every ``1/rate``-th record
+    is kept rather than a random one, so output stays steady under load.
+    Warnings and errors are never sampled.
+    """
+
+    def __init__(self, rates):
+        super().__init__()
+        self.rates = dict(rates)
+        self._by_logger = {}
+        self._counters = {}
+
+    def _rate(self, name):
+        found = self._by_logger.get(name)
+        if found is None:
+            key = name
+            while key and key not in self.rates:
+                key = key.rpartition(".")[0]
+            found = self._by_logger[name] = (key, self.rates.get(key, 1.0))
+        return found
+
+    def filter(self, record):
+        if record.levelno > logging.INFO:
+            return True
+        key, rate = self._rate(record.name)
+        if rate >= 1.0:
+            return True
+        if rate <= 0.0:
+            return False
+        # next() on a shared count is atomic under the GIL, so no lock is needed
+        count = next(self._counters.setdefault(key, itertools.count()))
+        return int(count * rate) != int((count + 1) * rate)
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves formatting to the listener thread.
+
+    The stock handler formats every record before queueing it, which puts the
+    message (and any traceback) back on the calling thread. Records are queued
+    as-is instead, so arguments should not be mutated after they are logged.
+    Once ``maxsize`` records are waiting, new ones are dropped and counted
+    rather than blocking the caller.
+    """
+
+    def __init__(self, log_queue, maxsize=0):
+        super().__init__(log_queue)
+        self.maxsize = maxsize
+        self.dropped = 0
+
+    def prepare(self, record):
+        return record
+
+    def enqueue(self, record):
+        if self.maxsize and self.queue.qsize() >= self.maxsize:
+            self.dropped += 1
+            return
+        self.queue.put_nowait(record)
+
+
+class CoalescingStreamHandler(logging.StreamHandler):
+    """StreamHandler for the listener thread that flushes once it has caught up.
+
+    While records are still queued, writes stay in the stream's buffer, so a
+    burst costs one flush instead of one per record.
+    """
+
+    def __init__(self, log_queue, stream=None):
+        super().__init__(stream)
+        self.log_queue = log_queue
+
+    def flush(self):
+        if self.log_queue.empty():
+            super().flush()
+
+
+def parse_sample_rates(value):
+    """Parse ``"clients.slack=0.1,activities=0.5"`` into ``{"clients.slack": 0.1, ...}``."""
+    rates = {}
+    for item in (value or "").split(","):
+        if not item.strip():
+            continue
+        name, _, rate = item.partition("=")
+        rates[name.strip()] = float(rate)
+    return rates
+
+
+def configure_logging(level=None, json_output=None, sample_rates=None, queue_size=None, stream=None,
+                      caller_info=None):
+    """Route the root logger through a queue to a background writer thread.
+
+    Settings default to LOG_LEVEL (INFO), LOG_FORMAT ("json" or "text"),
+    LOG_SAMPLE (see ``parse_sample_rates``), LOG_QUEUE_SIZE and
+    LOG_CALLER_INFO. Record fields neither format prints (process names,
+    asyncio task names and, unless ``caller_info``, the calling file and line,
+    which costs a stack walk per record) are not collected. Calling it again
+    replaces the previous configuration. Returns the listener, which is also
+    stopped (flushing queued records) at exit.
+    """
+    global _listener, _handler, _saved_record_options
+
+    level = level or os.getenv("LOG_LEVEL", "INFO").upper()
+    if json_output is None:
+        json_output = os.getenv("LOG_FORMAT", "json").lower() == "json"
+    if sample_rates is None:
+        sample_rates = parse_sample_rates(os.getenv("LOG_SAMPLE", ""))
+    queue_size = queue_size if queue_size is not None else int(os.getenv("LOG_QUEUE_SIZE", 10000))
+    if caller_info is None:
+        caller_info = os.getenv("LOG_CALLER_INFO", "false").lower() == "true"
+
+    stop_logging()
+
+    _saved_record_options = (logging.logProcesses, logging.logMultiprocessing, logging.logAsyncioTasks,
+                             logging._srcfile)
+    logging.logProcesses = logging.logMultiprocessing = logging.logAsyncioTasks = False
+    if not caller_info:
+        logging._srcfile = None
+
+    log_queue = queue.SimpleQueue()
+    output = CoalescingStreamHandler(log_queue, stream)
+    if json_output:
+        output.setFormatter(JsonFormatter())
+    else:
+        output.setFormatter(logging.Formatter(TEXT_FORMAT))
+
+    _handler = DeferredQueueHandler(log_queue, maxsize=queue_size)
+    if sample_rates:
+        _handler.addFilter(SamplingFilter(sample_rates))
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(_handler)
+    root.setLevel(level)
+
+    _listener = logging.handlers.QueueListener(log_queue, output)
+    _listener.start()
+    return _listener
+
+
+def dropped_records():
+    """Records dropped because the queue was full since logging was configured."""
+    return _handler.dropped if _handler is not None else 0
+
+
+def stop_logging():
+    """Stop the background writer after it drains the queue."""
+    global _listener, _handler, _saved_record_options
+    if _listener is not None:
+        _listener.stop()
+        logging.getLogger().removeHandler(_handler)
+        _listener = _handler = None
+        (logging.logProcesses, logging.logMultiprocessing, logging.logAsyncioTasks,
+         logging._srcfile) = _saved_record_options
+
+
+atexit.register(stop_logging)
@@ -0,0 +1,224 @@
+import functools
+import inspect
+import os
+import time
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client import multiprocess
+
+# Set PROMETHEUS_MULTIPROC_DIR (an empty directory) before start-up when running
+# several gunicorn workers; every process then writes its samples there and
+# /metrics aggregates them.
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route.",
+    ["route", "method", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+
+TEMPORAL_CONNECT_DURATION = Histogram(
+    "temporal_client_connect_duration_seconds",
+    "Time spent in TemporalClient.get_client().",
+    buckets=LATENCY_BUCKETS,
+)
+
+TEMPORAL_START_DURATION = Histogram(
+    "temporal_workflow_start_duration_seconds",
+    "Latency of client.start_workflow by outcome.",
+    ["outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+
+TEMPORAL_START_ERRORS = Counter(
+    "temporal_workflow_start_errors_total",
+    "Failed workflow starts by exception type.",
+    ["error_type"],
+)
+
+WEBHOOK_SHED = Counter(
+    "webhook_shed_total",
+    "Webhooks rejected or diverted by admission control.",
+    ["action"],
+)
+
+WEBHOOK_REJECTED = Counter(
+    "webhook_rejected_total",
+    "Webhooks rejected before parsing, by reason.",
+    ["reason"],
+)
+
+WEBHOOK_IN_FLIGHT = Gauge(
+    "webhook_workflow_starts_in_flight",
+    "Workflow starts currently in flight.",
+    multiprocess_mode="livesum",
+)
+
+WEBHOOK_ADMISSION_LIMIT = Gauge(
+    "webhook_admission_limit",
+    "Adaptive limit on workflow starts in flight, summed over processes.",
+    multiprocess_mode="livesum",
+)
+
+# Workers sharing a spool file all see the same rows, so take the max, not the sum
+SPOOL_DEPTH = Gauge(
+    "webhook_spool_depth",
+    "Events in the webhook spool waiting to be started in Temporal.",
+    multiprocess_mode="livemax",
+)
+
+SPOOL_OLDEST_AGE = Gauge(
+    "webhook_spool_oldest_age_seconds",
+    "Age of the oldest event in the webhook spool.",
+    multiprocess_mode="livemax",
+)
+
+SOCKET_MODE_EVENTS = Counter(
+    "socket_mode_events_total",
+    "Socket Mode envelopes and workflow starts by outcome.",
+    ["outcome"],
+)
+
+SOCKET_MODE_QUEUED = Gauge(
+    "socket_mode_events_queued",
+    "Acknowledged Socket Mode events waiting for a workflow start.",
+    multiprocess_mode="livesum",
+)
+
+SOCKET_MODE_QUEUE_WAIT = Histogram(
+    "socket_mode_queue_wait_seconds",
+    "Time Socket Mode events waited between ack and workflow start.",
+    buckets=LATENCY_BUCKETS,
+)
+
+SLACK_STATUS_UPDATES = Counter(
+    "slack_status_updates_total",
+    "Request status message updates by outcome (posted, edited, coalesced, superseded, failed).",
+    ["outcome"],
+)
+
+# Rate-limit waits run from nothing to a minute or more behind a Retry-After
+WAIT_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+SLACK_DISPATCH_WAITING = Gauge(
+    "slack_dispatch_calls_waiting",
+    "Slack API calls waiting for a rate-limit slot.",
+    multiprocess_mode="livesum",
+)
+
+SLACK_DISPATCH_WAIT = Histogram(
+    "slack_dispatch_wait_seconds",
+    "Time Slack API calls were held back by the rate limiter, by method.",
+    ["method"],
+    buckets=WAIT_BUCKETS,
+)
+
+SLACK_RATE_LIMITED = Counter(
+    "slack_rate_limited_total",
+    "Slack API calls answered with ratelimited, by method.",
+    ["method"],
+)
+
+SLACK_USER_CACHE_LOOKUPS = Counter(
+    "slack_user_cache_lookups_total",
+    "Slack user directory lookups by outcome (hit, negative_hit, miss).",
+    ["outcome"],
+)
+
+ACTIVITY_DURATION = Histogram(
+    "activity_duration_seconds",
+    "Activity execution time by activity and outcome.",
+    ["activity", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+
+ACTIVITY_POOL_THREADS = Gauge(
+    "activity_pool_threads",
+    "Threads running in each sync activity pool.",
+    ["pool"],
+)
+
+ACTIVITY_POOL_LIMIT = Gauge(
+    "activity_pool_limit",
+    "Current autoscaled thread limit of each sync activity pool.",
+    ["pool"],
+)
+
+ACTIVITY_POOL_QUEUED = Gauge(
+    "activity_pool_queued",
+    "Activities waiting for a thread in each sync activity pool.",
+    ["pool"],
+)
+
+ACTIVITY_POOL_QUEUE_WAIT = Histogram(
+    "activity_pool_queue_wait_seconds",
+    "Time activities waited for a pool thread.",
+    ["pool"],
+    buckets=LATENCY_BUCKETS,
+)
+
+ACTIVITY_POOL_SATURATED = Counter(
+    "activity_pool_saturated_total",
+    "Activities queued because their pool was at its limit.",
+    ["pool"],
+)
+
+
+def render_metrics():
+    """Return ``(body, content_type)`` for a Prometheus scrape."""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def _outcome(result):
+    if isinstance(result, dict) and result.get("success") is False:
+        return "failure"
+    return "success"
+
+
+def timed_activity(func):
+    """Record duration and outcome of an activity in ``activity_duration_seconds``.
+
+    Activities that report ``{"success": False}`` count as failures as well as
+    ones that raise. Apply beneath ``@activity.defn``.
+    """
+    name = func.__name__
+
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            outcome = "error"
+            try:
+                result = await func(*args, **kwargs)
+                outcome = _outcome(result)
+                return result
+            finally:
+                ACTIVITY_DURATION.labels(name, outcome).observe(time.perf_counter() - started)
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            result = func(*args, **kwargs)
+            outcome = _outcome(result)
+            return result
+        finally:
+            ACTIVITY_DURATION.labels(name, outcome).observe(time.perf_counter() - started)
+    return wrapper
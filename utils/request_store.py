@@ -0,0 +1,136 @@
+import base64
+import sqlite3
+import threading
+from dataclasses import fields
+
+from models.request import Request
+
+COLUMNS = tuple(f.name for f in fields(Request))
+
+# Filters accepted by RequestStore.query, each backed by an index
+FILTERS = ("status", "component", "assignee_email", "reporter_email")
+
+MAX_PAGE_SIZE = 200
+
+
+class RequestStore:
+    """Indexed SQLite copy of every request's latest state.
+
+    Workflows write through the ``save_request`` activity on each state
+    change; dashboards and Slack home tabs list requests from here instead of
+    querying workflows one by one. Each filter has an index ending in
+    ``created_at, id``, so a filtered page is an index range scan, and pages
+    are keyset-paginated so page 1000 costs the same as page 1.
+
+    Each worker writes through its own local file, and SQLite's WAL mode
+    doesn't work over network filesystems, so the web tier and every worker
+    must run on a single host. With workers on several hosts, each file only
+    holds the requests whose workflows ran on that host.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS requests (
+                id TEXT PRIMARY KEY,
+                request_type TEXT NOT NULL,
+                status TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL,
+                reporter_email TEXT NOT NULL,
+                assignee_email TEXT NOT NULL,
+                component TEXT NOT NULL,
+                channel TEXT NOT NULL,
+                message TEXT NOT NULL
+            ) WITHOUT ROWID
+            """
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS requests_created ON requests (created_at, id)")
+        for column in FILTERS:
+            conn.execute(
+                f"CREATE INDEX IF NOT EXISTS requests_{column} ON requests ({column}, created_at, id)"
+            )
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10.0, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def save(self, request):
+        """Insert or replace a request's state."""
+        self.save_many([request])
+
+    def save_many(self, requests):
+        conn = self._conn()
+        conn.execute("BEGIN")
+        try:
+            conn.executemany(
+                f"INSERT OR REPLACE INTO requests ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})",
+                ([getattr(request, column) for column in COLUMNS] for request in requests),
+            )
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def get(self, request_id):
+        row = self._conn().execute(
+            f"SELECT {', '.join(COLUMNS)} FROM requests WHERE id = ?", (request_id,)
+        ).fetchone()
+        return Request(*row) if row else None
+
+    def query(self, limit=50, cursor=None, **filters):
+        """Newest requests first, matching every given filter.
+
+        Returns ``(requests, next_cursor)``; pass ``next_cursor`` back for the
+        following page. It is None on the last page.
+        """
+        unknown = set(filters) - set(FILTERS)
+        if unknown:
+            raise ValueError(f"Unknown request filters: {', '.join(sorted(unknown))}")
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+        clauses = []
+        params = []
+        for column, value in filters.items():
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if cursor:
+            clauses.append("(created_at, id) < (?, ?)")
+            params.extend(decode_cursor(cursor))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        rows = self._conn().execute(
+            f"SELECT {', '.join(COLUMNS)} FROM requests {where} ORDER BY created_at DESC, id DESC LIMIT ?",
+            (*params, limit + 1),
+        ).fetchall()
+        requests = [Request(*row) for row in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            last = requests[-1]
+            next_cursor = encode_cursor(last.created_at, last.id)
+        return requests, next_cursor
+
+    def count(self):
+        return self._conn().execute("SELECT COUNT(*) FROM requests").fetchone()[0]
+
+
+def encode_cursor(created_at, request_id):
+    return base64.urlsafe_b64encode(f"{created_at}\n{request_id}".encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        created_at, request_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("\n", 1)
+    except ValueError:
+        raise ValueError("Invalid cursor") from None
+    return created_at, request_id
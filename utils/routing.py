@@ -0,0 +1,252 @@
+import json
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, replace
+
+from utils.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ROUTE_CHANNEL = "#tmp-rohan-test"
+
+_WORD = re.compile(r"[a-z0-9_'-]+")
+_EMOJI = re.compile(r":([a-z0-9_+-]+):")
+
+
+@dataclass(frozen=True)
+class Route:
+    component: str = ""
+    request_type: str = ""
+    channel: str = DEFAULT_ROUTE_CHANNEL
+    rule: str = ""
+
+
+class CompiledRules:
+    """Routing rules compiled into lookup tables.
+
+    Keyword phrases are indexed by their lower-cased words and found by
+    hashing every 1..N-word window of the message (N being the longest
+    phrase), emoji by name, and channel-only rules by channel. Phrases and
+    emoji are keyed by ``(key, channel)``, with None for rules without
+    channels, and each key keeps only its best rule, so every window costs
+    two lookups and a lookup grows with the message, not the number of
+    rules. Regexes are
+    combined into alternations, highest priority first: one for rules without
+    channels and one per channel for the rules scoped to it, so a scoped
+    regex never hides an unscoped one. Keep them few, since each alternative
+    is still tried at every position.
+
+    A rule matches when any of its keywords, regexes or emoji does, and only
+    in its ``channels`` if it lists any; a rule with only channels matches
+    every message there. The highest ``priority`` wins, then rules that
+    matched the content over channel-only ones, then file order.
+    """
+
+    def __init__(self, config):
+        default = config.get("default", {})
+        self.default = Route(
+            component=default.get("component", ""),
+            request_type=default.get("request_type", ""),
+            channel=default.get("channel", DEFAULT_ROUTE_CHANNEL),
+        )
+        self.routes = []
+        self.ranks = []
+        self.channels = []
+        self.phrases = {}
+        self.emoji = {}
+        self.channel_rules = {}
+        self.max_phrase_words = 0
+        regexes = []
+        scoped_regexes = {}
+
+        for order, rule in enumerate(config.get("rules", [])):
+            index = len(self.routes)
+            self.routes.append(Route(
+                component=rule.get("component", self.default.component),
+                request_type=rule.get("request_type", self.default.request_type),
+                channel=rule.get("channel", self.default.channel),
+                rule=rule.get("name", f"rule-{order}"),
+            ))
+            channel_only = not any(rule.get(key) for key in ("keywords", "emoji", "regex"))
+            self.ranks.append((-rule.get("priority", 0), channel_only, order))
+            self.channels.append(frozenset(rule.get("channels", ())))
+
+            scopes = self.channels[index] or (None,)
+            for keyword in rule.get("keywords", ()):
+                words = tuple(_WORD.findall(keyword.lower()))
+                if words:
+                    for scope in scopes:
+                        self._index(self.phrases, (" ".join(words), scope), index)
+                    self.max_phrase_words = max(self.max_phrase_words, len(words))
+            for name in rule.get("emoji", ()):
+                for scope in scopes:
+                    self._index(self.emoji, (name.strip(":").lower(), scope), index)
+            for pattern in rule.get("regex", ()):
+                re.compile(pattern)  # fail on the rule itself rather than the combined pattern
+                if self.channels[index]:
+                    for channel in self.channels[index]:
+                        scoped_regexes.setdefault(channel, []).append((self.ranks[index], index, pattern))
+                else:
+                    regexes.append((self.ranks[index], index, pattern))
+            if channel_only:
+                for channel in self.channels[index]:
+                    self._index(self.channel_rules, channel, index)
+
+        self.regex = self._alternation(regexes)
+        self.channel_regexes = {channel: self._alternation(group) for channel, group in scoped_regexes.items()}
+
+    @staticmethod
+    def _alternation(regexes):
+        """``(pattern, rule index per group name)`` for regexes ordered best rule first, or None."""
+        if not regexes:
+            return None
+        regexes = sorted(regexes)
+        rules = {f"r{i}": index for i, (_, index, _) in enumerate(regexes)}
+        return re.compile(
+            "|".join(f"(?P<r{i}>{pattern})" for i, (_, _, pattern) in enumerate(regexes)), re.IGNORECASE
+        ), rules
+
+    @staticmethod
+    def _search(alternation, text):
+        """The best rule whose regex matches anywhere in ``text``.
+
+        At any one position the alternation reports its best matching
+        alternative, but a match consumes its text, so a better rule starting
+        inside it would be skipped. Searching again from the position after
+        each match's start tries every position once, as finditer does, and
+        stops as soon as the best rule of the group has matched.
+        """
+        pattern, rules = alternation
+        best = None
+        pos = 0
+        while pos <= len(text):
+            match = pattern.search(text, pos)
+            if match is None:
+                break
+            order = int(match.lastgroup[1:])
+            if best is None or order < best:
+                best = order
+                if best == 0:
+                    break
+            pos = match.start() + 1
+        return None if best is None else rules[f"r{best}"]
+
+    def _index(self, table, key, index):
+        # Only the best rule for a key can win, so keep just that one
+        current = table.get(key)
+        if current is None or self.ranks[index] < self.ranks[current]:
+            table[key] = index
+
+    @staticmethod
+    def _lookup(table, key, channel, found):
+        for scope in (None, channel):
+            index = table.get((key, scope))
+            if index is not None:
+                found.add(index)
+
+    def candidates(self, channel, text, reaction=""):
+        found = set()
+        if channel in self.channel_rules:
+            found.add(self.channel_rules[channel])
+
+        lowered = text.lower()
+        if self.phrases:
+            words = _WORD.findall(lowered)
+            for start in range(len(words)):
+                for end in range(start + 1, min(len(words), start + self.max_phrase_words) + 1):
+                    self._lookup(self.phrases, " ".join(words[start:end]), channel, found)
+        if self.emoji:
+            for name in _EMOJI.findall(lowered) + ([reaction.lower()] if reaction else []):
+                self._lookup(self.emoji, name, channel, found)
+        for alternation in (self.regex, self.channel_regexes.get(channel)):
+            if alternation is not None:
+                index = self._search(alternation, text)
+                if index is not None:
+                    found.add(index)
+        return found
+
+    def classify(self, channel, text, reaction=""):
+        """Best route for a message, or the default route."""
+        best = None
+        for index in self.candidates(channel, text, reaction):
+            if self.channels[index] and channel not in self.channels[index]:
+                continue
+            if best is None or self.ranks[index] < self.ranks[best]:
+                best = index
+        return self.default if best is None else self.routes[best]
+
+
+class RoutingEngine:
+    """Classifies requests with rules from a JSON file, reloaded when it changes.
+
+    The file's modification time is checked at most every ``reload_interval``
+    seconds. A file that fails to load or compile leaves the previous rules in
+    place.
+    """
+
+    _instance = None
+
+    def __init__(self, path=None, reload_interval=5.0):
+        self.path = path
+        self.reload_interval = reload_interval
+        self.reloads = 0
+        self.rules = CompiledRules({})
+        self._mtime = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        if path:
+            self.reload()
+
+    @classmethod
+    def get_engine(cls, settings=None):
+        """Get the process-wide routing engine for ROUTING_RULES_PATH."""
+        if cls._instance is None:
+            settings = settings or get_settings()
+            cls._instance = cls(path=settings.routing_rules_path, reload_interval=settings.routing_reload_interval)
+        return cls._instance
+
+    def reload(self, force=False):
+        """Recompile the rules if the file changed. Returns True if they were replaced."""
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return False
+        if mtime == self._mtime and not force:
+            return False
+        try:
+            with open(self.path) as f:
+                rules = CompiledRules(json.load(f))
+        except Exception as e:
+            logger.error("Keeping previous routing rules; failed to load %s: %s", self.path, e)
+            self._mtime = mtime
+            return False
+        self.rules = rules
+        self._mtime = mtime
+        self.reloads += 1
+        logger.info("Loaded %s routing rules from %s", len(rules.routes), self.path)
+        return True
+
+    def _maybe_reload(self):
+        now = time.monotonic()
+        if not self.path or now - self._checked_at < self.reload_interval:
+            return
+        # One thread checks; the others keep using the current rules
+        if self._lock.acquire(blocking=False):
+            try:
+                self._checked_at = now
+                self.reload()
+            finally:
+                self._lock.release()
+
+    def classify(self, channel, text, reaction=""):
+        self._maybe_reload()
+        return self.rules.classify(channel, text, reaction)
+
+    def route(self, event):
+        """Return ``event`` with its component, request_type and route_channel filled in."""
+        route = self.classify(event.channel, event.text, event.reaction)
+        return replace(event, component=route.component, request_type=route.request_type,
+                       route_channel=route.channel)
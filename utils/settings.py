@@ -0,0 +1,158 @@
+import os
+import threading
+import typing
+from dataclasses import dataclass, field, fields
+from typing import Optional, Tuple
+
+ENV_FILES = (".env.shared", ".env.secret")
+
+_settings = None
+_env_loaded = False
+_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Process configuration read once from the environment and the .env files.
+
+    Each field comes from the environment variable of the same name, upper-cased,
+    unless its ``env`` metadata names others; a tuple field collects every one
+    of its variables that is set, any other field takes the first one set.
+    Still read straight from the environment, after the entry point has
+    loaded the .env files: the task queue names (imported by workflow code in
+    the sandbox), the worker profile, logging, and the ports and binds of the
+    process launchers.
+    """
+
+    # Temporal
+    temporal_address: str = "localhost:7233"
+    temporal_namespace: str = "default"
+    temporal_api_key: Optional[str] = None
+    temporal_compression_threshold: int = 1024
+
+    # Slack
+    slack_bot_token: Optional[str] = None
+    slack_app_token: Optional[str] = None
+    slack_api_url: str = "https://www.slack.com/api/"
+    slack_max_in_flight: int = 100
+    # Minimum seconds between edits of one request's status message
+    slack_status_window: float = 1.0
+    # The current secret first; the previous one stays valid during a rotation
+    slack_signing_secrets: Tuple[str, ...] = field(
+        default=(), metadata={"env": ("SLACK_SIGNING_SECRET", "SLACK_SIGNING_SECRET_PREVIOUS")}
+    )
+    slack_signature_max_age: int = 300
+    # Worker-side cache of users looked up by email (see SlackUserDirectory)
+    slack_user_cache_ttl: float = 3600.0
+    slack_user_cache_negative_ttl: float = 300.0
+    slack_user_cache_path: Optional[str] = None
+
+    # Webhook intake ("direct" or "spool", see create_app)
+    webhook_intake_mode: str = "direct"
+    webhook_dedup_size: int = 10000
+    webhook_dedup_ttl: float = 600.0
+    webhook_dedup_path: Optional[str] = None
+    webhook_spool_path: str = "webhook_spool.db"
+    webhook_spool_batch_size: int = 50
+    webhook_admission_limit: int = 20
+    webhook_admission_max_limit: int = 200
+    webhook_admission_target_latency: float = 1.0
+    webhook_retry_after: str = "1"
+    webhook_overflow_spool: bool = False
+
+    # Socket Mode intake (socket_worker.py); the spool defaults to webhook_spool_path
+    socket_mode_spool_path: Optional[str] = None
+    socket_mode_queue_size: int = 1000
+    socket_mode_concurrency: int = 16
+    socket_mode_start_retries: int = 3
+
+    routing_rules_path: str = "routing_rules.json"
+    routing_reload_interval: float = 5.0
+
+    # Worker ("async" Slack activities on the event loop, or "sync" on thread pools)
+    slack_activity_mode: str = "async"
+    slack_user_directory_warm: bool = False
+    slack_user_directory_refresh_seconds: float = 3600.0
+    # WORKER_ACK_QUEUE is the variable's old name
+    worker_activity_queues: bool = field(
+        default=True, metadata={"env": ("WORKER_ACTIVITY_QUEUES", "WORKER_ACK_QUEUE")}
+    )
+    # Sync activity thread pools (see parse_pool_config)
+    activity_pools: Optional[str] = None
+
+    # Jira; ticket creation is enabled by setting jira_url
+    jira_url: Optional[str] = None
+    jira_email: Optional[str] = None
+    jira_api_token: Optional[str] = None
+    jira_project_key: str = "TEST"
+    jira_max_in_flight: int = 20
+    jira_bulk_window_ms: float = 50.0
+
+    # PagerDuty; on-call lookups are enabled by setting pagerduty_schedules
+    pagerduty_api_token: Optional[str] = None
+    pagerduty_api_url: str = "https://api.pagerduty.com"
+    pagerduty_max_in_flight: int = 10
+    pagerduty_schedules: Optional[str] = None
+    pagerduty_oncall_window_hours: float = 168.0
+    pagerduty_oncall_snapshot_path: Optional[str] = None
+    pagerduty_oncall_refresh_seconds: float = 900.0
+
+    identity_cache_ttl: float = 3600.0
+    identity_cache_negative_ttl: float = 300.0
+
+    # Indexed copy of request state for listing (see utils/request_store.py); the
+    # web tier and all workers must run on the host that holds this file
+    request_store_path: str = "requests.db"
+
+    @classmethod
+    def from_env(cls, environ=None):
+        """Build settings from ``environ`` (default ``os.environ``); unset variables keep their defaults."""
+        environ = os.environ if environ is None else environ
+        hints = typing.get_type_hints(cls)
+        values = {}
+        for f in fields(cls):
+            names = f.metadata.get("env") or (f.name.upper(),)
+            if typing.get_origin(hints[f.name]) is tuple:
+                values[f.name] = tuple(environ[name] for name in names if environ.get(name))
+                continue
+            raw = next((environ[name] for name in names if environ.get(name)), None)
+            if raw is None:
+                continue
+            values[f.name] = _parse(hints[f.name], raw)
+        return cls(**values)
+
+
+def _parse(hint, raw):
+    if hint is bool:
+        return raw.strip().lower() in ("1", "true", "yes", "on")
+    if hint is int:
+        return int(raw)
+    if hint is float:
+        return float(raw)
+    return raw
+
+
+def load_env_files(paths=ENV_FILES):
+    """Load the .env files into ``os.environ``, once per process.
+
+    The first file doesn't override variables already set; later ones (the
+    secrets) do, as before.
+    """
+    global _env_loaded
+    with _lock:
+        if _env_loaded:
+            return
+        from dotenv import load_dotenv
+
+        for index, path in enumerate(paths):
+            load_dotenv(path, override=index > 0)
+        _env_loaded = True
+
+
+def get_settings():
+    """The process-wide settings, loaded on first use."""
+    global _settings
+    if _settings is None:
+        load_env_files()
+        _settings = Settings.from_env()
+    return _settings
@@ -0,0 +1,225 @@
+import asyncio
+import json
+import logging
+import random
+import sqlite3
+import threading
+import time
+
+from utils import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class WebhookSpool:
+    """Durable on-disk queue of webhook events waiting to be started in Temporal.
+
+    Backed by SQLite in WAL mode with ``synchronous=FULL`` so an ``append`` is
+    on disk before the webhook is acknowledged. Rows are claimed with a lease:
+    if the forwarding process dies, the lease expires and the rows are replayed.
+    An event isn't handed out while an earlier one for the same workflow is
+    leased or backing off, so a thread's events start in the order they came.
+    The file may be shared by several gunicorn workers.
+    """
+
+    def __init__(self, path, lease_seconds=30.0):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self._local = threading.local()
+        self._wake = threading.Event()
+
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS spool (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                workflow_id TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                enqueued_at REAL NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt_at REAL NOT NULL DEFAULT 0,
+                last_error TEXT
+            )
+            """
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS spool_next_attempt ON spool (next_attempt_at)")
+        conn.execute("CREATE INDEX IF NOT EXISTS spool_workflow ON spool (workflow_id, id)")
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10.0, isolation_level=None)
+            conn.execute("PRAGMA synchronous=FULL")
+            self._local.conn = conn
+        return conn
+
+    def append(self, workflow_id, payload):
+        """Persist an event. Returns once the row is durable."""
+        self._conn().execute(
+            "INSERT INTO spool (workflow_id, payload, enqueued_at) VALUES (?, ?, ?)",
+            (workflow_id, json.dumps(payload), time.time()),
+        )
+        self._wake.set()
+
+    def claim(self, limit):
+        """Lease up to ``limit`` due events as ``(id, workflow_id, payload, attempts)`` tuples."""
+        now = time.time()
+        rows = self._conn().execute(
+            """
+            UPDATE spool SET next_attempt_at = ?
+            WHERE id IN (
+                SELECT id FROM spool AS due WHERE next_attempt_at <= ? AND NOT EXISTS (
+                    SELECT 1 FROM spool AS earlier
+                    WHERE earlier.workflow_id = due.workflow_id AND earlier.id < due.id
+                    AND earlier.next_attempt_at > ?
+                )
+                ORDER BY id LIMIT ?
+            )
+            RETURNING id, workflow_id, payload, attempts
+            """,
+            (now + self.lease_seconds, now, now, limit),
+        ).fetchall()
+        return [(row_id, workflow_id, json.loads(payload), attempts)
+                for row_id, workflow_id, payload, attempts in sorted(rows)]
+
+    def ack(self, row_ids):
+        """Remove events that were handed to Temporal."""
+        if not row_ids:
+            return
+        placeholders = ",".join("?" * len(row_ids))
+        self._conn().execute(f"DELETE FROM spool WHERE id IN ({placeholders})", list(row_ids))
+
+    def retry(self, row_id, delay, error):
+        """Release an event to be retried after ``delay`` seconds."""
+        self._conn().execute(
+            "UPDATE spool SET attempts = attempts + 1, next_attempt_at = ?, last_error = ? WHERE id = ?",
+            (time.time() + delay, error, row_id),
+        )
+
+    def release(self, row_ids):
+        """Hand leased events back without counting an attempt."""
+        if not row_ids:
+            return
+        placeholders = ",".join("?" * len(row_ids))
+        self._conn().execute(f"UPDATE spool SET next_attempt_at = 0 WHERE id IN ({placeholders})", list(row_ids))
+
+    def wait(self, timeout):
+        """Block until an event is appended in this process or ``timeout`` elapses."""
+        woken = self._wake.wait(timeout)
+        self._wake.clear()
+        return woken
+
+    def stats(self):
+        depth, oldest, max_attempts = self._conn().execute(
+            "SELECT COUNT(*), MIN(enqueued_at), MAX(attempts) FROM spool"
+        ).fetchone()
+        return {
+            "depth": depth,
+            "oldest_age_seconds": round(time.time() - oldest, 3) if oldest is not None else 0.0,
+            "max_attempts": max_attempts or 0,
+        }
+
+
+class SpoolForwarder:
+    """Background thread draining a WebhookSpool into Temporal.
+
+    The thread owns a single event loop for its whole life, so the Temporal
+    client it uses is connected once and reused across batches. Events for
+    different workflows start concurrently; a workflow's own events start
+    one after another, and stop at the first failure so none overtakes it.
+    """
+
+    def __init__(self, spool, start_workflow, batch_size=50, poll_interval=1.0,
+                 base_backoff=0.5, max_backoff=60.0):
+        self.spool = spool
+        self.start_workflow = start_workflow
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.forwarded = 0
+        self.failures = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="spool-forwarder", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=5.0):
+        self._stop.set()
+        self.spool._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def backoff(self, attempts):
+        delay = min(self.max_backoff, self.base_backoff * (2 ** attempts))
+        return delay * random.uniform(0.5, 1.0)
+
+    def _run(self):
+        loop = asyncio.new_event_loop()
+        try:
+            while not self._stop.is_set():
+                try:
+                    drained = loop.run_until_complete(self.forward_batch())
+                except Exception as e:
+                    logger.error("Spool forwarder error: %s", e)
+                    drained = 0
+                if drained < self.batch_size:
+                    self.spool.wait(self.poll_interval)
+        finally:
+            loop.close()
+
+    async def forward_batch(self):
+        """Forward one batch of due events. Returns the number of events claimed."""
+        self._export_stats()
+        batch = self.spool.claim(self.batch_size)
+        if not batch:
+            return 0
+
+        # claim() returns rows by id, so each workflow's events are in order
+        threads = {}
+        for row in batch:
+            threads.setdefault(row[1], []).append(row)
+        started = await asyncio.gather(*(self._forward_thread(rows) for rows in threads.values()))
+
+        done = [row_id for row_ids in started for row_id in row_ids]
+        self.spool.ack(done)
+        self.forwarded += len(done)
+        return len(batch)
+
+    async def _forward_thread(self, rows):
+        """Start one workflow's events in order, backing off from the first failure.
+
+        Returns the ids of the events that were started.
+        """
+        done = []
+        for index, (row_id, workflow_id, payload, attempts) in enumerate(rows):
+            try:
+                await self.start_workflow(workflow_id, payload)
+            except Exception as e:
+                self.failures += 1
+                delay = self.backoff(attempts)
+                logger.warning("Failed to forward %s (attempt %s), retrying in %.1fs: %s",
+                               workflow_id, attempts + 1, delay, e)
+                self.spool.retry(row_id, delay, str(e))
+                # Held back by the failed event until it is due again
+                self.spool.release([row[0] for row in rows[index + 1:]])
+                break
+            done.append(row_id)
+        return done
+
+    def _export_stats(self):
+        stats = self.spool.stats()
+        metrics.SPOOL_DEPTH.set(stats["depth"])
+        metrics.SPOOL_OLDEST_AGE.set(stats["oldest_age_seconds"])
+
+    def stats(self):
+        return {
+            **self.spool.stats(),
+            "forwarded": self.forwarded,
+            "failures": self.failures,
+        }
@@ -0,0 +1,95 @@
+import os
+import zlib
+
+# Task queue names shared by the webhook, the worker and the workflows.
+#
+# With TASK_QUEUE_SHARDS > 1, requests are spread over "<TASK_QUEUE>-<n>" by a
+# stable hash of their channel, so each channel always lands on the same shard
+# (keeping its ordering) and a flooded channel only backs up its own shard.
+# A workflow keeps the queue it started on, including across continue-as-new,
+# so after changing the shard count keep workers on the old queues until
+# their workflows finish.
+TASK_QUEUE = os.getenv("TASK_QUEUE", "slack-webhook-task-queue")
+TASK_QUEUE_SHARDS = int(os.getenv("TASK_QUEUE_SHARDS", 1))
+
+# Activity-only queue for Slack writes that run as regular activities. A
+# request's first acknowledgement runs as a local activity on its shard's
+# worker, which is the fastest path but not isolated from a busy shard; only
+# updates whose local attempts failed come here, where their retries neither
+# hold the shard's workflow task nor queue behind its local activities.
+# Isolation between channels comes from the shards, not from this queue.
+ACK_TASK_QUEUE = os.getenv("ACK_TASK_QUEUE", f"{TASK_QUEUE}-ack")
+
+# Workflows run activities remotely on an activity-only queue per group. Each
+# queue's workers have as many slots as the group's thread pool, so a backlog
+# in one group (say user lookups) never holds the slots another group (Slack
+# posts) needs. Slack writes, acknowledgements included, use ACK_TASK_QUEUE.
+ACTIVITY_GROUPS = {
+    "send_message": "slack_write",
+    "add_reaction": "slack_write",
+    "update_message": "slack_write",
+    "batch_update": "slack_write",
+    "lookup_user_by_email": "slack_read",
+}
+DEFAULT_ACTIVITY_GROUP = "default"
+
+
+def shard_for(key, shards=None):
+    """Stable shard index for ``key`` (unlike hash(), the same in every process)."""
+    shards = shards or TASK_QUEUE_SHARDS
+    return zlib.crc32(key.encode()) % shards
+
+
+def shard_queue(shard, shards=None):
+    """Task queue name of ``shard``; unsharded deployments keep the plain name."""
+    if (shards or TASK_QUEUE_SHARDS) <= 1:
+        return TASK_QUEUE
+    return f"{TASK_QUEUE}-{shard}"
+
+
+def task_queue_for(event, shards=None):
+    """Task queue for a RequestEvent, by channel (or team, for channel-less events)."""
+    shards = shards or TASK_QUEUE_SHARDS
+    key = event.channel or event.team_id or event.event_id
+    return shard_queue(shard_for(key, shards), shards)
+
+
+def parse_shards(value, shards=None):
+    """Parse a shard selection like ``"all"`` or ``"0,2,4-7"`` into shard indexes."""
+    shards = shards or TASK_QUEUE_SHARDS
+    if not value or value.strip() == "all":
+        return list(range(shards))
+    selected = set()
+    for part in value.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        first, _, last = part.partition("-")
+        selected.update(range(int(first), int(last or first) + 1))
+    invalid = sorted(shard for shard in selected if not 0 <= shard < shards)
+    if invalid:
+        raise ValueError(f"Shards {invalid} out of range for {shards} task queue shards")
+    return sorted(selected)
+
+
+def worker_task_queues(shards_value=None, shards=None):
+    """Shard queues this worker polls, from WORKER_SHARDS (default all)."""
+    shards = shards or TASK_QUEUE_SHARDS
+    selection = parse_shards(shards_value if shards_value is not None else os.getenv("WORKER_SHARDS"), shards)
+    return [shard_queue(shard, shards) for shard in selection]
+
+
+def activity_group(activity_type):
+    return ACTIVITY_GROUPS.get(activity_type, DEFAULT_ACTIVITY_GROUP)
+
+
+def group_task_queue(group):
+    """Activity-only task queue of an activity group."""
+    if group == "slack_write":
+        return ACK_TASK_QUEUE
+    return f"{TASK_QUEUE}-{group.replace('_', '-')}"
+
+
+def activity_task_queue(activity_type):
+    """Task queue a workflow should run ``activity_type`` on as a regular activity."""
+    return group_task_queue(activity_group(activity_type))
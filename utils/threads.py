@@ -0,0 +1,116 @@
+import dataclasses
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+REACTION_EVENTS = ("reaction_added", "reaction_removed")
+
+
+class ThreadRoots:
+    """Bounded LRU of Slack reply ts -> thread root ts, per channel.
+
+    A reaction names only the message it was added to, so a reaction on a
+    reply would key a thread of its own. Replies pass through intake first
+    and carry their root's ``thread_ts``; remembering them lets a later
+    reaction find its thread. Reactions on a root message, or on a reply this
+    process never saw, keep the message's own ts.
+
+    The map is per process. When ``shared_path`` is given, a SQLite table
+    behind it lets all gunicorn workers on the host share it, as with
+    RecentEvents.
+    """
+
+    def __init__(self, maxsize=100000, ttl=8 * 86400.0, shared_path=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.shared_path = shared_path
+        self.resolved = 0
+        self._roots = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._writes = 0
+
+        if shared_path:
+            self._conn().execute(
+                """
+                CREATE TABLE IF NOT EXISTS thread_roots (
+                    channel TEXT NOT NULL,
+                    ts TEXT NOT NULL,
+                    root_ts TEXT NOT NULL,
+                    seen_at REAL NOT NULL,
+                    PRIMARY KEY (channel, ts)
+                ) WITHOUT ROWID
+                """
+            )
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.shared_path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def resolve(self, event):
+        """Record ``event`` if it is a reply; re-key it to its thread root if it is a reaction on one."""
+        if event.event_type in REACTION_EVENTS:
+            root_ts = self.root_of(event.channel, event.thread_ts)
+            if root_ts and root_ts != event.thread_ts:
+                with self._lock:
+                    self.resolved += 1
+                return dataclasses.replace(event, thread_ts=root_ts)
+        elif event.channel and event.ts and event.thread_ts and event.thread_ts != event.ts:
+            self.remember(event.channel, event.ts, event.thread_ts)
+        return event
+
+    def remember(self, channel, ts, root_ts):
+        with self._lock:
+            self._remember((channel, ts), root_ts)
+        if self.shared_path:
+            now = time.time()
+            conn = self._conn()
+            conn.execute(
+                """
+                INSERT INTO thread_roots (channel, ts, root_ts, seen_at) VALUES (?, ?, ?, ?)
+                ON CONFLICT (channel, ts) DO UPDATE SET seen_at = excluded.seen_at
+                """,
+                (channel, ts, root_ts, now),
+            )
+            self._writes += 1
+            if self._writes % 1000 == 0:
+                conn.execute("DELETE FROM thread_roots WHERE seen_at < ?", (now - self.ttl,))
+
+    def _remember(self, key, root_ts):
+        self._roots[key] = root_ts
+        self._roots.move_to_end(key)
+        if len(self._roots) > self.maxsize:
+            self._roots.popitem(last=False)
+
+    def root_of(self, channel, ts):
+        """The thread root of message ``ts``, or None if it isn't a known reply."""
+        if not channel or not ts:
+            return None
+        key = (channel, ts)
+        with self._lock:
+            root_ts = self._roots.get(key)
+            if root_ts is not None:
+                self._roots.move_to_end(key)
+                return root_ts
+        if not self.shared_path:
+            return None
+
+        row = self._conn().execute(
+            "SELECT root_ts FROM thread_roots WHERE channel = ? AND ts = ? AND seen_at >= ?",
+            (channel, ts, time.time() - self.ttl),
+        ).fetchone()
+        if row is None:
+            return None
+        with self._lock:
+            self._remember(key, row[0])
+        return row[0]
+
+    def stats(self):
+        with self._lock:
+            return {"size": len(self._roots), "resolved": self.resolved}
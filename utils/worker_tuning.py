@@ -0,0 +1,149 @@
+import os
+from dataclasses import dataclass, replace
+from typing import Optional, Tuple
+
+from temporalio.worker import (
+    FixedSizeSlotSupplier,
+    PollerBehaviorAutoscaling,
+    PollerBehaviorSimpleMaximum,
+    ResourceBasedSlotConfig,
+    ResourceBasedSlotSupplier,
+    ResourceBasedTunerConfig,
+    WorkerTuner,
+)
+from temporalio.worker.workflow_sandbox import SandboxedWorkflowRunner, SandboxRestrictions
+
+# Modules imported by workflows that are deterministic and side-effect free.
+# Passed through, the sandbox reuses the worker's copy instead of re-importing
+# them for every workflow run.
+PASSTHROUGH_MODULES = ("models", "utils.task_queues")
+
+
+@dataclass(frozen=True)
+class WorkerProfile:
+    """Worker performance settings; ``None`` leaves the SDK default.
+
+    ``resource_targets`` is ``(target_memory_usage, target_cpu_usage)`` and
+    switches workflow and local activity slots to resource-based tuning, in
+    which case the fixed workflow/local activity limits are ignored.
+    """
+    name: str
+    sandbox_passthrough: bool = False
+    max_cached_workflows: Optional[int] = None
+    max_concurrent_workflow_tasks: Optional[int] = None
+    max_concurrent_activities: Optional[int] = None
+    max_concurrent_local_activities: Optional[int] = None
+    workflow_task_polls: Optional[int] = None
+    activity_task_polls: Optional[int] = None
+    poller_autoscaling: bool = False
+    resource_targets: Optional[Tuple[float, float]] = None
+
+    def worker_kwargs(self, max_concurrent_activities=None):
+        """Keyword arguments for ``temporalio.worker.Worker``.
+
+        ``max_concurrent_activities`` overrides the profile, e.g. to match a
+        sync activity executor's thread count.
+        """
+        kwargs = {}
+        activities = max_concurrent_activities or self.max_concurrent_activities
+
+        if self.sandbox_passthrough:
+            kwargs["workflow_runner"] = SandboxedWorkflowRunner(
+                restrictions=SandboxRestrictions.default.with_passthrough_modules(*PASSTHROUGH_MODULES)
+            )
+        if self.max_cached_workflows is not None:
+            kwargs["max_cached_workflows"] = self.max_cached_workflows
+
+        if self.resource_targets:
+            tuner_config = ResourceBasedTunerConfig(*self.resource_targets)
+
+            def resource_based():
+                return ResourceBasedSlotSupplier(ResourceBasedSlotConfig(), tuner_config)
+
+            kwargs["tuner"] = WorkerTuner.create_composite(
+                workflow_supplier=resource_based(),
+                activity_supplier=FixedSizeSlotSupplier(activities) if activities else resource_based(),
+                local_activity_supplier=resource_based(),
+            )
+        else:
+            for key, value in (
+                ("max_concurrent_workflow_tasks", self.max_concurrent_workflow_tasks),
+                ("max_concurrent_activities", activities),
+                ("max_concurrent_local_activities", self.max_concurrent_local_activities),
+            ):
+                if value is not None:
+                    kwargs[key] = value
+
+        if self.poller_autoscaling:
+            kwargs["workflow_task_poller_behavior"] = PollerBehaviorAutoscaling(
+                maximum=self.workflow_task_polls or 100
+            )
+            kwargs["activity_task_poller_behavior"] = PollerBehaviorAutoscaling(
+                maximum=self.activity_task_polls or 100
+            )
+        else:
+            if self.workflow_task_polls is not None:
+                kwargs["workflow_task_poller_behavior"] = PollerBehaviorSimpleMaximum(self.workflow_task_polls)
+            if self.activity_task_polls is not None:
+                kwargs["activity_task_poller_behavior"] = PollerBehaviorSimpleMaximum(self.activity_task_polls)
+        return kwargs
+
+
+# sdk:        SDK defaults, full sandbox re-import per run. Baseline for benchmarks.
+# balanced:   a small container (1-2 CPUs) handling steady Slack traffic.
+# throughput: large containers; big sticky cache and autoscaling pollers.
+# resource:   slot counts follow CPU/memory use, for shared or bursty hosts.
+PROFILES = {
+    "sdk": WorkerProfile(name="sdk"),
+    "balanced": WorkerProfile(
+        name="balanced",
+        sandbox_passthrough=True,
+        max_cached_workflows=1000,
+        max_concurrent_workflow_tasks=50,
+        max_concurrent_activities=500,
+        max_concurrent_local_activities=200,
+        workflow_task_polls=4,
+        activity_task_polls=4,
+    ),
+    "throughput": WorkerProfile(
+        name="throughput",
+        sandbox_passthrough=True,
+        max_cached_workflows=5000,
+        max_concurrent_workflow_tasks=200,
+        max_concurrent_activities=1000,
+        max_concurrent_local_activities=500,
+        workflow_task_polls=20,
+        activity_task_polls=20,
+        poller_autoscaling=True,
+    ),
+    "resource": WorkerProfile(
+        name="resource",
+        sandbox_passthrough=True,
+        max_cached_workflows=2000,
+        workflow_task_polls=10,
+        activity_task_polls=10,
+        poller_autoscaling=True,
+        resource_targets=(0.8, 0.9),
+    ),
+}
+
+_ENV_OVERRIDES = {
+    "max_cached_workflows": "WORKER_MAX_CACHED_WORKFLOWS",
+    "max_concurrent_workflow_tasks": "WORKER_MAX_CONCURRENT_WORKFLOW_TASKS",
+    "max_concurrent_activities": "WORKER_MAX_CONCURRENT_ACTIVITIES",
+    "max_concurrent_local_activities": "WORKER_MAX_CONCURRENT_LOCAL_ACTIVITIES",
+    "workflow_task_polls": "WORKER_WORKFLOW_TASK_POLLS",
+    "activity_task_polls": "WORKER_ACTIVITY_TASK_POLLS",
+}
+
+
+def load_worker_profile(name=None):
+    """Profile named by ``name`` or WORKER_PROFILE, with WORKER_* env overrides."""
+    name = name or os.getenv("WORKER_PROFILE", "balanced")
+    if name not in PROFILES:
+        raise ValueError(f"Unknown worker profile {name!r}; expected one of {', '.join(PROFILES)}")
+
+    overrides = {field: int(os.environ[var]) for field, var in _ENV_OVERRIDES.items() if os.getenv(var)}
+    if os.getenv("WORKER_SANDBOX_PASSTHROUGH"):
+        overrides["sandbox_passthrough"] = os.getenv("WORKER_SANDBOX_PASSTHROUGH").lower() == "true"
+    return replace(PROFILES[name], **overrides)
@@ -2,59 +2,200 @@
 
 import asyncio
 import logging
-from concurrent.futures import ThreadPoolExecutor
-from dotenv import load_dotenv
+import os
 
-from temporalio import activity, workflow
-from temporalio.client import Client
-from temporalio.worker import Worker
+from utils.settings import get_settings
 
-# Import your workflow and activities
-from workflows.request_start import RequestStart
-from activities.slack import SlackActivity
-from clients.temporal import TemporalClient
+# Read .env.shared/.env.secret once, before any module reads the environment at import
+settings = get_settings()
 
-# Load environment variables
-load_dotenv(".env.shared")
-load_dotenv(".env.secret", override=True)
+from temporalio import activity, workflow  # noqa: E402
+from prometheus_client import start_http_server  # noqa: E402
+from temporalio.runtime import PrometheusConfig, Runtime, TelemetryConfig  # noqa: E402
+from temporalio.worker import Worker  # noqa: E402
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Import your workflow and activities; Jira and PagerDuty are imported only when configured
+from workflows.request_start import RequestStart  # noqa: E402
+from activities.identity import IdentityActivity  # noqa: E402
+from activities.request_store import RequestStoreActivity  # noqa: E402
+from activities.slack import AsyncSlackActivity, SlackActivity  # noqa: E402
+from clients.slack import AsyncSlackClient, SlackUserDirectory  # noqa: E402
+from clients.temporal import TemporalClient  # noqa: E402
+from utils.activity_executor import ActivityPoolExecutor  # noqa: E402
+from utils.logs import configure_logging  # noqa: E402
+from utils.request_store import RequestStore  # noqa: E402
+from utils.task_queues import activity_group, group_task_queue, worker_task_queues  # noqa: E402
+from utils.worker_tuning import load_worker_profile  # noqa: E402
+
+# Log through a background writer thread (LOG_LEVEL, LOG_FORMAT, LOG_SAMPLE)
+configure_logging()
+if os.getenv("LOG_FORMAT", "json").lower() == "json":
+    # The activity/workflow details already go out as structured fields
+    activity.logger.activity_info_on_message = False
+    workflow.logger.workflow_info_on_message = False
 logger = logging.getLogger(__name__)
 
 
+async def refresh_user_directory(slack_client, interval):
+    """Keep the Slack user directory warm so email lookups skip users.lookupByEmail."""
+    while True:
+        try:
+            if asyncio.iscoroutinefunction(slack_client.warm_user_directory):
+                await slack_client.warm_user_directory()
+            else:
+                await asyncio.to_thread(slack_client.warm_user_directory)
+        except Exception as e:
+            logger.error("Failed to refresh Slack user directory: %s", e)
+        await asyncio.sleep(interval)
+
+
+async def refresh_on_call_index(index, interval):
+    """Re-render PagerDuty schedules so on-call lookups are index hits, not API calls."""
+    while True:
+        try:
+            await index.refresh()
+        except Exception as e:
+            logger.error("Failed to refresh on-call index: %s", e)
+        await asyncio.sleep(interval)
+
+
+def init_metrics():
+    """Export SDK runtime metrics (poll latency, slots, sticky cache) and activity metrics."""
+    sdk_bind = os.getenv("TEMPORAL_METRICS_BIND", "0.0.0.0:9464")
+    if sdk_bind:
+        # Must be installed before the client connects
+        Runtime.set_default(Runtime(telemetry=TelemetryConfig(metrics=PrometheusConfig(bind_address=sdk_bind))))
+        logger.info("Temporal SDK metrics on %s", sdk_bind)
+
+    activity_port = os.getenv("WORKER_METRICS_PORT", "9465")
+    if activity_port:
+        start_http_server(int(activity_port))
+        logger.info("Activity metrics on port %s", activity_port)
+
+
 async def main():
     """Start the Temporal worker."""
     try:
+        init_metrics()
+
         # Get Temporal client
         logger.info("Connecting to Temporal server...")
         client = await TemporalClient.get_client()
         logger.info("Successfully connected to Temporal client")
 
-        # Create activity instances
-        slack_activity = SlackActivity()
-
-        # Create and start worker
-        logger.info("Starting Temporal worker...")
-        worker = Worker(
-            client,
-            task_queue="slack-webhook-task-queue",
-            workflows=[RequestStart],
-            activities=[
-                slack_activity.send_message,
-                slack_activity.add_reaction,
-                slack_activity.lookup_user_by_email,
-            ],
-            activity_executor=ThreadPoolExecutor(max_workers=5),
-        )
+        # Create activity instances. "async" runs Slack calls on the worker's event loop
+        # over one pooled HTTP session; "sync" keeps the thread-pool WebClient path.
+        slack_mode = settings.slack_activity_mode
+        if slack_mode == "sync":
+            slack_activity = SlackActivity()
+            # One autoscaling pool per activity group (ACTIVITY_POOLS)
+            activity_executor = ActivityPoolExecutor.from_config(settings=settings)
+            logger.info("Activity pools: %s", activity_executor.stats())
+        else:
+            slack_activity = AsyncSlackActivity()
+            activity_executor = None
+        logger.info("Using %s Slack activities", slack_mode)
+
+        # Sandbox passthrough, sticky cache, slot and poller settings (see utils/worker_tuning.py)
+        profile = load_worker_profile()
+        logger.info("Using worker profile %s", profile)
+
+        directory_refresh = None
+        if settings.slack_user_directory_warm:
+            directory_refresh = asyncio.create_task(refresh_user_directory(
+                slack_activity.slack_client, settings.slack_user_directory_refresh_seconds))
+
+        # One worker per task queue shard this process serves (WORKER_SHARDS), plus
+        # an activity-only worker per activity group queue
+        task_queues = worker_task_queues()
+        serve_activities = settings.worker_activity_queues
+        activities = [
+            slack_activity.send_message,
+            slack_activity.add_reaction,
+            slack_activity.lookup_user_by_email,
+            slack_activity.update_message,
+            slack_activity.batch_update,
+        ]
+        # Ticket creation is enabled by configuring Jira
+        jira_activity = None
+        if settings.jira_url:
+            from activities.jira import JIRAActivity
+
+            jira_activity = JIRAActivity(settings=settings)
+            activities.append(jira_activity.create_issue)
+        # On-call lookups for the components in PAGERDUTY_SCHEDULES
+        pagerduty_activity = None
+        on_call_refresh = None
+        if settings.pagerduty_schedules:
+            from activities.pagerduty import PagerdutyActivity
+
+            pagerduty_activity = PagerdutyActivity()
+            activities.append(pagerduty_activity.get_on_call)
+            on_call_refresh = asyncio.create_task(refresh_on_call_index(
+                pagerduty_activity.index, settings.pagerduty_oncall_refresh_seconds))
+        # Slack, Jira and PagerDuty ids for one email, from a shared cache
+        identity_activity = IdentityActivity()
+        activities.append(identity_activity.resolve_identity)
+        # Workflows copy each request state change here for the /requests listing
+        request_store_activity = RequestStoreActivity(RequestStore(settings.request_store_path))
+        activities.append(request_store_activity.save_request)
+        # Remote activities go to the group queues, so shard queues carry workflow and
+        # local activity tasks; the activities are registered here to run locally
+        worker_kwargs = profile.worker_kwargs()
+        group_activities = {}
+        if serve_activities:
+            for fn in activities:
+                group_activities.setdefault(activity_group(fn.__name__), []).append(fn)
+
+        logger.info("Starting Temporal workers for %s", task_queues + [group_task_queue(g) for g in group_activities])
+        workers = [
+            Worker(
+                client,
+                task_queue=task_queue,
+                workflows=[RequestStart],
+                activities=activities,
+                activity_executor=activity_executor,
+                **worker_kwargs,
+            )
+            for task_queue in task_queues
+        ]
+        for group, group_fns in group_activities.items():
+            # With the sync executor a group's slots are its pool's maximum size, so
+            # tasks queued in one busy pool can't hold the slots other groups need
+            slots = None
+            if activity_executor is not None:
+                slots = activity_executor.max_concurrency_for(fn.__name__ for fn in group_fns)
+            group_kwargs = profile.worker_kwargs(max_concurrent_activities=slots)
+            workers.append(Worker(
+                client,
+                task_queue=group_task_queue(group),
+                activities=group_fns,
+                activity_executor=activity_executor,
+                **{key: value for key, value in group_kwargs.items() if key != "workflow_runner"},
+            ))
 
         logger.info("Worker started! Waiting for workflows and activities...")
-        await worker.run()
+        try:
+            await asyncio.gather(*(worker.run() for worker in workers))
+        finally:
+            if directory_refresh is not None:
+                directory_refresh.cancel()
+            if on_call_refresh is not None:
+                on_call_refresh.cancel()
+                await pagerduty_activity.index.client.close()
+            SlackUserDirectory.get_directory().save()
+            if activity_executor is not None:
+                activity_executor.shutdown(wait=False)
+            # The identity resolver uses the async Slack client in either mode
+            await AsyncSlackClient.get_client().close()
+            await identity_activity.resolver.close()
+            if jira_activity is not None:
+                await jira_activity.jira_client.close()
         
     except KeyboardInterrupt:
         logger.info("Worker shutdown requested")
     except Exception as e:
-        logger.error(f"Worker error: {str(e)}")
+        logger.error("Worker error: %s", e)
         raise
 
 
@@ -1,42 +1,298 @@
-import logging
 from datetime import timedelta
-import uuid
-import datetime
+from typing import List, Optional
 
 from temporalio import workflow
 from temporalio.common import RetryPolicy
+from temporalio.exceptions import ActivityError, ApplicationError
 
-from models.request import Request
+from models.request import Request, RequestEvent
+from models.slack import SlackUpdate
+from utils.task_queues import activity_task_queue
 
 
-logger = logging.getLogger(__name__)
+# Close a request's workflow after this long without new events in its thread
+IDLE_TIMEOUT = timedelta(days=7)
+
+# Continue-as-new well before Temporal's history limits
+MAX_HISTORY_LENGTH = 2000
+
+# Event ids remembered for de-duplicating signals (retries of the same event)
+MAX_SEEN_EVENT_IDS = 200
+
+# Short, idempotent Slack calls run as local activities in the workflow's worker,
+# skipping the task queue round trip. Retries stay short: local activity attempts
+# hold the workflow task.
+LOCAL_ACTIVITY_TIMEOUT = timedelta(seconds=10)
+LOCAL_RETRY_POLICY = RetryPolicy(
+    initial_interval=timedelta(milliseconds=200),
+    maximum_interval=timedelta(seconds=2),
+    maximum_attempts=5,
+)
+
+# Once local attempts are exhausted, Slack updates move to the ack task queue
+ACK_ACTIVITY_TIMEOUT = timedelta(seconds=30)
+ACK_SCHEDULE_TO_CLOSE_TIMEOUT = timedelta(minutes=5)
+ACK_RETRY_POLICY = RetryPolicy(
+    maximum_attempts=3,
+    maximum_interval=timedelta(seconds=2),
+)
+
+# The request store's final "closed" write falls back to a regular activity that
+# keeps retrying until it lands, so a closed request never stays listed as open
+STORE_ACTIVITY_TIMEOUT = timedelta(seconds=30)
+STORE_RETRY_POLICY = RetryPolicy(maximum_interval=timedelta(minutes=5))
+
+# The final "closed" status edit has no later change to retry it, so it is
+# retried here, backing off from the first delay (about an hour in total)
+CLOSE_STATUS_ATTEMPTS = 8
+CLOSE_STATUS_BACKOFF = timedelta(seconds=30)
+
+ACK_EMOJI = "eyes"
+
+# Where acknowledgements go when routing didn't pick a channel
+DEFAULT_ACK_CHANNEL = "#tmp-rohan-test"
+
 
 @workflow.defn
 class RequestStart:
+    """Long-lived workflow for one request, keyed by Slack channel + thread.
+
+    The first event starts it (via signal-with-start) and is acknowledged in
+    Slack; follow-up events in the same thread arrive as ``new_event`` signals
+    and update the request state, which ``get_request`` returns live and each
+    change is copied to the request store.
+    """
+
+    def __init__(self) -> None:
+        self.request: Optional[Request] = None
+        self.pending: List[RequestEvent] = []
+        self.seen_event_ids: List[str] = []
+        # The request's one status message, edited in place as the request changes
+        self.status_channel = ""
+        self.status_ts = ""
+        self.status_version = 0
+        self.status_text = ""
+
     @workflow.run
-    async def run(self, payload: dict):
-        retry_policy = RetryPolicy(
-            maximum_attempts=3,
-            maximum_interval=timedelta(seconds=2),
-            non_retryable_error_types=[],
-        )
+    async def run(self, event: RequestEvent, request: Optional[Request] = None,
+                  seen_event_ids: Optional[List[str]] = None, status_ts: str = "", status_version: int = 0):
+        # Signals can be handled before run() begins, so merge rather than replace
+        self.seen_event_ids = list(seen_event_ids or []) + self.seen_event_ids
+        if request is None:
+            # First run for this thread. The input only names the start signal's event.
+            event = await self._start_event(event)
+        self.status_channel = event.route_channel or DEFAULT_ACK_CHANNEL
+        if request is None:
+            self.request = Request.from_event(event)
+            self._remember(event.event_id)
+            self.pending = [e for e in self.pending if e.event_id != event.event_id]
 
+            # Acknowledge the request in Slack: react on the original message and post
+            # its status message to the channel its routing rule picked
+            status = self._status_update()
+            updates = [status]
+            if event.channel and event.ts:
+                updates.insert(0, SlackUpdate(kind="reaction", channel=event.channel, ts=event.ts, emoji=ACK_EMOJI))
+            self._record_status(status, await self._update_slack(updates))
+            await self._save_request()
+        else:
+            # Resumed after continue-as-new
+            self.request = request
+            self.status_ts = status_ts
+            self.status_version = status_version
+            self.status_text = self._status_text()
 
-        # Acknowledge the request in Slack. For now we are only going to send a test message
-        # to make sure that our temporal setup is working and we can create an activity
-        slack_output = await workflow.execute_activity(
-            "send_message",
-            args=["#tmp-rohan-test", f"Hello from workflow! Event: {payload.get('event_id', 'unknown')}"],
-            start_to_close_timeout=timedelta(seconds=30),
-            retry_policy=retry_policy,
-        )
-        
+        while True:
+            try:
+                await workflow.wait_condition(lambda: bool(self.pending), timeout=IDLE_TIMEOUT)
+            except TimeoutError:
+                break
+
+            while self.pending:
+                self._apply(self.pending.pop(0))
+            await self._save_request()
+            await self._update_status()
+
+            # Signals that arrived during the save or status edit are already marked
+            # seen, so apply them before continuing as new rather than drop them
+            if self.pending:
+                continue
+            info = workflow.info()
+            if info.is_continue_as_new_suggested() or info.get_current_history_length() > MAX_HISTORY_LENGTH:
+                workflow.continue_as_new(
+                    args=[event, self.request, self.seen_event_ids, self.status_ts, self.status_version]
+                )
+
+        self.request.status = "closed"
+        await self._save_request(final=True)
+        await self._close_status()
+
+        # Only record what callers need; the message itself is already in the input
         return {
             "status": "completed",
-            "event_id": payload.get('event_id', 'unknown'),
-            "slack_message_result": slack_output
+            "event_id": event.event_id,
+            "request_id": self.request.id
         }
 
+    @workflow.signal
+    def new_event(self, event: RequestEvent) -> None:
+        if event.event_id in self.seen_event_ids:
+            return
+        self._remember(event.event_id)
+        self.pending.append(event)
+
     @workflow.query
-    def get_request(self, request_id: str) -> Request:
-        pass
\ No newline at end of file
+    def get_request(self) -> Optional[Request]:
+        return self.request
+
+    async def _start_event(self, key: RequestEvent) -> RequestEvent:
+        """The event delivered by signal-with-start for the ``key`` input.
+
+        Starters pass just the event id as workflow input so history records
+        the event once, in the signal. An input that is a whole event (one
+        with a channel) is used as is if no signal carries it.
+        """
+        def delivered():
+            return next((e for e in self.pending if e.event_id == key.event_id), None)
+
+        if delivered() is None and not key.channel:
+            await workflow.wait_condition(lambda: delivered() is not None)
+        return delivered() or key
+
+    def _remember(self, event_id: str) -> None:
+        if event_id in self.seen_event_ids:
+            return
+        self.seen_event_ids.append(event_id)
+        del self.seen_event_ids[:-MAX_SEEN_EVENT_IDS]
+
+    async def _update_slack(self, updates: List[SlackUpdate]) -> dict:
+        """Apply Slack UI updates in a single local activity.
+
+        batch_update raises rate limits and transport errors. Once the local
+        retries are used up it falls back to a regular activity on the ack
+        task queue, so further retries neither hold the workflow task nor
+        queue behind this shard. The fallback only gets the updates the local
+        attempts didn't apply, so nothing is posted twice. If that fails too,
+        the rest are reported as not applied rather than failing the request.
+        """
+        task_queue = activity_task_queue("batch_update")
+        try:
+            return await workflow.execute_local_activity(
+                "batch_update",
+                args=[updates],
+                start_to_close_timeout=LOCAL_ACTIVITY_TIMEOUT,
+                retry_policy=LOCAL_RETRY_POLICY,
+            )
+        except ActivityError as e:
+            workflow.logger.warning("Local Slack update failed, retrying on %s: %s", task_queue, e.cause)
+            applied = self._applied(e)
+        try:
+            result = await workflow.execute_activity(
+                "batch_update",
+                args=[updates[len(applied):]],
+                task_queue=task_queue,
+                start_to_close_timeout=ACK_ACTIVITY_TIMEOUT,
+                schedule_to_close_timeout=ACK_SCHEDULE_TO_CLOSE_TIMEOUT,
+                retry_policy=ACK_RETRY_POLICY,
+            )
+            results = applied + result["results"]
+            return {"success": all(r["success"] for r in results), "results": results}
+        except ActivityError as e:
+            workflow.logger.error("Slack update failed on %s: %s", task_queue, e.cause)
+            return {"success": False, "results": applied + self._applied(e)}
+
+    @staticmethod
+    def _applied(error: ActivityError) -> list:
+        """Results of the updates a failed batch_update applied before it gave up."""
+        cause = error.cause
+        if isinstance(cause, ApplicationError) and cause.details:
+            return list(cause.details[0])
+        return []
+
+    def _status_text(self) -> str:
+        lines = [f"Hello from workflow! Event: {self.request.id}"]
+        if self.request.component:
+            lines.append(f"Component: {self.request.component}")
+        if self.request.assignee_email:
+            lines.append(f"Assignee: {self.request.assignee_email}")
+        if self.request.status != "open":
+            lines.append(f"Status: {self.request.status}")
+        return "\n".join(lines)
+
+    def _status_update(self) -> SlackUpdate:
+        # Versions only grow, so the Slack client can drop retried or superseded states
+        self.status_version += 1
+        return SlackUpdate(kind="status", channel=self.status_channel, ts=self.status_ts, text=self._status_text(),
+                           key=workflow.info().workflow_id, version=self.status_version)
+
+    def _record_status(self, update: SlackUpdate, result: dict) -> bool:
+        """Remember what the status message shows. Returns False if the update wasn't applied."""
+        for item in result.get("results", []):
+            if item.get("kind") == "status" and item.get("success"):
+                self.status_ts = item.get("timestamp") or self.status_ts
+                self.status_text = update.text
+                return True
+        workflow.logger.warning("Status message of %s not updated: %s", self.request.id, result)
+        return False
+
+    async def _update_status(self) -> bool:
+        """Edit the status message if what it should show has changed.
+
+        Follow-up events that arrive while the edit is in flight queue up as
+        signals and are applied together, so a burst becomes one edit. A
+        failed edit leaves ``status_text`` stale, so the next change retries
+        it. Returns whether the message shows the current state.
+        """
+        if self._status_text() == self.status_text:
+            return True
+        update = self._status_update()
+        return self._record_status(update, await self._update_slack([update]))
+
+    async def _close_status(self) -> None:
+        """Show the closed state, retrying with backoff since no later change will."""
+        delay = CLOSE_STATUS_BACKOFF
+        for attempt in range(CLOSE_STATUS_ATTEMPTS):
+            if attempt:
+                await workflow.sleep(delay)
+                delay *= 2
+            if await self._update_status():
+                return
+        workflow.logger.error("Giving up on the closed status of %s", self.request.id)
+
+    async def _save_request(self, final: bool = False) -> None:
+        """Copy the request's state to the request store.
+
+        The store is a read model: if the write fails, the next state change
+        writes the whole record again, so the workflow carries on. The
+        ``final`` write has no next change, so once its local attempts fail
+        it moves to a regular activity that retries until it succeeds.
+        """
+        try:
+            await workflow.execute_local_activity(
+                "save_request",
+                args=[self.request],
+                start_to_close_timeout=LOCAL_ACTIVITY_TIMEOUT,
+                retry_policy=LOCAL_RETRY_POLICY,
+            )
+            return
+        except ActivityError as e:
+            if not final:
+                workflow.logger.warning("Failed to save request %s: %s", self.request.id, e.cause)
+                return
+            task_queue = activity_task_queue("save_request")
+            workflow.logger.warning("Failed to save request %s, retrying on %s: %s",
+                                    self.request.id, task_queue, e.cause)
+        await workflow.execute_activity(
+            "save_request",
+            args=[self.request],
+            task_queue=task_queue,
+            start_to_close_timeout=STORE_ACTIVITY_TIMEOUT,
+            retry_policy=STORE_RETRY_POLICY,
+        )
+
+    def _apply(self, event: RequestEvent) -> None:
+        self.request.updated_at = event.ts or self.request.updated_at
+        # A follow-up can classify a request its first message didn't
+        if not self.request.component and event.component:
+            self.request.component = event.component
+            self.request.request_type = event.request_type